@@ -0,0 +1,51 @@
+-- slate_runner: Render Job Dependencies
+-- Adds a 'blocked' render job status and a dependency edge table so jobs
+-- (e.g. comp renders) can wait on other jobs (e.g. FX caches) before being claimed.
+
+-- Allow 'blocked' as a render job status
+ALTER TABLE render_jobs DROP CONSTRAINT IF EXISTS render_jobs_status_check;
+ALTER TABLE render_jobs ADD CONSTRAINT render_jobs_status_check CHECK (
+  status IN ('blocked', 'queued', 'running', 'succeeded', 'failed')
+);
+
+-- RENDER JOB DEPENDENCIES
+-- One row per edge: job_uid waits on depends_on_uid.
+DROP TABLE IF EXISTS render_job_dependencies CASCADE;
+
+CREATE TABLE render_job_dependencies (
+  job_uid        TEXT NOT NULL REFERENCES render_jobs (uid) ON DELETE CASCADE,
+  depends_on_uid TEXT NOT NULL REFERENCES render_jobs (uid) ON DELETE CASCADE,
+  created_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (job_uid, depends_on_uid),
+  CHECK (job_uid <> depends_on_uid)
+);
+
+-- Reverse lookup used when releasing dependents of a finished job
+CREATE INDEX IF NOT EXISTS idx_render_job_dependencies_depends_on
+  ON render_job_dependencies (depends_on_uid);
+
+-- Claim path: oldest queued job first, skipping everything else
+CREATE INDEX IF NOT EXISTS idx_render_jobs_queued
+  ON render_jobs (submitted_at)
+  WHERE status = 'queued' AND deleted_at IS NULL;
+
+-- RLS for RENDER JOB DEPENDENCIES (mirrors render_jobs)
+ALTER TABLE render_job_dependencies ENABLE ROW LEVEL SECURITY;
+ALTER TABLE render_job_dependencies FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS render_job_dependencies_select_policy ON render_job_dependencies;
+DROP POLICY IF EXISTS render_job_dependencies_write_policy ON render_job_dependencies;
+
+CREATE POLICY render_job_dependencies_select_policy ON render_job_dependencies
+  FOR SELECT USING (is_valid_api_token());
+
+CREATE POLICY render_job_dependencies_write_policy ON render_job_dependencies
+  FOR ALL USING (
+    is_valid_api_token() AND (
+      has_role('admin') OR has_role('td') OR has_role('service')
+    )
+  ) WITH CHECK (
+    is_valid_api_token() AND (
+      has_role('admin') OR has_role('td') OR has_role('service')
+    )
+  );
@@ -0,0 +1,24 @@
+-- slate_runner: Render Job Notifications
+-- Publishes a compact JSON payload on the 'render_jobs' channel whenever a render job
+-- is inserted or updated, so API workers can push status changes instead of being polled.
+
+CREATE OR REPLACE FUNCTION notify_render_job_change() RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM pg_notify('render_jobs', json_build_object(
+    'op',          lower(TG_OP),
+    'uid',         NEW.uid,
+    'project_uid', NEW.project_uid,
+    'status',      NEW.status,
+    'deleted',     NEW.deleted_at IS NOT NULL,
+    'updated_at',  NEW.updated_at
+  )::text);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_render_jobs_notify ON render_jobs;
+
+CREATE TRIGGER trg_render_jobs_notify
+AFTER INSERT OR UPDATE ON render_jobs
+FOR EACH ROW
+EXECUTE FUNCTION notify_render_job_change();
@@ -0,0 +1,49 @@
+-- slate_runner: Entity Change Notifications
+-- Publishes compact change records (table, uid, op, project_uid) on the 'entity_changes'
+-- channel for tasks, versions and publishes, feeding the project WebSocket change feed.
+
+CREATE OR REPLACE FUNCTION notify_entity_change() RETURNS TRIGGER AS $$
+DECLARE
+  rec RECORD;
+  op  TEXT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    rec := OLD;
+    op := 'delete';
+  ELSE
+    rec := NEW;
+    op := lower(TG_OP);
+    -- Soft deletes are reported as deletes
+    IF TG_OP = 'UPDATE' AND NEW.deleted_at IS NOT NULL AND OLD.deleted_at IS NULL THEN
+      op := 'delete';
+    END IF;
+  END IF;
+
+  PERFORM pg_notify('entity_changes', json_build_object(
+    'table',       TG_TABLE_NAME,
+    'uid',         rec.uid,
+    'op',          op,
+    'project_uid', rec.project_uid
+  )::text);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_tasks_notify ON tasks;
+DROP TRIGGER IF EXISTS trg_versions_notify ON versions;
+DROP TRIGGER IF EXISTS trg_publishes_notify ON publishes;
+
+CREATE TRIGGER trg_tasks_notify
+AFTER INSERT OR UPDATE OR DELETE ON tasks
+FOR EACH ROW
+EXECUTE FUNCTION notify_entity_change();
+
+CREATE TRIGGER trg_versions_notify
+AFTER INSERT OR UPDATE OR DELETE ON versions
+FOR EACH ROW
+EXECUTE FUNCTION notify_entity_change();
+
+CREATE TRIGGER trg_publishes_notify
+AFTER INSERT OR UPDATE OR DELETE ON publishes
+FOR EACH ROW
+EXECUTE FUNCTION notify_entity_change();
@@ -0,0 +1,22 @@
+-- slate_runner: Change Tracking Indexes
+-- Supports GET /projects/{uid}/changes by letting every table be range-scanned on
+-- (project_uid, updated_at). Soft deletes bump updated_at via set_updated_at(), so the
+-- same index also finds deletions; deleted_at indexes serve the include_deleted filters.
+
+CREATE INDEX IF NOT EXISTS idx_projects_updated_at ON projects (updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_assets_project_updated_at ON assets (project_uid, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_shots_project_updated_at ON shots (project_uid, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_updated_at ON tasks (project_uid, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_versions_project_updated_at ON versions (project_uid, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_publishes_project_updated_at ON publishes (project_uid, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_render_jobs_project_updated_at ON render_jobs (project_uid, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_events_project_updated_at ON events (project_uid, updated_at, id);
+
+CREATE INDEX IF NOT EXISTS idx_assets_project_deleted_at ON assets (project_uid, deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_shots_project_deleted_at ON shots (project_uid, deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_tasks_project_deleted_at ON tasks (project_uid, deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_versions_project_deleted_at ON versions (project_uid, deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_publishes_project_deleted_at ON publishes (project_uid, deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_render_jobs_project_deleted_at ON render_jobs (project_uid, deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_events_project_deleted_at ON events (project_uid, deleted_at) WHERE deleted_at IS NOT NULL;
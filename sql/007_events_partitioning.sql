@@ -0,0 +1,105 @@
+-- slate_runner: Time-Partitioned Events
+-- Migrates events to native RANGE partitioning on created_at (one partition per month),
+-- adds ensure_event_partitions() for creating future months, and keeps a DEFAULT
+-- partition as a safety net. Old months are detached and archived by the API's
+-- retention job (services/event_retention_service.py).
+--
+-- Partition keys must be part of every unique constraint, so the primary key becomes
+-- (id, created_at) and uid uniqueness is enforced per partition as (uid, created_at).
+-- UIDs are still generated with gen_uid('EVENT').
+
+BEGIN;
+
+-- Keep the existing id sequence alive when the legacy table is dropped
+ALTER TABLE events RENAME TO events_legacy;
+ALTER SEQUENCE events_id_seq OWNED BY NONE;
+
+CREATE TABLE events (
+  id          INTEGER     NOT NULL DEFAULT nextval('events_id_seq'),
+  uid         TEXT        NOT NULL DEFAULT gen_uid('EVENT'),
+  project_uid TEXT        NOT NULL REFERENCES projects (uid) ON DELETE CASCADE,
+  kind        TEXT        NOT NULL,
+  payload     JSONB       NOT NULL,
+  created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  deleted_at  TIMESTAMPTZ,
+  PRIMARY KEY (id, created_at),
+  UNIQUE (uid, created_at)
+) PARTITION BY RANGE (created_at);
+
+ALTER SEQUENCE events_id_seq OWNED BY events.id;
+
+-- Rows outside every monthly range land here instead of failing the insert
+CREATE TABLE events_default PARTITION OF events DEFAULT;
+
+-- Helper: create monthly partitions (events_yYYYYmMM) from start_month up to N months ahead
+CREATE OR REPLACE FUNCTION ensure_event_partitions(
+  months_ahead INT DEFAULT 3,
+  start_month DATE DEFAULT date_trunc('month', now())::date
+) RETURNS INT AS $$
+DECLARE
+  month_start DATE := date_trunc('month', start_month)::date;
+  last_month  DATE := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+  part_name   TEXT;
+  created     INT := 0;
+BEGIN
+  WHILE month_start <= last_month LOOP
+    part_name := format('events_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+    IF to_regclass(part_name) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF events FOR VALUES FROM (%L) TO (%L)',
+        part_name, month_start, (month_start + interval '1 month')::date
+      );
+      created := created + 1;
+    END IF;
+    month_start := (month_start + interval '1 month')::date;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partitions covering existing data through three months ahead
+SELECT ensure_event_partitions(3, COALESCE((SELECT min(created_at) FROM events_legacy), now())::date);
+
+INSERT INTO events (id, uid, project_uid, kind, payload, created_at, updated_at, deleted_at)
+SELECT id, uid, project_uid, kind, payload, created_at, updated_at, deleted_at
+FROM events_legacy;
+
+SELECT setval('events_id_seq', COALESCE((SELECT max(id) FROM events), 1));
+
+DROP TABLE events_legacy CASCADE;
+
+-- Indexes (created on every partition automatically)
+CREATE INDEX IF NOT EXISTS idx_events_project_created_at ON events (project_uid, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_events_project_updated_at ON events (project_uid, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_events_project_deleted_at ON events (project_uid, deleted_at) WHERE deleted_at IS NOT NULL;
+
+-- keep updated_at fresh
+CREATE TRIGGER trg_events_updated
+BEFORE UPDATE ON events
+FOR EACH ROW
+EXECUTE FUNCTION set_updated_at();
+
+-- RLS for EVENTS (policies do not follow a renamed table)
+ALTER TABLE events ENABLE ROW LEVEL SECURITY;
+ALTER TABLE events FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS events_select_policy ON events;
+DROP POLICY IF EXISTS events_write_policy ON events;
+
+CREATE POLICY events_select_policy ON events
+  FOR SELECT USING (is_valid_api_token());
+
+-- system + admin write events
+CREATE POLICY events_write_policy ON events
+  FOR ALL USING (
+    is_valid_api_token() AND (
+      has_role('admin') OR has_role('td') OR has_role('system')
+    )
+  ) WITH CHECK (
+    is_valid_api_token() AND (
+      has_role('admin') OR has_role('td') OR has_role('system')
+    )
+  );
+
+COMMIT;
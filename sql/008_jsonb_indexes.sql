@@ -0,0 +1,8 @@
+-- slate_runner: JSONB Containment Indexes
+-- jsonb_path_ops GIN indexes backing the `*_contains` / `*_path` list filters, which
+-- compile to the @> containment operator. On the partitioned events table the index
+-- is created on every partition automatically.
+
+CREATE INDEX IF NOT EXISTS idx_events_payload_gin ON events USING GIN (payload jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS idx_publishes_metadata_gin ON publishes USING GIN (metadata jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS idx_render_jobs_context_gin ON render_jobs USING GIN (context jsonb_path_ops);
@@ -0,0 +1,21 @@
+-- slate_runner: Trigram Name Search
+-- pg_trgm GIN indexes let the `ilike('%x%')` list filters and the fuzzy /search mode use
+-- an index instead of a sequential scan. lower(...) text_pattern_ops B-tree indexes serve
+-- the prefix-only type-ahead mode.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Substring / fuzzy matching
+CREATE INDEX IF NOT EXISTS idx_projects_name_trgm ON projects USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_assets_name_trgm ON assets USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_shots_shot_trgm ON shots USING GIN (shot gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_shots_code_trgm ON shots USING GIN ((seq || '_' || shot) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_tasks_name_trgm ON tasks USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_publishes_path_trgm ON publishes USING GIN (path gin_trgm_ops);
+
+-- Prefix-only type-ahead
+CREATE INDEX IF NOT EXISTS idx_projects_name_prefix ON projects (lower(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_assets_name_prefix ON assets (lower(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_shots_code_prefix ON shots (lower(seq || '_' || shot) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_tasks_name_prefix ON tasks (lower(name) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_publishes_path_prefix ON publishes (lower(path) text_pattern_ops);
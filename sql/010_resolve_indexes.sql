@@ -0,0 +1,12 @@
+-- slate_runner: Publish Resolver Indexes
+-- Supports GET /resolve, which walks tasks -> versions -> publishes for an asset or shot
+-- and keeps the newest publish of a type/representation whose version passes the policy.
+
+CREATE INDEX IF NOT EXISTS idx_tasks_parent_live ON tasks (parent_uid, name)
+  WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_versions_task_status_created ON versions (task_uid, status, created_at DESC, vnum DESC)
+  WHERE deleted_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_publishes_version_type_rep ON publishes (version_uid, type, representation, created_at DESC)
+  WHERE deleted_at IS NULL;
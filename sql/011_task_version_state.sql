@@ -0,0 +1,41 @@
+-- slate_runner: Per-Task Version Counter
+-- Version numbers are allocated by upserting task_version_state.last_vnum with
+-- INSERT ... ON CONFLICT DO UPDATE ... RETURNING. The row lock serialises concurrent
+-- creates on one task until commit, so no two versions ever pick the same vnum.
+-- Kept beside tasks (not on it) so artists, who may write versions but not tasks,
+-- can allocate numbers under RLS.
+
+CREATE TABLE IF NOT EXISTS task_version_state
+(
+    task_uid   TEXT PRIMARY KEY REFERENCES tasks (uid) ON DELETE CASCADE,
+    last_vnum  INT         NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Initialise from the highest existing version of each task
+INSERT INTO task_version_state (task_uid, last_vnum)
+SELECT task_uid, max(vnum)
+FROM versions
+GROUP BY task_uid
+ON CONFLICT (task_uid) DO UPDATE SET last_vnum = GREATEST(task_version_state.last_vnum, EXCLUDED.last_vnum);
+
+-- RLS for TASK_VERSION_STATE (same writers as versions)
+ALTER TABLE task_version_state ENABLE ROW LEVEL SECURITY;
+ALTER TABLE task_version_state FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS task_version_state_select_policy ON task_version_state;
+DROP POLICY IF EXISTS task_version_state_write_policy ON task_version_state;
+
+CREATE POLICY task_version_state_select_policy ON task_version_state
+  FOR SELECT USING (is_valid_api_token());
+
+CREATE POLICY task_version_state_write_policy ON task_version_state
+  FOR ALL USING (
+    is_valid_api_token() AND (
+      has_role('admin') OR has_role('td') OR has_role('supervisor') OR has_role('artist')
+    )
+  ) WITH CHECK (
+    is_valid_api_token() AND (
+      has_role('admin') OR has_role('td') OR has_role('supervisor') OR has_role('artist')
+    )
+  );
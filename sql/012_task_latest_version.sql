@@ -0,0 +1,56 @@
+-- slate_runner: Latest Version Pointer
+-- task_version_state.latest_version_uid always points at the highest live (not soft-deleted)
+-- version of each task, maintained by a trigger on versions. Dashboards join through it
+-- instead of scanning every version of every task.
+
+ALTER TABLE task_version_state
+  ADD COLUMN IF NOT EXISTS latest_version_uid TEXT REFERENCES versions (uid) ON DELETE SET NULL;
+
+-- Helper: recompute the counter floor and latest live version for one task
+CREATE OR REPLACE FUNCTION refresh_task_latest_version(p_task_uid TEXT) RETURNS VOID AS $$
+BEGIN
+  -- Task itself is being deleted (cascade), nothing to maintain
+  IF NOT EXISTS (SELECT 1 FROM tasks WHERE uid = p_task_uid) THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO task_version_state AS s (task_uid, last_vnum, latest_version_uid)
+  SELECT p_task_uid,
+         COALESCE(max(v.vnum), 0),
+         (array_agg(v.uid ORDER BY v.vnum DESC) FILTER (WHERE v.deleted_at IS NULL))[1]
+  FROM versions v
+  WHERE v.task_uid = p_task_uid
+  ON CONFLICT (task_uid) DO UPDATE
+    SET latest_version_uid = EXCLUDED.latest_version_uid,
+        last_vnum          = GREATEST(s.last_vnum, EXCLUDED.last_vnum),
+        updated_at         = now()
+    WHERE s.latest_version_uid IS DISTINCT FROM EXCLUDED.latest_version_uid
+       OR s.last_vnum < EXCLUDED.last_vnum;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_task_latest_version() RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    PERFORM refresh_task_latest_version(OLD.task_uid);
+  END IF;
+  IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.task_uid IS DISTINCT FROM OLD.task_uid) THEN
+    PERFORM refresh_task_latest_version(NEW.task_uid);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_versions_latest ON versions;
+
+CREATE TRIGGER trg_versions_latest
+AFTER INSERT OR DELETE OR UPDATE OF task_uid, vnum, deleted_at ON versions
+FOR EACH ROW
+EXECUTE FUNCTION sync_task_latest_version();
+
+-- Backfill every task
+SELECT refresh_task_latest_version(uid) FROM tasks;
+
+-- Dashboard walk: shots of a project by sequence (tasks use idx_tasks_parent_live)
+CREATE INDEX IF NOT EXISTS idx_shots_project_seq_live ON shots (project_uid, seq, shot)
+  WHERE deleted_at IS NULL;
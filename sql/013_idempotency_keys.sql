@@ -0,0 +1,38 @@
+-- slate_runner: Idempotency Keys
+-- Stores the outcome of POST requests sent with an Idempotency-Key header so client retries
+-- replay the first response instead of creating duplicates. Keys are scoped to the caller's
+-- API token (sha256, never the raw token) and expire after IDEMPOTENCY_TTL_HOURS.
+
+CREATE TABLE IF NOT EXISTS idempotency_keys
+(
+    scope         TEXT        NOT NULL,  -- sha256 of the caller's API token
+    key           TEXT        NOT NULL,
+    method        TEXT        NOT NULL,
+    path          TEXT        NOT NULL,
+    request_hash  TEXT        NOT NULL,
+    status_code   INT,                   -- NULL while the first request is in flight
+    content_type  TEXT,
+    response_body BYTEA,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+    expires_at    TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys (expires_at);
+
+-- RLS for IDEMPOTENCY_KEYS: callers only see their own keys, anyone may purge expired ones
+ALTER TABLE idempotency_keys ENABLE ROW LEVEL SECURITY;
+ALTER TABLE idempotency_keys FORCE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS idempotency_keys_owner_policy ON idempotency_keys;
+DROP POLICY IF EXISTS idempotency_keys_purge_policy ON idempotency_keys;
+
+CREATE POLICY idempotency_keys_owner_policy ON idempotency_keys
+  FOR ALL USING (
+    is_valid_api_token() AND scope = encode(digest(current_setting('app.current_token', true), 'sha256'), 'hex')
+  ) WITH CHECK (
+    is_valid_api_token() AND scope = encode(digest(current_setting('app.current_token', true), 'sha256'), 'hex')
+  );
+
+CREATE POLICY idempotency_keys_purge_policy ON idempotency_keys
+  FOR DELETE USING (is_valid_api_token() AND expires_at < now());
@@ -0,0 +1,13 @@
+-- slate_runner: Shared Rate Limits
+-- GCRA state for RATE_LIMIT_BACKEND=postgres: one theoretical arrival time (epoch seconds)
+-- per limiter key, so every API worker enforces the same per-IP and per-token limits.
+-- Keys are "ip:<address>" or "token:<sha256 prefix>"; rows whose TAT has passed are idle
+-- and purged by the API. The limiter runs before authentication, so this table has no RLS.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limits
+(
+    key TEXT PRIMARY KEY,
+    tat DOUBLE PRECISION NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limits_tat ON rate_limits (tat);
@@ -0,0 +1,70 @@
+-- slate_runner: Commit-Safe Change Feed Watermark
+-- updated_at is the transaction *start* time, so a long transaction can commit rows behind
+-- a watermark clients have already passed. Every write now also records the id of the
+-- transaction that made it. GET /projects/{uid}/changes pages on (change_xid, id) and only
+-- returns rows below pg_snapshot_xmin(pg_current_snapshot()): every transaction older than
+-- the oldest one still running has finished, so nothing can appear behind the watermark.
+
+CREATE OR REPLACE FUNCTION set_change_xid() RETURNS TRIGGER AS $$
+BEGIN
+  NEW.change_xid := pg_current_xact_id()::text::bigint;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Existing rows predate every open transaction; 0 puts them at the start of the feed
+ALTER TABLE projects ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE shots ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE tasks ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE versions ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE publishes ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE render_jobs ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE events ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+
+DROP TRIGGER IF EXISTS trg_projects_change_xid ON projects;
+DROP TRIGGER IF EXISTS trg_assets_change_xid ON assets;
+DROP TRIGGER IF EXISTS trg_shots_change_xid ON shots;
+DROP TRIGGER IF EXISTS trg_tasks_change_xid ON tasks;
+DROP TRIGGER IF EXISTS trg_versions_change_xid ON versions;
+DROP TRIGGER IF EXISTS trg_publishes_change_xid ON publishes;
+DROP TRIGGER IF EXISTS trg_render_jobs_change_xid ON render_jobs;
+DROP TRIGGER IF EXISTS trg_events_change_xid ON events;
+
+CREATE TRIGGER trg_projects_change_xid BEFORE INSERT OR UPDATE ON projects
+    FOR EACH ROW EXECUTE FUNCTION set_change_xid();
+CREATE TRIGGER trg_assets_change_xid BEFORE INSERT OR UPDATE ON assets
+    FOR EACH ROW EXECUTE FUNCTION set_change_xid();
+CREATE TRIGGER trg_shots_change_xid BEFORE INSERT OR UPDATE ON shots
+    FOR EACH ROW EXECUTE FUNCTION set_change_xid();
+CREATE TRIGGER trg_tasks_change_xid BEFORE INSERT OR UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION set_change_xid();
+CREATE TRIGGER trg_versions_change_xid BEFORE INSERT OR UPDATE ON versions
+    FOR EACH ROW EXECUTE FUNCTION set_change_xid();
+CREATE TRIGGER trg_publishes_change_xid BEFORE INSERT OR UPDATE ON publishes
+    FOR EACH ROW EXECUTE FUNCTION set_change_xid();
+CREATE TRIGGER trg_render_jobs_change_xid BEFORE INSERT OR UPDATE ON render_jobs
+    FOR EACH ROW EXECUTE FUNCTION set_change_xid();
+CREATE TRIGGER trg_events_change_xid BEFORE INSERT OR UPDATE ON events
+    FOR EACH ROW EXECUTE FUNCTION set_change_xid();
+
+-- The feed range-scans each table on (project_uid, change_xid, id)
+CREATE INDEX IF NOT EXISTS idx_projects_change_xid ON projects (change_xid, id);
+
+CREATE INDEX IF NOT EXISTS idx_assets_project_change_xid ON assets (project_uid, change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_shots_project_change_xid ON shots (project_uid, change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_change_xid ON tasks (project_uid, change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_versions_project_change_xid ON versions (project_uid, change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_publishes_project_change_xid ON publishes (project_uid, change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_render_jobs_project_change_xid ON render_jobs (project_uid, change_xid, id);
+CREATE INDEX IF NOT EXISTS idx_events_project_change_xid ON events (project_uid, change_xid, id);
+
+-- Replaced by the change_xid indexes above
+DROP INDEX IF EXISTS idx_projects_updated_at;
+DROP INDEX IF EXISTS idx_assets_project_updated_at;
+DROP INDEX IF EXISTS idx_shots_project_updated_at;
+DROP INDEX IF EXISTS idx_tasks_project_updated_at;
+DROP INDEX IF EXISTS idx_versions_project_updated_at;
+DROP INDEX IF EXISTS idx_publishes_project_updated_at;
+DROP INDEX IF EXISTS idx_render_jobs_project_updated_at;
+DROP INDEX IF EXISTS idx_events_project_updated_at;
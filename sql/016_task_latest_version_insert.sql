@@ -0,0 +1,61 @@
+-- slate_runner: Constant-Time Latest Version Pointer on Insert
+-- 012 re-aggregated every version of the task on each insert. A new version can only
+-- raise the counter floor or become the latest live version, so inserts now compare NEW
+-- against the current latest in O(1). The full refresh remains for deletes and for updates
+-- that actually change task_uid, vnum or deleted_at.
+
+CREATE OR REPLACE FUNCTION sync_task_latest_version() RETURNS TRIGGER AS $$
+DECLARE
+  latest_vnum INT;
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    -- Lock the task's row so concurrent inserts apply one at a time
+    PERFORM 1 FROM task_version_state WHERE task_uid = NEW.task_uid FOR UPDATE;
+    IF NOT FOUND THEN
+      -- First version of a task not created through the counter
+      PERFORM refresh_task_latest_version(NEW.task_uid);
+      RETURN NULL;
+    END IF;
+
+    SELECT v.vnum INTO latest_vnum
+    FROM task_version_state s
+    JOIN versions v ON v.uid = s.latest_version_uid
+    WHERE s.task_uid = NEW.task_uid;
+
+    UPDATE task_version_state
+    SET last_vnum          = GREATEST(last_vnum, NEW.vnum),
+        latest_version_uid = CASE
+                               WHEN NEW.deleted_at IS NULL AND (latest_vnum IS NULL OR NEW.vnum > latest_vnum)
+                                 THEN NEW.uid
+                               ELSE latest_version_uid
+                             END,
+        updated_at         = now()
+    WHERE task_uid = NEW.task_uid
+      AND (last_vnum < NEW.vnum OR (NEW.deleted_at IS NULL AND (latest_vnum IS NULL OR NEW.vnum > latest_vnum)));
+    RETURN NULL;
+  END IF;
+
+  PERFORM refresh_task_latest_version(OLD.task_uid);
+  IF TG_OP = 'UPDATE' AND NEW.task_uid IS DISTINCT FROM OLD.task_uid THEN
+    PERFORM refresh_task_latest_version(NEW.task_uid);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_versions_latest ON versions;
+DROP TRIGGER IF EXISTS trg_versions_latest_update ON versions;
+
+CREATE TRIGGER trg_versions_latest
+AFTER INSERT OR DELETE ON versions
+FOR EACH ROW
+EXECUTE FUNCTION sync_task_latest_version();
+
+-- Only updates that change a column the pointer depends on, not ones that merely SET it
+CREATE TRIGGER trg_versions_latest_update
+AFTER UPDATE OF task_uid, vnum, deleted_at ON versions
+FOR EACH ROW
+WHEN (OLD.task_uid IS DISTINCT FROM NEW.task_uid
+   OR OLD.vnum IS DISTINCT FROM NEW.vnum
+   OR OLD.deleted_at IS DISTINCT FROM NEW.deleted_at)
+EXECUTE FUNCTION sync_task_latest_version();
@@ -0,0 +1,10 @@
+-- slate_runner: Idempotency Key Leases
+-- A key whose first request never finished (worker killed or recycled mid-request) used to
+-- answer 409 until the key expired. Reservations now hold a lease: while status_code is NULL
+-- the key is only "in flight" until locked_until, after which a retry of the same request
+-- takes it over and runs again.
+
+ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS locked_until TIMESTAMPTZ;
+
+-- Unfinished keys from before this migration belong to workers that have since restarted
+UPDATE idempotency_keys SET locked_until = now() WHERE status_code IS NULL AND locked_until IS NULL;
@@ -0,0 +1,61 @@
+-- slate_runner: Globally Unique Event UIDs
+-- Partitioning (007) can only enforce uid uniqueness together with the partition key, as
+-- (uid, created_at), so the same uid could be written again with a different created_at
+-- (e.g. a client retrying a batch a second later). event_uids is a plain table keyed on
+-- uid alone: every insert into events claims its uid there in the same transaction.
+--
+-- An event whose uid is already claimed is skipped, like INSERT ... ON CONFLICT DO NOTHING,
+-- so writers see duplicates as rows missing from RETURNING. Concurrent claims of one uid
+-- wait on the primary key until the first transaction commits or rolls back.
+-- Hard deletes release the uid again; the retention job releases the uids of the months it
+-- archives, so retries are deduplicated for as long as the event is kept. Like rate_limits
+-- the table has no RLS: it is only written through the events triggers, whose inserts are
+-- still checked by the events policies, and by the retention job, which has no token.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS event_uids
+(
+    uid        TEXT PRIMARY KEY,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+INSERT INTO event_uids (uid, created_at)
+SELECT uid, min(created_at)
+FROM events
+GROUP BY uid
+ON CONFLICT (uid) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION claim_event_uid() RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO event_uids (uid, created_at) VALUES (NEW.uid, NEW.created_at)
+  ON CONFLICT (uid) DO NOTHING;
+  IF NOT FOUND THEN
+    -- Already written (or being written) under this uid
+    RETURN NULL;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION release_event_uid() RETURNS TRIGGER AS $$
+BEGIN
+  DELETE FROM event_uids WHERE uid = OLD.uid;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_events_claim_uid ON events;
+DROP TRIGGER IF EXISTS trg_events_release_uid ON events;
+
+CREATE TRIGGER trg_events_claim_uid
+BEFORE INSERT ON events
+FOR EACH ROW
+EXECUTE FUNCTION claim_event_uid();
+
+CREATE TRIGGER trg_events_release_uid
+AFTER DELETE ON events
+FOR EACH ROW
+EXECUTE FUNCTION release_event_uid();
+
+COMMIT;
@@ -0,0 +1,14 @@
+-- slate_runner: Named Version Number Constraint
+-- 001 created UNIQUE (task_uid, vnum) under Postgres' generated name. It is renamed to the
+-- name the Version model declares (uq_version_per_task), so the API can tell a version
+-- number clash from any other integrity error by constraint name.
+
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM pg_constraint
+    WHERE conrelid = 'versions'::regclass AND conname = 'versions_task_uid_vnum_key'
+  ) THEN
+    ALTER TABLE versions RENAME CONSTRAINT versions_task_uid_vnum_key TO uq_version_per_task;
+  END IF;
+END $$;
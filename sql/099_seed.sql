@@ -3,7 +3,7 @@
 -- render jobs, and events with consistent project relationships.
 
 -- Clear existing data
-TRUNCATE publishes, versions, tasks, shots, assets, projects, render_jobs, events RESTART IDENTITY CASCADE;
+TRUNCATE publishes, versions, tasks, shots, assets, projects, render_jobs, events, event_uids RESTART IDENTITY CASCADE;
 
 -- Helper: generate a random timestamp within the past N days
 CREATE OR REPLACE FUNCTION random_time(days INT DEFAULT 30)
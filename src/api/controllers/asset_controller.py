@@ -1,4 +1,4 @@
-﻿from typing import Optional
+﻿from typing import List, Optional
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
@@ -7,8 +7,10 @@ from models.asset import Asset
 from models.project import Project
 from schemas.task import TaskOut
 from schemas.asset import AssetOut, AssetCreate, AssetUpdate
+from schemas.batch import create_batch_response
 from schemas.response import create_response
-from utils.database import db_lookup
+from utils.database import db_lookup, db_lookup_many, uid_in
+from utils.include import include_options
 from utils.uid import generate_uid
 from utils.datetime_helpers import now_utc
 
@@ -87,6 +89,8 @@ def list_assets(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        include: Optional[str] = None,
+        uids: Optional[List[str]] = None,
 ) -> dict:
     # Build base query with filters
     base_stmt = select(Asset)
@@ -98,6 +102,9 @@ def list_assets(
     if uid:
         base_stmt = base_stmt.where(Asset.uid == uid)
 
+    if uids:
+        base_stmt = base_stmt.where(uid_in(Asset, uids))
+
     if project_uid:
         base_stmt = base_stmt.where(Asset.project_uid == project_uid)
 
@@ -112,6 +119,7 @@ def list_assets(
     
     # Get paginated items
     stmt = base_stmt.order_by(Asset.name.asc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Asset, include))  # one extra query per include level
     data = db.execute(stmt).scalars().all()
     
     return {
@@ -124,8 +132,14 @@ def list_assets(
     }
 
 
+# Get assets by UID in one query, in request order, reporting UIDs that were not found
+def batch_get_assets(db: Session, uids: List[str], include: Optional[str] = None) -> dict:
+    items, missing = db_lookup_many(db, Asset, uids, include_options(Asset, include))
+    return create_batch_response(items, missing, "Assets retrieved successfully")
+
+
 # Get all tasks belonging to an asset
-def list_asset_tasks(db: Session, asset_uid: str, limit: int = 50, offset: int = 0):
+def list_asset_tasks(db: Session, asset_uid: str, limit: int = 50, offset: int = 0, include: Optional[str] = None):
     db_lookup(db, Asset, asset_uid)
 
     base_stmt = select(Task).where(
@@ -137,6 +151,7 @@ def list_asset_tasks(db: Session, asset_uid: str, limit: int = 50, offset: int =
     
     # Get paginated items
     stmt = base_stmt.order_by(Task.name.asc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Task, include))  # one extra query per include level
     data = db.execute(stmt).scalars().all()
     
     return {
@@ -0,0 +1,123 @@
+import re
+from typing import Any, Dict, List
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from db.db import SessionLocal
+import api.controllers.asset_controller as asset_controller
+import api.controllers.event_controller as event_controller
+import api.controllers.project_controller as project_controller
+import api.controllers.publish_controller as publish_controller
+import api.controllers.render_controller as render_controller
+import api.controllers.shot_controller as shot_controller
+import api.controllers.task_controller as task_controller
+import api.controllers.version_controller as version_controller
+from schemas.asset import AssetCreate, AssetUpdate, AssetOut
+from schemas.batch import BatchOperation
+from schemas.event import EventCreate, EventUpdate, EventOut
+from schemas.project import ProjectCreate, ProjectUpdate, ProjectOut
+from schemas.publish import PublishCreate, PublishUpdate, PublishOut
+from schemas.render import RenderJobCreate, RenderJobUpdate, RenderJobOut
+from schemas.response import create_response
+from schemas.shot import ShotCreate, ShotUpdate, ShotOut
+from schemas.task import TaskCreate, TaskUpdate, TaskOut
+from schemas.version import VersionCreate, VersionUpdate, VersionOut
+
+# Entity -> (controller module, create schema, update schema, output schema); ops are <action>_<entity>
+BATCH_ENTITIES = {
+    "project": (project_controller, ProjectCreate, ProjectUpdate, ProjectOut),
+    "asset": (asset_controller, AssetCreate, AssetUpdate, AssetOut),
+    "shot": (shot_controller, ShotCreate, ShotUpdate, ShotOut),
+    "task": (task_controller, TaskCreate, TaskUpdate, TaskOut),
+    "version": (version_controller, VersionCreate, VersionUpdate, VersionOut),
+    "publish": (publish_controller, PublishCreate, PublishUpdate, PublishOut),
+    "render_job": (render_controller, RenderJobCreate, RenderJobUpdate, RenderJobOut),
+    "event": (event_controller, EventCreate, EventUpdate, EventOut),
+}
+
+BACK_REFERENCE = re.compile(r"^\$([A-Za-z_][A-Za-z0-9_]*)(?:\.([A-Za-z_][A-Za-z0-9_]*))?$")
+
+
+# Replace "$ref" / "$ref.field" strings with values from earlier results ("$ref" means its UID)
+def _substitute(value: Any, results: Dict[str, Dict[str, Any]]) -> Any:
+    if isinstance(value, dict):
+        return {key: _substitute(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, results) for item in value]
+    if not isinstance(value, str):
+        return value
+
+    match = BACK_REFERENCE.match(value)
+    if not match:
+        return value
+
+    ref, field = match[1], match[2] or "uid"
+    if ref not in results:
+        raise ValueError(f"Unknown back-reference '{value}'")
+    if field not in results[ref]:
+        raise ValueError(f"Back-reference '{value}' has no field '{field}'")
+    return results[ref][field]
+
+
+# Run one operation against its controller and return the serialized record (if any)
+def _run_operation(session: Session, operation: BatchOperation, uid: str, args: Dict[str, Any]) -> dict:
+    action, _, entity = operation.op.partition("_")
+    if action not in {"create", "update", "delete"} or entity not in BATCH_ENTITIES:
+        raise HTTPException(status_code=400, detail=f"Unknown operation '{operation.op}'")
+
+    controller, create_schema, update_schema, out_schema = BATCH_ENTITIES[entity]
+    if action == "create":
+        response = getattr(controller, f"create_{entity}")(session, create_schema(**args))
+    elif not uid:
+        raise HTTPException(status_code=400, detail=f"'{operation.op}' needs a target uid")
+    elif action == "update":
+        response = getattr(controller, f"update_{entity}")(session, uid, update_schema(**args))
+    else:
+        response = getattr(controller, f"delete_{entity}")(session, uid)
+
+    data = response.get("data")
+    if data is not None:
+        data = out_schema.model_validate(data).model_dump(mode="json", exclude_unset=True)
+    return {"message": response.get("message", ""), "data": data}
+
+
+# Run an ordered list of create/update/delete operations in one transaction
+def run_batch(db: Session, operations: List[BatchOperation]) -> dict:
+    # Controllers commit as they go; binding them to a savepoint session on the request's
+    # connection turns each of those commits into a savepoint release inside one transaction
+    connection = db.connection()
+    session = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    session.info["api_token"] = db.info.get("api_token")
+    session.info["lookup_cache"] = {}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    output = []
+    try:
+        for index, operation in enumerate(operations):
+            try:
+                uid = _substitute(operation.uid, results)
+                args = _substitute(operation.args, results)
+                outcome = _run_operation(session, operation, uid, args)
+            except HTTPException as e:
+                raise HTTPException(
+                    status_code=e.status_code,
+                    detail={"index": index, "op": operation.op, "error": e.detail},
+                )
+            except (ValueError, ValidationError) as e:
+                raise HTTPException(
+                    status_code=422,
+                    detail={"index": index, "op": operation.op, "error": str(e)},
+                )
+
+            if operation.ref:
+                results[operation.ref] = outcome["data"] or {}
+            output.append({"index": index, "op": operation.op, "ref": operation.ref, **outcome})
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        session.close()
+
+    return create_response(output, f"Batch of {len(output)} operations committed successfully")
@@ -0,0 +1,103 @@
+import asyncio
+from typing import Optional
+from fastapi import WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from app.config import settings
+from app.logging_config import get_logger
+from db.db import SessionLocal
+from models.project import Project
+from services.notify_service import PgListener
+
+logger = get_logger(__name__)
+
+CHANGE_FEED_TABLES = {"tasks", "versions", "publishes"}
+CHANGE_FEED_OPS = {"insert", "update", "delete"}
+
+
+# Parse a comma-separated or list filter, keeping only known values
+def _parse_filter(value, allowed: set[str]) -> set[str]:
+    if not value:
+        return set(allowed)
+    items = value.split(",") if isinstance(value, str) else value
+    return {str(item).strip().lower() for item in items} & allowed
+
+
+# Resolve a project UID or name to its UID, as seen by the caller's token under RLS
+def _project_uid(identifier: str, token: str) -> Optional[str]:
+    with SessionLocal() as db:
+        db.info["api_token"] = token
+        return db.scalar(
+            select(Project.uid).where(
+                (Project.uid == identifier) | (Project.name == identifier),
+                Project.deleted_at.is_(None)
+            )
+        )
+
+
+# Forward matching changes to the client
+async def _send_changes(websocket: WebSocket, subscription):
+    reported_drops = 0
+    while True:
+        payload = await subscription.get()
+        # Slow clients lose the oldest changes, tell them so they can resync
+        if subscription.dropped > reported_drops:
+            await websocket.send_json({"type": "lagged", "dropped": subscription.dropped - reported_drops})
+            reported_drops = subscription.dropped
+        await websocket.send_json({"type": "change", **payload})
+
+
+# Apply filter updates sent by the client, echoing the filters now in effect
+async def _receive_filters(websocket: WebSocket, filters: dict):
+    while True:
+        message = await websocket.receive_json()
+        if not isinstance(message, dict):
+            continue
+        if "tables" in message:
+            filters["tables"] = _parse_filter(message["tables"], CHANGE_FEED_TABLES)
+        if "ops" in message:
+            filters["ops"] = _parse_filter(message["ops"], CHANGE_FEED_OPS)
+        await websocket.send_json({"type": "filters", **{k: sorted(v) for k, v in filters.items()}})
+
+
+# Multiplex entity change notifications for one project onto a WebSocket
+async def project_change_feed(websocket: WebSocket, listener: Optional[PgListener], identifier: str, token: str):
+    if listener is None:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Change feed unavailable")
+        return
+
+    project_uid = await run_in_threadpool(_project_uid, identifier, token)
+    if not project_uid:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Project not found")
+        return
+
+    # Per-client filters, updatable by the client at any time
+    filters = {
+        "tables": _parse_filter(websocket.query_params.get("tables"), CHANGE_FEED_TABLES),
+        "ops": _parse_filter(websocket.query_params.get("ops"), CHANGE_FEED_OPS),
+    }
+
+    def matches(payload: dict) -> bool:
+        return (
+            payload.get("project_uid") == project_uid
+            and payload.get("table") in filters["tables"]
+            and payload.get("op") in filters["ops"]
+        )
+
+    await websocket.accept()
+    subscription = listener.subscribe("entity_changes", matches, maxsize=settings.WS_SEND_QUEUE_SIZE)
+
+    tasks = [
+        asyncio.create_task(_send_changes(websocket, subscription)),
+        asyncio.create_task(_receive_filters(websocket, filters)),
+    ]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc and not isinstance(exc, WebSocketDisconnect):
+                logger.error("change feed for project '%s' failed: %s", project_uid, exc)
+    finally:
+        for task in tasks:
+            task.cancel()
+        listener.unsubscribe(subscription)
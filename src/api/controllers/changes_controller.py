@@ -0,0 +1,135 @@
+import base64
+import json
+from collections import defaultdict
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import BigInteger, Text, cast, select, func, literal, union_all, or_, and_
+from models.asset import Asset
+from models.event import Event
+from models.project import Project
+from models.publish import Publish
+from models.render import RenderJob
+from models.shot import Shot
+from models.task import Task
+from models.version import Version
+from schemas.asset import AssetOut
+from schemas.event import EventOut
+from schemas.project import ProjectOut
+from schemas.publish import PublishOut
+from schemas.render import RenderJobOut
+from schemas.shot import ShotOut
+from schemas.task import TaskOut
+from schemas.version import VersionOut
+from utils.database import db_lookup
+
+# Entity name -> (model, output schema) for every table that belongs to a project
+CHANGE_SOURCES = {
+    "projects": (Project, ProjectOut),
+    "assets": (Asset, AssetOut),
+    "shots": (Shot, ShotOut),
+    "tasks": (Task, TaskOut),
+    "versions": (Version, VersionOut),
+    "publishes": (Publish, PublishOut),
+    "render_jobs": (RenderJob, RenderJobOut),
+    "events": (Event, EventOut),
+}
+
+# Highest transaction id the feed may return: every transaction below the oldest one still
+# running has committed or aborted, so no row can later appear behind this watermark
+VISIBLE_XID = cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+
+# Encode a watermark (change_xid, entity, id) as an opaque token
+def _encode_token(change_xid: int, entity: str, row_id: int) -> str:
+    raw = json.dumps({"x": change_xid, "e": entity, "i": row_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+# Decode a watermark token, an empty token means a full sync
+def _decode_token(token: Optional[str]) -> tuple[int, str, int]:
+    if not token:
+        return 0, "", 0
+
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return int(raw["x"]), str(raw["e"]), int(raw["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid 'since' token.")
+
+
+# Keyset predicate on (change_xid, entity, id), simplified per table so it stays a plain index range
+def _after(model, entity: str, since_xid: int, last_entity: str, last_id: int):
+    if entity > last_entity:
+        return model.change_xid >= since_xid
+    if entity == last_entity:
+        return or_(model.change_xid > since_xid, and_(model.change_xid == since_xid, model.id > last_id))
+    return model.change_xid > since_xid
+
+
+# Get everything inserted, updated or soft-deleted in a project since a watermark
+def list_project_changes(db: Session, project_uid: str, since: Optional[str] = None, limit: int = 500) -> dict:
+    project = db_lookup(db, Project, project_uid)
+    since_xid, last_entity, last_id = _decode_token(since)
+
+    # One index range scan per table, each already ordered and capped, merged into one stream
+    parts = []
+    for entity, (model, _) in CHANGE_SOURCES.items():
+        scope = model.uid == project.uid if model is Project else model.project_uid == project.uid
+        parts.append(
+            select(
+                literal(entity).label("entity"),
+                model.id.label("id"),
+                model.uid.label("uid"),
+                model.change_xid.label("change_xid"),
+                model.updated_at.label("changed_at"),
+                model.deleted_at.label("deleted_at"),
+            )
+            .where(scope, _after(model, entity, since_xid, last_entity, last_id), model.change_xid < VISIBLE_XID)
+            .order_by(model.change_xid.asc(), model.id.asc())
+            .limit(limit + 1)
+        )
+
+    changes = union_all(*parts).subquery()
+    rows = db.execute(
+        select(changes).order_by(changes.c.change_xid, changes.c.entity, changes.c.id).limit(limit + 1)
+    ).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Hydrate live rows with one query per entity type
+    live_ids = defaultdict(list)
+    for row in rows:
+        if row.deleted_at is None:
+            live_ids[row.entity].append(row.id)
+
+    hydrated = {}
+    for entity, ids in live_ids.items():
+        model, schema = CHANGE_SOURCES[entity]
+        for item in db.scalars(select(model).where(model.id.in_(ids))):
+            hydrated[(entity, item.id)] = schema.model_validate(item).model_dump(mode="json")
+
+    data = [
+        {
+            "entity": row.entity,
+            "uid": row.uid,
+            "op": "delete" if row.deleted_at is not None else "upsert",
+            "changed_at": row.changed_at,
+            "data": hydrated.get((row.entity, row.id)),
+        }
+        for row in rows
+    ]
+
+    if rows:
+        next_token = _encode_token(rows[-1].change_xid, rows[-1].entity, rows[-1].id)
+    else:
+        next_token = since or _encode_token(0, "", 0)
+
+    return {
+        "status": "success",
+        "message": "Project changes retrieved successfully",
+        "data": data,
+        "next_token": next_token,
+        "has_more": has_more,
+    }
@@ -1,12 +1,16 @@
-﻿from fastapi import HTTPException
+﻿from collections import Counter
+from datetime import datetime
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_
 from models.event import Event
 from models.project import Project
-from schemas.event import EventOut, EventCreate, EventUpdate
+from schemas.event import EventOut, EventCreate, EventUpdate, EventBatchCreate, EventBatchOut
+from services.event_ingest_service import can_write_events, event_ingest_queue, insert_events
+from schemas.batch import create_batch_response
 from schemas.response import create_response
-from typing import Optional
-from utils.database import db_lookup
+from typing import List, Optional
+from utils.database import db_lookup, db_lookup_many, uid_in
 from utils.uid import generate_uid
 from utils.datetime_helpers import now_utc
 
@@ -20,9 +24,20 @@ def list_events(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        payload_contains: Optional[dict] = None,
+        uids: Optional[List[str]] = None,
 ) -> dict:
     # Build base query with filters
     base_stmt = select(Event)
+
+    # Bounds on created_at let Postgres prune monthly partitions
+    if created_after:
+        base_stmt = base_stmt.where(Event.created_at >= created_after)
+
+    if created_before:
+        base_stmt = base_stmt.where(Event.created_at < created_before)
     
     # Exclude soft-deleted records by default
     if not include_deleted:
@@ -31,12 +46,19 @@ def list_events(
     if uid:
         base_stmt = base_stmt.where(Event.uid == uid)
 
+    if uids:
+        base_stmt = base_stmt.where(uid_in(Event, uids))
+
     if project_uid:
         base_stmt = base_stmt.where(Event.project_uid == project_uid)
 
     if kind:
         base_stmt = base_stmt.where(Event.kind == kind)
 
+    # JSONB containment (@>) served by the jsonb_path_ops GIN index
+    if payload_contains:
+        base_stmt = base_stmt.where(Event.payload.contains(payload_contains))
+
     # Get total count
     count = db.scalar(select(func.count()).select_from(base_stmt.subquery()))
     
@@ -54,6 +76,12 @@ def list_events(
     }
 
 
+# Get events by UID in one query, in request order, reporting UIDs that were not found
+def batch_get_events(db: Session, uids: List[str]) -> dict:
+    items, missing = db_lookup_many(db, Event, uids)
+    return create_batch_response(items, missing, "Events retrieved successfully")
+
+
 # Create a new event
 def create_event(db: Session, data: EventCreate) -> EventOut:
     # Validate project exists
@@ -62,21 +90,84 @@ def create_event(db: Session, data: EventCreate) -> EventOut:
     # Generate UID if not provided
     uid = data.uid or generate_uid("EVENT")
     
-    # Create and persist event
-    new_event = Event(
-        uid=uid,
-        project_uid=project.uid,
-        kind=data.kind,
-        payload=data.payload,
-    )
-    
-    db.add(new_event)
+    # Create and persist event (its UID is claimed in event_uids, so a taken UID writes nothing)
+    row = {"uid": uid, "project_uid": project.uid, "kind": data.kind, "payload": data.payload}
+    if not insert_events(db, [row]):
+        raise HTTPException(status_code=409, detail=f"Event '{uid}' already exists")
     db.commit()
-    db.refresh(new_event)
+
+    new_event = db.scalar(select(Event).where(Event.uid == uid))
     
     return create_response(new_event, "Event created successfully")
 
 
+# Create many events at once, inserted with one multi-row statement or queued for the background writer
+def create_events_batch(
+        db: Session,
+        data: EventBatchCreate,
+        *,
+        asynchronous: bool = False,
+        token: str | None = None,
+) -> EventBatchOut:
+    # Queued events are written after the response, so RLS must be checked up front
+    if not can_write_events(db):
+        raise HTTPException(status_code=403, detail="API token is not allowed to write events")
+
+    # Client UIDs must be unique within the batch
+    client_uids = Counter(event.uid for event in data.events if event.uid)
+    duplicates = [uid for uid, count in client_uids.items() if count > 1]
+    if duplicates:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Duplicate event UIDs in batch: {', '.join(sorted(duplicates))}"
+        )
+
+    # Resolve every referenced project (by UID or name) in a single query
+    identifiers = {event.project_uid for event in data.events}
+    projects = db.execute(
+        select(Project.uid, Project.name).where(or_(Project.uid.in_(identifiers), Project.name.in_(identifiers)))
+    ).all()
+    resolved = {row.uid: row.uid for row in projects} | {row.name: row.uid for row in projects}
+    missing = identifiers - resolved.keys()
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Projects not found: {', '.join(sorted(missing))}"
+        )
+
+    rows = [
+        {
+            "uid": event.uid or generate_uid("EVENT"),
+            "project_uid": resolved[event.project_uid],
+            "kind": event.kind,
+            "payload": event.payload,
+        }
+        for event in data.events
+    ]
+
+    if asynchronous:
+        accepted, dropped = event_ingest_queue.enqueue(rows, token)
+        uids = [row["uid"] for row in rows[:accepted]]
+        return create_response(
+            EventBatchOut(accepted=accepted, dropped=dropped, uids=uids),
+            "Events queued successfully" if not dropped else "Event queue full, some events were dropped"
+        )
+
+    # Events whose UID already exists (client retries) are skipped, not failed
+    uids = insert_events(db, rows)
+    db.commit()
+
+    return create_response(
+        EventBatchOut(accepted=len(uids), skipped=len(rows) - len(uids), uids=uids),
+        "Events created successfully"
+    )
+
+
+# Get event ingest queue depth and counters
+def get_event_queue_stats() -> dict:
+    return create_response(event_ingest_queue.stats(), "Event queue stats retrieved successfully")
+
+
 # Update an event by UID
 def update_event(db: Session, uid: str, data: EventUpdate) -> EventOut:
     # Locate event by UID
@@ -1,15 +1,23 @@
 ﻿from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, and_
+from db.db import SessionLocal
 from models.publish import Publish
-from models.task import Task
+from models.task import Task, TaskVersionState
+from models.version import Version
 from models.shot import Shot
 from models.asset import Asset
 from models.project import Project
-from typing import Optional
-from schemas.project import ProjectOut, ProjectCreate, ProjectUpdate, ProjectOverviewOut
+from typing import List, Optional
+from schemas.project import (
+    ProjectOut, ProjectCreate, ProjectUpdate, ProjectOverviewOut,
+    DashboardShot, DashboardTask, DashboardVersion,
+)
+from schemas.batch import create_batch_response
 from schemas.response import create_response
-from utils.database import db_lookup
+from utils.database import db_lookup, db_lookup_many, uid_in
+from utils.include import include_options
 from utils.uid import generate_uid
 from utils.datetime_helpers import now_utc
 
@@ -70,6 +78,7 @@ def list_projects(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        uids: Optional[List[str]] = None,
 ) -> dict:
     # Build base query with filters
     base_stmt = select(Project)
@@ -81,6 +90,9 @@ def list_projects(
     if uid:
         base_stmt = base_stmt.where(Project.uid == uid)
 
+    if uids:
+        base_stmt = base_stmt.where(uid_in(Project, uids))
+
     if name:
         base_stmt = base_stmt.where(Project.name.ilike(f"%{name}%"))
 
@@ -101,6 +113,12 @@ def list_projects(
     }
 
 
+# Get projects by UID in one query, in request order, reporting UIDs that were not found
+def batch_get_projects(db: Session, uids: List[str]) -> dict:
+    items, missing = db_lookup_many(db, Project, uids)
+    return create_batch_response(items, missing, "Projects retrieved successfully")
+
+
 # Get basic counts and info for a single project
 def list_project_overview(db: Session, project_uid: str) -> ProjectOverviewOut:
     project = db_lookup(db, Project, project_uid)
@@ -123,12 +141,95 @@ def list_project_overview(db: Session, project_uid: str) -> ProjectOverviewOut:
     return create_response(overview, "Project overview retrieved successfully")
 
 
+# Group dashboard rows (one per shot/task) into NDJSON shot lines, reading from a session of their own
+def _dashboard_lines(stmt, token: Optional[str]):
+    with SessionLocal() as session:
+        session.info["api_token"] = token
+        current = None
+        for row in session.execute(stmt):
+            if current is None or current.uid != row.uid:
+                if current is not None:
+                    yield current.model_dump_json() + "\n"
+                current = DashboardShot(
+                    uid=row.uid, seq=row.seq, shot=row.shot, frame_in=row.frame_in, frame_out=row.frame_out,
+                )
+            if row.task_uid is None:
+                continue
+            latest = None
+            if row.version_uid is not None:
+                latest = DashboardVersion(
+                    uid=row.version_uid, vnum=row.vnum, status=row.version_status,
+                    created_by=row.created_by, created_at=row.version_created_at,
+                )
+            current.tasks.append(DashboardTask(
+                uid=row.task_uid, name=row.task_name, assignee=row.assignee,
+                status=row.task_status, latest_version=latest,
+            ))
+        if current is not None:
+            yield current.model_dump_json() + "\n"
+
+
+# Stream shots with their tasks and each task's latest version as NDJSON, one page of sequences at a time
+def stream_project_dashboard(
+        db: Session,
+        project_uid: str,
+        token: Optional[str] = None,
+        after_seq: Optional[str] = None,
+        seq_limit: int = 10,
+) -> StreamingResponse:
+    project = db_lookup(db, Project, project_uid)
+
+    # Pick the page of sequences up front so the next cursor can go in the headers
+    seq_stmt = (
+        select(Shot.seq)
+        .where(Shot.project_uid == project.uid, Shot.deleted_at.is_(None))
+        .group_by(Shot.seq)
+        .order_by(Shot.seq)
+        .limit(seq_limit + 1)
+    )
+    if after_seq is not None:
+        seq_stmt = seq_stmt.where(Shot.seq > after_seq)
+    seqs = db.scalars(seq_stmt).all()
+    has_more = len(seqs) > seq_limit
+    seqs = seqs[:seq_limit]
+
+    # Whole tree in one query: shots -> live tasks -> latest version via the maintained pointer
+    stmt = (
+        select(
+            Shot.uid, Shot.seq, Shot.shot, Shot.frame_in, Shot.frame_out,
+            Task.uid.label("task_uid"), Task.name.label("task_name"),
+            Task.assignee, Task.status.label("task_status"),
+            Version.uid.label("version_uid"), Version.vnum, Version.status.label("version_status"),
+            Version.created_by, Version.created_at.label("version_created_at"),
+        )
+        .outerjoin(Task, and_(
+            Task.parent_uid == Shot.uid,
+            Task.parent_type == "shot",
+            Task.deleted_at.is_(None),
+        ))
+        .outerjoin(TaskVersionState, TaskVersionState.task_uid == Task.uid)
+        .outerjoin(Version, Version.uid == TaskVersionState.latest_version_uid)
+        .where(Shot.project_uid == project.uid, Shot.deleted_at.is_(None), Shot.seq.in_(seqs))
+        .order_by(Shot.seq, Shot.shot, Task.name)
+        .execution_options(yield_per=500)
+    )
+
+    # The request session is closed once the response starts, so rows stream from a session of their own
+    lines = _dashboard_lines(stmt, token) if seqs else iter(())
+
+    headers = {"X-Has-More": str(has_more).lower()}
+    if has_more:
+        headers["X-Next-After-Seq"] = seqs[-1]
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+
+
 # Get all assets belonging to a project
 def list_project_assets(
         db: Session,
         project_uid: str,
         limit: int = 50,
         offset: int = 0,
+        include: Optional[str] = None,
 ):
     db_lookup(db, Project, project_uid)
 
@@ -139,6 +240,7 @@ def list_project_assets(
     
     # Get paginated items
     stmt = base_stmt.order_by(Asset.name.asc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Asset, include))  # one extra query per include level
     data = db.execute(stmt).scalars().all()
     
     return {
@@ -159,7 +261,8 @@ def list_project_shots(
         shot: str = None,
         range: str = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        include: Optional[str] = None,
 ):
     db_lookup(db, Project, project_uid)
 
@@ -182,6 +285,7 @@ def list_project_shots(
     
     # Get paginated items
     stmt = base_stmt.order_by(Shot.seq.asc(), Shot.shot.asc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Shot, include))  # one extra query per include level
     data = db.execute(stmt).scalars().all()
     
     return {
@@ -201,7 +305,8 @@ def list_project_tasks(
         parent_type: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        include: Optional[str] = None,
 ):
     db_lookup(db, Project, project_uid)
 
@@ -217,6 +322,7 @@ def list_project_tasks(
     
     # Get paginated items
     stmt = base_stmt.order_by(Task.created_at.desc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Task, include))  # one extra query per include level
     data = db.execute(stmt).scalars().all()
     
     return {
@@ -236,7 +342,8 @@ def list_project_publishes(
         type: str = None,
         rep: str = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        meta_contains: Optional[dict] = None,
 ):
     db_lookup(db, Project, project_uid)
 
@@ -247,6 +354,10 @@ def list_project_publishes(
     if rep:
         base_stmt = base_stmt.where(Publish.representation == rep)
 
+    # JSONB containment (@>) served by the jsonb_path_ops GIN index
+    if meta_contains:
+        base_stmt = base_stmt.where(Publish.meta.contains(meta_contains))
+
     # Get total count
     count = db.scalar(select(func.count()).select_from(base_stmt.subquery()))
     
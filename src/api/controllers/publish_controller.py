@@ -1,13 +1,15 @@
 ﻿from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
+from api.controllers.resolve_controller import invalidate_resolve_cache
 from models.publish import Publish
 from models.project import Project
 from models.version import Version
 from schemas.publish import PublishOut, PublishCreate, PublishUpdate
+from schemas.batch import create_batch_response
 from schemas.response import create_response
-from typing import Optional
-from utils.database import db_lookup
+from typing import List, Optional
+from utils.database import db_lookup, db_lookup_many, uid_in
 from utils.uid import generate_uid
 from utils.datetime_helpers import now_utc
 
@@ -34,6 +36,7 @@ def create_publish(db: Session, data: PublishCreate) -> PublishOut:
     
     db.add(new_publish)
     db.commit()
+    invalidate_resolve_cache()
     db.refresh(new_publish)
     
     return create_response(new_publish, "Publish created successfully")
@@ -58,6 +61,7 @@ def update_publish(db: Session, uid: str, data: PublishUpdate) -> PublishOut:
         publish.meta = data.meta
     
     db.commit()
+    invalidate_resolve_cache()
     db.refresh(publish)
     return create_response(publish, "Publish updated successfully")
 
@@ -70,6 +74,7 @@ def delete_publish(db: Session, uid: str) -> dict:
     publish.deleted_at = now_utc()
     
     db.commit()
+    invalidate_resolve_cache()
     return create_response(None, f"Publish '{uid}' deleted successfully")
 
 
@@ -85,6 +90,7 @@ def list_publishes(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        uids: Optional[List[str]] = None,
 ) -> dict:
     # Build base query with filters
     base_stmt = select(Publish)
@@ -96,6 +102,9 @@ def list_publishes(
     if uid:
         base_stmt = base_stmt.where(Publish.uid == uid)
 
+    if uids:
+        base_stmt = base_stmt.where(uid_in(Publish, uids))
+
     if project_uid:
         base_stmt = base_stmt.where(Publish.project_uid == project_uid)
 
@@ -126,3 +135,9 @@ def list_publishes(
         "limit": limit,
         "offset": offset
     }
+
+
+# Get publishes by UID in one query, in request order, reporting UIDs that were not found
+def batch_get_publishes(db: Session, uids: List[str]) -> dict:
+    items, missing = db_lookup_many(db, Publish, uids)
+    return create_batch_response(items, missing, "Publishes retrieved successfully")
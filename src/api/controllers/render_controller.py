@@ -1,12 +1,20 @@
-﻿from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from models.render import RenderJob
+﻿import asyncio
+import json
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select, func, insert, update, exists
+from enums.enums import RenderJobStatus
+from models.render import RenderJob, RenderJobDependency
 from models.project import Project
 from schemas.render import RenderJobOut, RenderJobCreate, RenderJobUpdate
+from schemas.batch import create_batch_response
 from schemas.response import create_response
-from typing import Optional
-from utils.database import db_lookup
+from typing import List, Optional
+from app.config import settings
+from services.notify_service import PgListener
+from utils.database import db_lookup, db_lookup_many, uid_in
 from utils.uid import generate_uid
 from utils.datetime_helpers import now_utc
 
@@ -21,6 +29,8 @@ def list_render_jobs(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        context_contains: Optional[dict] = None,
+        uids: Optional[List[str]] = None,
 ) -> dict:
     # Build base query with filters
     base_stmt = select(RenderJob)
@@ -32,6 +42,9 @@ def list_render_jobs(
     if uid:
         base_stmt = base_stmt.where(RenderJob.uid == uid)
 
+    if uids:
+        base_stmt = base_stmt.where(uid_in(RenderJob, uids))
+
     if project_uid:
         base_stmt = base_stmt.where(RenderJob.project_uid == project_uid)
 
@@ -41,6 +54,10 @@ def list_render_jobs(
     if status:
         base_stmt = base_stmt.where(RenderJob.status == status)
 
+    # JSONB containment (@>) served by the jsonb_path_ops GIN index
+    if context_contains:
+        base_stmt = base_stmt.where(RenderJob.context.contains(context_contains))
+
     # Get total count
     count = db.scalar(select(func.count()).select_from(base_stmt.subquery()))
     
@@ -58,13 +75,56 @@ def list_render_jobs(
     }
 
 
-# Create a new render job
+# Get render jobs by UID in one query, in request order, reporting UIDs that were not found
+def batch_get_render_jobs(db: Session, uids: List[str]) -> dict:
+    items, missing = db_lookup_many(db, RenderJob, uids)
+    return create_batch_response(items, missing, "Render Jobs retrieved successfully")
+
+
+# Create a new render job, blocked until all of its dependencies have succeeded
 def create_render_job(db: Session, data: RenderJobCreate) -> RenderJobOut:
     # Validate project exists
     project = db_lookup(db, Project, data.project_uid)
     
     # Generate UID if not provided
     uid = data.uid or generate_uid("RJ")
+    depends_on = list(dict.fromkeys(data.depends_on or []))
+    status = data.status
+
+    if depends_on:
+        if uid in depends_on:
+            raise HTTPException(status_code=400, detail="Render job cannot depend on itself.")
+
+        # Validate dependencies exist in a single query
+        upstream = db.execute(
+            select(RenderJob.uid, RenderJob.status).where(
+                RenderJob.uid.in_(depends_on),
+                RenderJob.deleted_at.is_(None)
+            )
+        ).all()
+        missing = set(depends_on) - {row.uid for row in upstream}
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Render job dependencies not found: {', '.join(sorted(missing))}"
+            )
+
+        # A dependency that already failed means this job can never run
+        failed = sorted(row.uid for row in upstream if row.status == RenderJobStatus.failed)
+        if failed:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Render job dependencies have failed: {', '.join(failed)}"
+            )
+
+        # Hold the job back until every dependency has succeeded
+        if any(row.status != RenderJobStatus.succeeded for row in upstream):
+            status = RenderJobStatus.blocked
+        elif status == RenderJobStatus.blocked:
+            status = RenderJobStatus.queued
+    elif status == RenderJobStatus.blocked:
+        # Nothing would ever release it
+        raise HTTPException(status_code=400, detail="Render job cannot be created blocked without dependencies.")
     
     # Create and persist render job
     new_render_job = RenderJob(
@@ -72,20 +132,141 @@ def create_render_job(db: Session, data: RenderJobCreate) -> RenderJobOut:
         project_uid=project.uid,
         context=data.context,
         adapter=data.adapter,
-        status=data.status,
+        status=status,
     )
     
     db.add(new_render_job)
+    db.flush()
+
+    if depends_on:
+        # Edges are only ever added for a brand-new job, which nothing can depend on yet,
+        # so the graph stays acyclic without a cycle check
+        db.execute(
+            insert(RenderJobDependency),
+            [{"job_uid": uid, "depends_on_uid": dep_uid} for dep_uid in depends_on]
+        )
+
     db.commit()
     db.refresh(new_render_job)
     
     return create_response(new_render_job, "Render job created successfully")
 
 
+# Whether any live dependency of a job has not succeeded yet
+def _has_unfinished_dependencies(db: Session, job_uid: str) -> bool:
+    return bool(db.scalar(select(exists().where(
+        RenderJobDependency.job_uid == job_uid,
+        RenderJob.uid == RenderJobDependency.depends_on_uid,
+        RenderJob.status != RenderJobStatus.succeeded,
+        RenderJob.deleted_at.is_(None)
+    ))))
+
+
+# Fail every blocked job downstream of a failed job (set-based, walks the whole DAG)
+def _fail_dependents(db: Session, job_uid: str) -> list[str]:
+    edges = RenderJobDependency.__table__
+
+    downstream = (
+        select(edges.c.job_uid.label("uid"))
+        .where(edges.c.depends_on_uid == job_uid)
+        .cte("downstream", recursive=True)
+    )
+    downstream = downstream.union(
+        select(edges.c.job_uid).join(downstream, edges.c.depends_on_uid == downstream.c.uid)
+    )
+
+    stmt = (
+        update(RenderJob)
+        .where(
+            RenderJob.status == RenderJobStatus.blocked,
+            RenderJob.deleted_at.is_(None),
+            RenderJob.uid.in_(select(downstream.c.uid))
+        )
+        .values(status=RenderJobStatus.failed, logs=f"Upstream render job '{job_uid}' failed.")
+        .returning(RenderJob.uid)
+    )
+
+    return list(db.execute(stmt, execution_options={"synchronize_session": False}).scalars())
+
+
+# Release blocked dependents of a job whose dependencies have now all succeeded (set-based)
+def _release_dependents(db: Session, job_uid: str) -> list[str]:
+    # Lock the candidates first (in uid order, so concurrent releases cannot deadlock).
+    # When two dependencies of a job succeed at once, the second transaction waits here for
+    # the first to commit and its re-check below then sees both as succeeded; a single
+    # UPDATE ... NOT EXISTS would let each miss the other's success and leave the job blocked.
+    candidates = db.scalars(
+        select(RenderJob.uid)
+        .where(
+            RenderJob.status == RenderJobStatus.blocked,
+            RenderJob.deleted_at.is_(None),
+            RenderJob.uid.in_(
+                select(RenderJobDependency.job_uid).where(RenderJobDependency.depends_on_uid == job_uid)
+            )
+        )
+        .order_by(RenderJob.uid)
+        .with_for_update()
+    ).all()
+    if not candidates:
+        return []
+
+    edge = aliased(RenderJobDependency)
+    blocker = aliased(RenderJob)
+
+    # Any dependency of the candidate that has not succeeded yet keeps it blocked
+    unfinished = (
+        select(edge.job_uid)
+        .join(blocker, blocker.uid == edge.depends_on_uid)
+        .where(
+            edge.job_uid == RenderJob.uid,
+            blocker.status != RenderJobStatus.succeeded,
+            blocker.deleted_at.is_(None)
+        )
+        .correlate(RenderJob)
+    )
+
+    stmt = (
+        update(RenderJob)
+        .where(
+            RenderJob.uid.in_(candidates),
+            RenderJob.status == RenderJobStatus.blocked,
+            ~exists(unfinished)
+        )
+        .values(status=RenderJobStatus.queued)
+        .returning(RenderJob.uid)
+    )
+
+    return list(db.execute(stmt, execution_options={"synchronize_session": False}).scalars())
+
+
+# Claim the oldest queued render job for a worker (blocked jobs are never claimed)
+def claim_render_job(db: Session, adapter: Optional[str] = None) -> RenderJobOut:
+    stmt = select(RenderJob).where(
+        RenderJob.status == RenderJobStatus.queued,
+        RenderJob.deleted_at.is_(None)
+    )
+
+    if adapter:
+        stmt = stmt.where(RenderJob.adapter == adapter)
+
+    # Skip rows already locked by a concurrent claim
+    stmt = stmt.order_by(RenderJob.submitted_at.asc()).limit(1).with_for_update(skip_locked=True)
+    render_job = db.scalar(stmt)
+    if not render_job:
+        return create_response(None, "No queued render jobs available")
+
+    render_job.status = RenderJobStatus.running
+
+    db.commit()
+    db.refresh(render_job)
+    return create_response(render_job, "Render job claimed successfully")
+
+
 # Update a render job by UID
 def update_render_job(db: Session, uid: str, data: RenderJobUpdate) -> RenderJobOut:
     # Locate render job by UID
     render_job = db_lookup(db, RenderJob, uid)
+    previous_status = render_job.status
     
     # Update fields if provided
     if data.context is not None:
@@ -95,10 +276,23 @@ def update_render_job(db: Session, uid: str, data: RenderJobUpdate) -> RenderJob
         render_job.adapter = data.adapter
     
     if data.status is not None:
+        # Only dependencies may hold a job back; a blocked job with nothing pending would never run
+        if data.status == RenderJobStatus.blocked and not _has_unfinished_dependencies(db, render_job.uid):
+            raise HTTPException(status_code=400, detail="Render job has no unfinished dependencies to wait on.")
         render_job.status = data.status
     
     if data.logs is not None:
         render_job.logs = data.logs
+
+    # Release waiting dependents in the same transaction once this job succeeds
+    if render_job.status == RenderJobStatus.succeeded and previous_status != RenderJobStatus.succeeded:
+        db.flush()
+        _release_dependents(db, render_job.uid)
+
+    # A failure can never be satisfied, so fail everything waiting on it
+    if render_job.status == RenderJobStatus.failed and previous_status != RenderJobStatus.failed:
+        db.flush()
+        _fail_dependents(db, render_job.uid)
     
     db.commit()
     db.refresh(render_job)
@@ -111,6 +305,90 @@ def delete_render_job(db: Session, uid: str) -> dict:
     
     # Soft delete: set deleted_at timestamp
     render_job.deleted_at = now_utc()
+
+    # Deleted jobs no longer block anything; release dependents that were only waiting on it
+    db.flush()
+    _release_dependents(db, render_job.uid)
     
     db.commit()
     return create_response(None, f"Render job '{uid}' deleted successfully")
+
+
+# Long-poll a render job until its status differs from the caller's last known status
+async def watch_render_job(
+        db: Session,
+        listener: Optional[PgListener],
+        uid: str,
+        status: Optional[RenderJobStatus] = None,
+        timeout: float = 30.0,
+) -> RenderJobOut:
+    # Subscribe before reading so a change between the read and the wait is not missed
+    subscription = listener.subscribe("render_jobs", lambda p: p.get("uid") == uid, maxsize=10) if listener else None
+    try:
+        render_job = await run_in_threadpool(db_lookup, db, RenderJob, uid)
+        if status is None or render_job.status != status:
+            return create_response(render_job, "Render job retrieved successfully")
+
+        # Release the pooled connection while waiting
+        await run_in_threadpool(db.commit)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        changed = False
+        while not changed and (remaining := deadline - loop.time()) > 0:
+            if subscription:
+                payload = await subscription.get(remaining)
+                if payload is None:
+                    break
+                if payload.get("status") == status.value:
+                    continue
+            else:
+                # No listener available, fall back to a slow server-side poll
+                await asyncio.sleep(min(1.0, remaining))
+
+            await run_in_threadpool(db.refresh, render_job)
+            changed = render_job.status != status
+
+        await run_in_threadpool(db.refresh, render_job)
+        message = "Render job status changed" if render_job.status != status else "Render job status unchanged"
+        return create_response(render_job, message)
+    finally:
+        if subscription:
+            listener.unsubscribe(subscription)
+
+
+# Stream render job changes for a project as Server-Sent Events
+async def stream_project_render_jobs(
+        request: Request,
+        db: Session,
+        listener: Optional[PgListener],
+        project_uid: str,
+) -> StreamingResponse:
+    if listener is None:
+        raise HTTPException(status_code=503, detail="Render job notifications are unavailable.")
+
+    project = await run_in_threadpool(db_lookup, db, Project, project_uid)
+    project_uid = project.uid
+
+    # Nothing else is read from the DB, release the pooled connection for the stream lifetime
+    await run_in_threadpool(db.commit)
+
+    subscription = listener.subscribe("render_jobs", lambda p: p.get("project_uid") == project_uid)
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                payload = await subscription.get(settings.NOTIFY_KEEPALIVE_SECONDS)
+                if payload is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: render_job\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            listener.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,171 @@
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import select, values, column, and_, or_, any_, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.config import settings
+from enums.enums import PublishType, Representation, ResolvePolicy, VersionStatus
+from models.publish import Publish
+from models.task import Task
+from models.version import Version
+from schemas.publish import PublishOut
+from schemas.resolve import ResolveRef
+from schemas.response import create_response
+from services.metrics_service import track_cache
+from utils.cache import TTLCache
+
+# Version statuses each policy accepts
+POLICY_STATUSES = {
+    ResolvePolicy.latest: [VersionStatus.draft, VersionStatus.review, VersionStatus.approved],
+    ResolvePolicy.review: [VersionStatus.review, VersionStatus.approved],
+    ResolvePolicy.approved: [VersionStatus.approved],
+}
+
+# Resolved publishes (or misses) keyed by the full request, cleared on version/publish writes
+resolve_cache = TTLCache(maxsize=settings.RESOLVE_CACHE_SIZE, ttl=settings.RESOLVE_CACHE_TTL)
+track_cache("resolve", resolve_cache)
+
+_MISSING = object()
+
+
+# Drop every cached resolution (called after version/publish writes and on entity_changes notifications)
+def invalidate_resolve_cache():
+    resolve_cache.clear()
+
+
+# Winner ordering: newest version, then newest publish of that version
+NEWEST_FIRST = (
+    Version.created_at.desc(),
+    Version.vnum.desc(),
+    Publish.created_at.desc(),
+    Publish.id.desc(),
+)
+
+
+# Newest live publish per entity whose version passes the policy, newest version first
+def _resolve_query(policy: ResolvePolicy):
+    return (
+        select(Publish)
+        .join(Version, Version.uid == Publish.version_uid)
+        .join(Task, Task.uid == Version.task_uid)
+        .where(
+            Version.status.in_(POLICY_STATUSES[policy]),
+            Task.deleted_at.is_(None),
+            Version.deleted_at.is_(None),
+            Publish.deleted_at.is_(None),
+        )
+        .distinct(Task.parent_uid)
+        .order_by(Task.parent_uid, *NEWEST_FIRST)
+    )
+
+
+# Resolve the winning publish for an asset or shot
+def resolve_publish(
+        db: Session,
+        entity: str,
+        type: PublishType,
+        representation: Optional[Representation] = None,
+        policy: ResolvePolicy = ResolvePolicy.approved,
+        task: Optional[str] = None,
+) -> dict:
+    key = (entity, type, representation, policy, task)
+    cached = resolve_cache.get(key, _MISSING)
+
+    if cached is _MISSING:
+        # Read before querying, so a result that an invalidation overtakes is not cached
+        generation = resolve_cache.generation
+        stmt = _resolve_query(policy).where(Task.parent_uid == entity, Publish.type == type)
+        if representation:
+            stmt = stmt.where(Publish.representation == representation)
+        if task:
+            stmt = stmt.where(Task.name == task)
+
+        publish = db.scalar(stmt)
+        cached = PublishOut.model_validate(publish).model_dump() if publish else None
+        resolve_cache.set(key, cached, generation)
+
+    if cached is None:
+        detail = f"No {policy.value} '{type.value}' publish found for '{entity}'"
+        if representation:
+            detail += f" in '{representation.value}'"
+        raise HTTPException(status_code=404, detail=detail)
+
+    return create_response(cached, "Publish resolved successfully")
+
+
+# Resolve many references with one set-based query, results in input order with per-item misses
+def resolve_publishes_batch(db: Session, refs: List[ResolveRef]) -> dict:
+    keys = [(ref.entity, ref.type, ref.representation, ref.policy, ref.task) for ref in refs]
+
+    # Serve repeats and cached refs first, only unique misses go to the database
+    resolved = {}
+    pending = []
+    for key in dict.fromkeys(keys):
+        cached = resolve_cache.get(key, _MISSING)
+        if cached is _MISSING:
+            pending.append(key)
+        else:
+            resolved[key] = cached
+
+    if pending:
+        generation = resolve_cache.generation
+        ref_rows = values(
+            column("idx", Integer),
+            column("entity", String),
+            column("type", String),
+            column("representation", String),
+            column("task", String),
+            column("statuses", ARRAY(String)),
+            name="refs",
+        ).data([
+            (
+                idx,
+                entity,
+                type.value,
+                representation.value if representation else None,
+                task,
+                [status.value for status in POLICY_STATUSES[policy]],
+            )
+            for idx, (entity, type, representation, policy, task) in enumerate(pending)
+        ])
+
+        stmt = (
+            select(ref_rows.c.idx, Publish)
+            .select_from(ref_rows)
+            .join(Task, and_(
+                Task.parent_uid == ref_rows.c.entity,
+                Task.deleted_at.is_(None),
+                or_(ref_rows.c.task.is_(None), Task.name == ref_rows.c.task),
+            ))
+            .join(Version, and_(
+                Version.task_uid == Task.uid,
+                Version.deleted_at.is_(None),
+                Version.status == any_(ref_rows.c.statuses),
+            ))
+            .join(Publish, and_(
+                Publish.version_uid == Version.uid,
+                Publish.deleted_at.is_(None),
+                Publish.type == ref_rows.c.type,
+                or_(ref_rows.c.representation.is_(None), Publish.representation == ref_rows.c.representation),
+            ))
+            .distinct(ref_rows.c.idx)
+            .order_by(ref_rows.c.idx, *NEWEST_FIRST)
+        )
+
+        winners = {idx: publish for idx, publish in db.execute(stmt).all()}
+        for idx, key in enumerate(pending):
+            publish = winners.get(idx)
+            resolved[key] = PublishOut.model_validate(publish).model_dump() if publish else None
+            resolve_cache.set(key, resolved[key], generation)
+
+    data = [
+        {**ref.model_dump(), "found": resolved[key] is not None, "publish": resolved[key]}
+        for ref, key in zip(refs, keys)
+    ]
+    found = sum(1 for item in data if item["found"])
+    return create_response(data, f"Resolved {found} of {len(refs)} references")
+
+
+# Get resolver cache counters
+def get_resolve_cache_stats() -> dict:
+    return create_response(resolve_cache.stats(), "Resolve cache stats retrieved successfully")
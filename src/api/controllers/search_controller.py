@@ -0,0 +1,79 @@
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, literal, union_all, or_, case, Float
+from models.asset import Asset
+from models.project import Project
+from models.publish import Publish
+from models.shot import Shot
+from models.task import Task
+from schemas.response import create_response
+from utils.database import escape_like
+
+SEARCH_MODES = {"fuzzy", "prefix"}
+
+
+# Entity name -> (model, searchable label expression, project UID expression)
+SEARCH_SOURCES = {
+    "project": (Project, Project.name, Project.uid),
+    "asset": (Asset, Asset.name, Asset.project_uid),
+    "shot": (Shot, Shot.seq + "_" + Shot.shot, Shot.project_uid),
+    "task": (Task, Task.name, Task.project_uid),
+    "publish": (Publish, Publish.path, Publish.project_uid),
+}
+
+
+# Rank matches across projects, assets, shots, tasks and publish paths in one query
+def search(
+        db: Session,
+        q: str,
+        mode: str = "fuzzy",
+        project_uid: Optional[str] = None,
+        entities: Optional[list[str]] = None,
+        limit: int = 20,
+) -> dict:
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search query cannot be empty.")
+
+    if mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"Invalid search mode '{mode}'. Must be one of {sorted(SEARCH_MODES)}")
+
+    sources = SEARCH_SOURCES
+    if entities:
+        unknown = set(entities) - sources.keys()
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown search entities: {', '.join(sorted(unknown))}")
+        sources = {name: source for name, source in sources.items() if name in entities}
+
+    escaped = escape_like(q)
+    parts = []
+    for entity, (model, label, owner) in sources.items():
+        if mode == "prefix":
+            # Type-ahead: served by lower(...) text_pattern_ops B-tree indexes, shortest labels first
+            match = func.lower(label).like(f"{escaped.lower()}%", escape="\\")
+            score = literal(len(q), Float) / func.greatest(func.length(label), 1)
+        else:
+            # Substring or fuzzy word match: served by gin_trgm_ops indexes
+            match = or_(label.ilike(f"%{escaped}%", escape="\\"), literal(q).op("<%")(label))
+            score = func.word_similarity(q, label) + case((label.ilike(f"{escaped}%", escape="\\"), 0.5), else_=0.0)
+
+        stmt = select(
+            literal(entity).label("entity"),
+            model.uid.label("uid"),
+            label.label("label"),
+            owner.label("project_uid"),
+            score.label("score"),
+        ).where(match, model.deleted_at.is_(None))
+
+        if project_uid:
+            stmt = stmt.where(owner == project_uid)
+
+        parts.append(stmt.order_by(score.desc()).limit(limit))
+
+    hits = union_all(*parts).subquery()
+    rows = db.execute(
+        select(hits).order_by(hits.c.score.desc(), hits.c.label.asc()).limit(limit)
+    ).mappings().all()
+
+    return create_response([dict(row) for row in rows], "Search results retrieved successfully")
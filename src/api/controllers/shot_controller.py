@@ -3,10 +3,12 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 from models.shot import Shot
 from models.project import Project
-from typing import Optional
+from typing import List, Optional
 from schemas.shot import ShotCreate, ShotUpdate, ShotOut
+from schemas.batch import create_batch_response
 from schemas.response import create_response
-from utils.database import db_lookup
+from utils.database import db_lookup, db_lookup_many, uid_in
+from utils.include import include_options
 from utils.uid import generate_uid
 from utils.datetime_helpers import now_utc
 
@@ -106,6 +108,8 @@ def list_shots(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        include: Optional[str] = None,
+        uids: Optional[List[str]] = None,
 ) -> dict:
     # Build base query with filters
     base_stmt = select(Shot)
@@ -117,6 +121,9 @@ def list_shots(
     if uid:
         base_stmt = base_stmt.where(Shot.uid == uid)
 
+    if uids:
+        base_stmt = base_stmt.where(uid_in(Shot, uids))
+
     if project_uid:
         base_stmt = base_stmt.where(Shot.project_uid == project_uid)
 
@@ -128,6 +135,7 @@ def list_shots(
     
     # Get paginated items
     stmt = base_stmt.order_by(Shot.shot.asc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Shot, include))  # one extra query per include level
     data = db.execute(stmt).scalars().all()
     
     return {
@@ -138,3 +146,9 @@ def list_shots(
         "limit": limit,
         "offset": offset
     }
+
+
+# Get shots by UID in one query, in request order, reporting UIDs that were not found
+def batch_get_shots(db: Session, uids: List[str], include: Optional[str] = None) -> dict:
+    items, missing = db_lookup_many(db, Shot, uids, include_options(Shot, include))
+    return create_batch_response(items, missing, "Shots retrieved successfully")
@@ -2,7 +2,7 @@
 from datetime import datetime, timezone
 from sqlalchemy import text
 from app.config import settings
-from db.db import engine
+from db.db import get_engine
 
 
 def status_payload(app: FastAPI) -> dict:
@@ -23,7 +23,7 @@ def status_payload(app: FastAPI) -> dict:
 
 def db_conn() -> dict:
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             conn.execute(text("select 1"))
         return {"ok": True, "db": "ready"}
     except Exception as e:
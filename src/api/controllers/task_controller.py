@@ -2,13 +2,17 @@
 from psycopg2 import IntegrityError
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from api.controllers.resolve_controller import invalidate_resolve_cache
 from models.version import Version
-from models.task import Task
+from models.task import Task, TaskVersionState
 from models.project import Project
-from typing import Optional
+from typing import List, Optional
 from schemas.task import TaskOut, TaskCreate, TaskUpdate
+from schemas.batch import create_batch_response
 from schemas.response import create_response
-from utils.database import db_lookup
+from utils.database import db_lookup, db_lookup_many, uid_in
+from utils.include import include_options
 from utils.uid import generate_uid
 from utils.datetime_helpers import now_utc
 
@@ -62,6 +66,23 @@ def create_task(db: Session, data: TaskCreate, *, created_by: str | None = None)
     return create_response(new_task, "Task created successfully")
 
 
+# Reserve the next version number for a task, or an explicit one (moving the counter past it).
+# The upsert row-locks the task's counter until commit, so concurrent creates never collide.
+def allocate_vnum(db: Session, task_uid: str, vnum: Optional[int] = None) -> int:
+    stmt = insert(TaskVersionState).values(task_uid=task_uid, last_vnum=vnum or 1)
+    if vnum is None:
+        next_vnum = TaskVersionState.last_vnum + 1
+    else:
+        next_vnum = func.greatest(TaskVersionState.last_vnum, stmt.excluded.last_vnum)
+    allocated = db.scalar(
+        stmt.on_conflict_do_update(
+            index_elements=[TaskVersionState.task_uid],
+            set_={"last_vnum": next_vnum, "updated_at": func.now()},
+        ).returning(TaskVersionState.last_vnum)
+    )
+    return allocated if vnum is None else vnum
+
+
 # Create version for task with default status and version number
 def create_task_version(
         db: Session,
@@ -75,7 +96,7 @@ def create_task_version(
         uid=generate_uid("VER"),
         project_uid=task.project_uid,
         task_uid=task.uid,
-        vnum=vnum,
+        vnum=allocate_vnum(db, task.uid, vnum),
         status=status,
         created_by=created_by,
     )
@@ -112,6 +133,7 @@ def update_task(db: Session, uid: str, data: TaskUpdate) -> TaskOut:
         task.status = data.status
 
     db.commit()
+    invalidate_resolve_cache()
     db.refresh(task)
     return create_response(task, "Task updated successfully")
 
@@ -124,6 +146,7 @@ def delete_task(db: Session, uid: str) -> dict:
     task.deleted_at = now_utc()
     
     db.commit()
+    invalidate_resolve_cache()
     return create_response(None, f"Task '{uid}' deleted successfully")
 
 
@@ -140,6 +163,8 @@ def list_tasks(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        include: Optional[str] = None,
+        uids: Optional[List[str]] = None,
 ) -> dict:
     # Build base query with filters
     base_stmt = select(Task)
@@ -151,6 +176,9 @@ def list_tasks(
     if uid:
         base_stmt = base_stmt.where(Task.uid == uid)
 
+    if uids:
+        base_stmt = base_stmt.where(uid_in(Task, uids))
+
     if project_uid:
         base_stmt = base_stmt.where(Task.project_uid == project_uid)
 
@@ -174,6 +202,7 @@ def list_tasks(
     
     # Get paginated items
     stmt = base_stmt.order_by(Task.created_at.desc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Task, include))  # one extra query per include level
     data = db.execute(stmt).scalars().all()
     
     return {
@@ -186,11 +215,18 @@ def list_tasks(
     }
 
 
+# Get tasks by UID in one query, in request order, reporting UIDs that were not found
+def batch_get_tasks(db: Session, uids: List[str], include: Optional[str] = None) -> dict:
+    items, missing = db_lookup_many(db, Task, uids, include_options(Task, include))
+    return create_batch_response(items, missing, "Tasks retrieved successfully")
+
+
 def list_task_versions(
         db: Session,
         task_uid: str,
         limit: int = 50,
         offset: int = 0,
+        include: Optional[str] = None,
 ):
     db_lookup(db, Task, task_uid)
 
@@ -201,6 +237,7 @@ def list_task_versions(
     
     # Get paginated items
     stmt = base_stmt.order_by(Version.vnum.desc(), Version.created_at.desc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Version, include))  # one extra query per include level
     data = db.execute(stmt).scalars().all()
     
     return {
@@ -1,18 +1,25 @@
 ﻿from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
-from typing import Optional
-from api.controllers.task_controller import VERSION_DEFAULT_STATUS
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+from api.controllers.task_controller import VERSION_DEFAULT_STATUS, allocate_vnum
+from api.controllers.resolve_controller import invalidate_resolve_cache
 from models.publish import Publish
 from models.version import Version
 from models.task import Task
 from models.project import Project
 from schemas.version import VersionOut, VersionCreate, VersionUpdate
+from schemas.batch import create_batch_response
 from schemas.response import create_response
-from utils.database import db_lookup
+from utils.database import db_lookup, db_lookup_many, uid_in
+from utils.include import include_options
 from utils.uid import generate_uid
 from utils.datetime_helpers import now_utc
 
+# UNIQUE (task_uid, vnum), named in sql/019_version_constraint_name.sql
+VERSION_NUMBER_CONSTRAINT = "uq_version_per_task"
+
 
 def create_version(
         db: Session,
@@ -25,14 +32,8 @@ def create_version(
     project = db_lookup(db, Project, data.project_uid)
     task = db_lookup(db, Task, data.task_uid)
 
-    # Calculate next version number if not provided
-    if data.vnum is None:
-        max_vnum = db.scalar(
-            select(func.max(Version.vnum)).where(Version.task_uid == task.uid)
-        )
-        vnum = (max_vnum or 0) + 1
-    else:
-        vnum = data.vnum
+    # Allocate the version number from the task's counter
+    vnum = allocate_vnum(db, task.uid, data.vnum)
 
     version = Version(
         uid=generate_uid("VER"),
@@ -44,7 +45,14 @@ def create_version(
     )
 
     db.add(version)
-    db.flush()
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        # Only a clash on (task_uid, vnum) is a conflict; anything else is a real error
+        if getattr(getattr(e.orig, "diag", None), "constraint_name", None) != VERSION_NUMBER_CONSTRAINT:
+            raise
+        raise HTTPException(status_code=409, detail=f"Version v{vnum} already exists for this task") from e
 
     if publish:
         publish = Publish(
@@ -60,6 +68,7 @@ def create_version(
         db.flush()
 
     db.commit()
+    invalidate_resolve_cache()
     db.refresh(version)
     return create_response(version, "Version created successfully")
 
@@ -91,6 +100,7 @@ def update_version(db: Session, uid: str, data: VersionUpdate) -> VersionOut:
         version.created_by = data.created_by
 
     db.commit()
+    invalidate_resolve_cache()
     db.refresh(version)
     return create_response(version, "Version updated successfully")
 
@@ -102,6 +112,7 @@ def delete_version(db: Session, uid: str) -> dict:
     version.deleted_at = now_utc()
     
     db.commit()
+    invalidate_resolve_cache()
     return create_response(None, f"Version '{uid}' deleted successfully")
 
 
@@ -117,6 +128,8 @@ def list_versions(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = False,
+        include: Optional[str] = None,
+        uids: Optional[List[str]] = None,
 ) -> dict:
     # Build base query with filters
     base_stmt = select(Version)
@@ -127,6 +140,9 @@ def list_versions(
 
     if uid:
         base_stmt = base_stmt.where(Version.uid == uid)
+
+    if uids:
+        base_stmt = base_stmt.where(uid_in(Version, uids))
     if project_uid:
         base_stmt = base_stmt.where(Version.project_uid == project_uid)
     if task_uid:
@@ -143,6 +159,7 @@ def list_versions(
     
     # Get paginated items
     stmt = base_stmt.order_by(Version.created_at.desc()).limit(limit).offset(offset)
+    stmt = stmt.options(*include_options(Version, include))  # one extra query per include level
     data = db.scalars(stmt).all()
     
     return {
@@ -153,3 +170,9 @@ def list_versions(
         "limit": limit,
         "offset": offset
     }
+
+
+# Get versions by UID in one query, in request order, reporting UIDs that were not found
+def batch_get_versions(db: Session, uids: List[str], include: Optional[str] = None) -> dict:
+    items, missing = db_lookup_many(db, Version, uids, include_options(Version, include))
+    return create_batch_response(items, missing, "Versions retrieved successfully")
@@ -1,8 +1,8 @@
-﻿from fastapi import Depends, HTTPException, Request, status
+﻿from fastapi import Depends, HTTPException, Request, WebSocket, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from db.db import get_db
+from db.db import get_db, SessionLocal
 from models.api_keys import ApiKey
 
 security = HTTPBearer()
@@ -29,8 +29,9 @@ def require_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Set token in session for Postgres RLS
+    # Set token in session for Postgres RLS (re-applied on later transactions)
     db.execute(text("SET app.current_token = :token"), {"token": token})
+    db.info["api_token"] = token
 
     return {
         "user_authenticated": True,
@@ -41,6 +42,16 @@ def require_token(
     }
 
 
+def require_admin(auth: dict = Depends(require_token)) -> dict:
+    """
+    Dependency for admin-only endpoints.
+    Raises 403 if the token is valid but not an admin key.
+    """
+    if not auth.get("is_admin"):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+    return auth
+
+
 def is_authenticated(request: Request) -> dict:
     """
     Returns dict with user_authenticated flag, role, and username if token is valid.
@@ -61,3 +72,20 @@ def is_authenticated(request: Request) -> dict:
                 }
 
     return {"user_authenticated": False}
+
+
+def authenticate_websocket(websocket: WebSocket) -> ApiKey | None:
+    """
+    Resolve the API key for a WebSocket handshake.
+    Browsers cannot set headers on WebSocket requests, so `?token=` is accepted too.
+    """
+    token = websocket.query_params.get("token")
+    auth_header = websocket.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        token = auth_header.split(" ", 1)[1]
+
+    if not token:
+        return None
+
+    with SessionLocal() as db:
+        return db.query(ApiKey).filter(ApiKey.token == token).first()
@@ -7,8 +7,16 @@ from .versions import router as versions
 from .publishes import router as publishes
 from .renders import router as renders
 from .events import router as events
+from .search import router as search
+from .resolve import router as resolve
+from .batch import router as batch
 from ..dependencies.auth import require_token
 
+# WebSockets authenticate during the handshake, outside the bearer-token router
+from .ws import router as ws_router
+
+__all__ = ["router", "ws_router"]
+
 router = APIRouter(dependencies=[Depends(require_token)])
 
 router.include_router(projects, tags=["projects"])
@@ -19,3 +27,6 @@ router.include_router(versions, tags=["versions"])
 router.include_router(publishes, tags=["publishes"])
 router.include_router(renders, tags=["renders"])
 router.include_router(events, tags=["events"])
+router.include_router(search, tags=["search"])
+router.include_router(resolve, tags=["resolve"])
+router.include_router(batch, tags=["batch"])
@@ -2,7 +2,9 @@
 from fastapi import APIRouter, Query, Depends
 from sqlalchemy.orm import Session
 from db.db import get_db
+from utils.database import parse_uids
 from schemas.pagination import PaginatedResponse
+from schemas.batch import BatchGetRequest, BatchGetResponse
 from schemas.response import ApiResponse
 import api.controllers.asset_controller as controller
 import schemas.asset
@@ -39,7 +41,17 @@ def delete_asset(
     return controller.delete_asset(db, identifier)
 
 
-@router.get("/assets", response_model=PaginatedResponse[schemas.asset.AssetOut])
+@router.post("/assets:batchGet", response_model=BatchGetResponse[schemas.asset.AssetOut], response_model_exclude_unset=True)
+def batch_get_assets(
+        data: BatchGetRequest,
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed"),
+        db: Session = Depends(get_db),
+):
+    """Fetch Assets by UID in one query, in request order, with missing UIDs reported."""
+    return controller.batch_get_assets(db, data.uids, include)
+
+
+@router.get("/assets", response_model=PaginatedResponse[schemas.asset.AssetOut], response_model_exclude_unset=True)
 def get_assets(
         uid: Optional[str] = None,
         project_uid: Optional[str] = None,
@@ -48,18 +60,29 @@ def get_assets(
         limit: int = 100,
         offset: int = 0,
         include_deleted: bool = Query(False, description="Include soft-deleted records"),
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed, e.g. tasks,tasks.versions"),
+        uids: Optional[str] = Query(None, description="Comma-separated UIDs to fetch"),
         db: Session = Depends(get_db)
 ):
     """List or search Assets with optional filters (excludes soft-deleted by default)."""
-    return controller.list_assets(db, uid, project_uid, name, type, limit, offset, include_deleted)
+    return controller.list_assets(
+        db, uid, project_uid, name, type, limit, offset, include_deleted, include, uids=parse_uids(uids)
+    )
 
 
-@router.get("/assets/{asset_uid}/tasks", response_model=PaginatedResponse[schemas.task.TaskOut])
+@router.get(
+    "/assets/{asset_uid}/tasks",
+    response_model=PaginatedResponse[schemas.task.TaskOut],
+    response_model_exclude_unset=True,
+)
 def get_asset_tasks(
         asset_uid: str,
         db: Session = Depends(get_db),
         limit: int = Query(50, ge=1, le=500),
-        offset: int = Query(0, ge=0)
+        offset: int = Query(0, ge=0),
+        include: Optional[str] = Query(
+            None, description="Comma-separated relationships to embed, e.g. versions,versions.publishes"
+        ),
 ):
     """List all Tasks for an Asset. Returns paginated results with metadata."""
-    return controller.list_asset_tasks(db, asset_uid, limit, offset)
+    return controller.list_asset_tasks(db, asset_uid, limit, offset, include)
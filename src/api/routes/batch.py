@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List
+from db.db import get_db
+from schemas.response import ApiResponse
+import api.controllers.batch_controller as controller
+import schemas.batch
+
+router = APIRouter()
+
+
+@router.post("/batch", response_model=ApiResponse[List[schemas.batch.BatchOperationResult]])
+def post_batch(
+        data: schemas.batch.BatchRequest,
+        db: Session = Depends(get_db),
+):
+    """Run ordered create/update/delete operations in one transaction, with $ref.field back-references."""
+    return controller.run_batch(db, data.operations)
@@ -1,15 +1,28 @@
-﻿from fastapi import APIRouter, Query, Depends
+﻿from datetime import datetime
+from fastapi import APIRouter, Query, Depends, Response
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, List
 from db.db import get_db
+from utils.database import parse_uids
 from schemas.pagination import PaginatedResponse
+from schemas.batch import BatchGetRequest, BatchGetResponse
 from schemas.response import ApiResponse
+from utils.jsonb import parse_contains, parse_path_filters, merge_contains
 import api.controllers.event_controller as controller
 import schemas.event
 
 router = APIRouter()
 
 
+@router.post("/events:batchGet", response_model=BatchGetResponse[schemas.event.EventOut])
+def batch_get_events(
+        data: BatchGetRequest,
+        db: Session = Depends(get_db),
+):
+    """Fetch Events by UID in one query, in request order, with missing UIDs reported."""
+    return controller.batch_get_events(db, data.uids)
+
+
 @router.get("/events", response_model=PaginatedResponse[schemas.event.EventOut])
 def get_events(
         uid: Optional[str] = None,
@@ -18,10 +31,24 @@ def get_events(
         limit: int = Query(100, ge=1, le=500),
         offset: int = Query(0, ge=0),
         include_deleted: bool = Query(False, description="Include soft-deleted records"),
+        created_after: Optional[datetime] = Query(None, description="Only events created at or after this time"),
+        created_before: Optional[datetime] = Query(None, description="Only events created before this time"),
+        payload_contains: Optional[str] = Query(
+            None, description='JSON object the payload must contain, e.g. {"shot": "SH010"}'
+        ),
+        payload_path: Optional[List[str]] = Query(None, description="Repeatable key.sub=value payload filter"),
+        uids: Optional[str] = Query(None, description="Comma-separated UIDs to fetch"),
         db: Session = Depends(get_db),
 ):
     """List or search Events with optional filters (excludes soft-deleted by default)."""
-    return controller.list_events(db, uid, project_uid, kind, limit, offset, include_deleted)
+    contains = merge_contains(
+        parse_contains(payload_contains, "payload_contains"),
+        parse_path_filters(payload_path, "payload_path"),
+    )
+    return controller.list_events(
+        db, uid, project_uid, kind, limit, offset, include_deleted,
+        created_after=created_after, created_before=created_before, payload_contains=contains, uids=parse_uids(uids)
+    )
 
 
 @router.post("/events", response_model=ApiResponse[schemas.event.EventOut], status_code=201)
@@ -33,6 +60,25 @@ def post_event(
     return controller.create_event(db, data)
 
 
+@router.post("/events:batch", response_model=ApiResponse[schemas.event.EventBatchOut], status_code=201)
+def post_events_batch(
+        data: schemas.event.EventBatchCreate,
+        response: Response,
+        fire_and_forget: bool = Query(False, alias="async", description="Queue events for the background writer"),
+        db: Session = Depends(get_db),
+):
+    """Create many Events in one request. With `async=true` events are queued and written in batches (202)."""
+    if fire_and_forget:
+        response.status_code = 202
+    return controller.create_events_batch(db, data, asynchronous=fire_and_forget, token=db.info.get("api_token"))
+
+
+@router.get("/events/queue", response_model=ApiResponse[schemas.event.EventQueueStats])
+def get_event_queue_stats():
+    """Event ingest queue depth and drop counters."""
+    return controller.get_event_queue_stats()
+
+
 @router.patch("/events/{uid}", response_model=ApiResponse[schemas.event.EventOut])
 def patch_event(
         uid: str,
@@ -1,11 +1,16 @@
 ﻿from fastapi import APIRouter, Query, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, List
 from db.db import get_db
+from utils.database import parse_uids
 from enums.enums import PublishType, Representation, ParentType
 from schemas.pagination import PaginatedResponse
+from schemas.batch import BatchGetRequest, BatchGetResponse
 from schemas.response import ApiResponse
+from utils.jsonb import parse_contains, parse_path_filters, merge_contains
 import api.controllers.project_controller as controller
+import api.controllers.changes_controller as changes_controller
+import schemas.changes
 import schemas.asset
 import schemas.project
 import schemas.publish
@@ -43,6 +48,15 @@ def delete_project(
     return controller.delete_project(db, identifier)
 
 
+@router.post("/projects:batchGet", response_model=BatchGetResponse[schemas.project.ProjectOut])
+def batch_get_projects(
+        data: BatchGetRequest,
+        db: Session = Depends(get_db),
+):
+    """Fetch Projects by UID in one query, in request order, with missing UIDs reported."""
+    return controller.batch_get_projects(db, data.uids)
+
+
 @router.get("/projects", response_model=PaginatedResponse[schemas.project.ProjectOut])
 def get_projects(
         uid: Optional[str] = None,
@@ -50,10 +64,14 @@ def get_projects(
         limit: int = Query(100, ge=1, le=500),
         offset: int = Query(0, ge=0),
         include_deleted: bool = Query(False, description="Include soft-deleted records"),
+        uids: Optional[str] = Query(None, description="Comma-separated UIDs to fetch"),
         db: Session = Depends(get_db),
 ):
-    """List or search Projects with optional filters (excludes soft-deleted by default). Returns paginated results with metadata."""
-    return controller.list_projects(db, uid, name, limit, offset, include_deleted)
+    """
+    List or search Projects with optional filters (excludes soft-deleted by default).
+    Returns paginated results with metadata.
+    """
+    return controller.list_projects(db, uid, name, limit, offset, include_deleted, uids=parse_uids(uids))
 
 
 @router.get("/projects/{project_uid}/overview", response_model=ApiResponse[schemas.project.ProjectOverviewOut])
@@ -65,18 +83,49 @@ def project_overview(
     return controller.list_project_overview(db, project_uid=project_uid)
 
 
-@router.get("/projects/{project_uid}/assets", response_model=PaginatedResponse[schemas.asset.AssetOut])
+@router.get("/projects/{project_uid}/dashboard")
+def stream_project_dashboard(
+        project_uid: str,
+        after_seq: Optional[str] = Query(None, description="Value of X-Next-After-Seq from the previous page"),
+        seq_limit: int = Query(10, ge=1, le=100, description="Sequences per page"),
+        db: Session = Depends(get_db),
+):
+    """Stream every Shot of a Project with its Tasks and their latest Version as NDJSON, paginated by sequence."""
+    return controller.stream_project_dashboard(db, project_uid, db.info.get("api_token"), after_seq, seq_limit)
+
+
+@router.get("/projects/{project_uid}/changes", response_model=schemas.changes.ChangesResponse)
+def get_project_changes(
+        project_uid: str,
+        since: Optional[str] = Query(None, description="Watermark token from a previous response; omit for a full sync"),
+        limit: int = Query(500, ge=1, le=5000),
+        db: Session = Depends(get_db),
+):
+    """List all entities inserted, updated or soft-deleted in a Project since a watermark."""
+    return changes_controller.list_project_changes(db, project_uid, since, limit)
+
+
+@router.get(
+    "/projects/{project_uid}/assets",
+    response_model=PaginatedResponse[schemas.asset.AssetOut],
+    response_model_exclude_unset=True,
+)
 def get_project_assets(
         project_uid: str,
         db: Session = Depends(get_db),
         limit: int = Query(50, ge=1, le=500),
-        offset: int = Query(0, ge=0)
+        offset: int = Query(0, ge=0),
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed, e.g. tasks,tasks.versions"),
 ):
     """List all Assets for a Project. Returns paginated results with metadata."""
-    return controller.list_project_assets(db, project_uid, limit, offset)
+    return controller.list_project_assets(db, project_uid, limit, offset, include)
 
 
-@router.get("/projects/{project_uid}/shots", response_model=PaginatedResponse[schemas.shot.ShotOut])
+@router.get(
+    "/projects/{project_uid}/shots",
+    response_model=PaginatedResponse[schemas.shot.ShotOut],
+    response_model_exclude_unset=True,
+)
 def get_project_shots(
         project_uid: str,
         seq: Optional[str] = None,
@@ -84,27 +133,35 @@ def get_project_shots(
         range: Optional[str] = Query(None, description="Format: start-end (e.g. 100-200)"),
         limit: int = Query(50, ge=1, le=500),
         offset: int = Query(0, ge=0),
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed, e.g. tasks,tasks.versions"),
         db: Session = Depends(get_db),
 ):
     """List Shots for a Project with optional filters. Returns paginated results with metadata."""
 
     try:
-        return controller.list_project_shots(db, project_uid, seq, shot, range, limit, offset)
+        return controller.list_project_shots(db, project_uid, seq, shot, range, limit, offset, include)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/projects/{project_uid}/tasks", response_model=PaginatedResponse[schemas.task.TaskOut])
+@router.get(
+    "/projects/{project_uid}/tasks",
+    response_model=PaginatedResponse[schemas.task.TaskOut],
+    response_model_exclude_unset=True,
+)
 def get_project_tasks(
         project_uid: str,
         parent_type: Optional[ParentType] = Query(None),
         status: Optional[str] = None,
         limit: int = Query(50, ge=1, le=500),
         offset: int = Query(0, ge=0),
+        include: Optional[str] = Query(
+            None, description="Comma-separated relationships to embed, e.g. versions,versions.publishes"
+        ),
         db: Session = Depends(get_db),
 ):
     """List Project Tasks with optional filters. Returns paginated results with metadata."""
-    return controller.list_project_tasks(db, project_uid, parent_type, status, limit, offset)
+    return controller.list_project_tasks(db, project_uid, parent_type, status, limit, offset, include)
 
 
 @router.get("/projects/{project_uid}/publishes", response_model=PaginatedResponse[schemas.publish.PublishOut])
@@ -114,7 +171,15 @@ def get_project_publishes(
         rep: Optional[Representation] = Query(None),
         limit: int = Query(50, ge=1, le=500),
         offset: int = Query(0, ge=0),
+        meta_contains: Optional[str] = Query(
+            None, description='JSON object the metadata must contain, e.g. {"colorspace": "ACEScg"}'
+        ),
+        meta_path: Optional[List[str]] = Query(None, description="Repeatable key.sub=value metadata filter"),
         db: Session = Depends(get_db)
 ):
     """List Project Publishes with optional filters. Returns paginated results with metadata."""
-    return controller.list_project_publishes(db, project_uid, type, rep, limit, offset)
+    contains = merge_contains(
+        parse_contains(meta_contains, "meta_contains"),
+        parse_path_filters(meta_path, "meta_path"),
+    )
+    return controller.list_project_publishes(db, project_uid, type, rep, limit, offset, meta_contains=contains)
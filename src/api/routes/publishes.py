@@ -2,7 +2,9 @@
 from sqlalchemy.orm import Session
 from typing import Optional
 from db.db import get_db
+from utils.database import parse_uids
 from schemas.pagination import PaginatedResponse
+from schemas.batch import BatchGetRequest, BatchGetResponse
 from schemas.response import ApiResponse
 import api.controllers.publish_controller as controller
 import schemas.publish
@@ -10,6 +12,15 @@ import schemas.publish
 router = APIRouter()
 
 
+@router.post("/publishes:batchGet", response_model=BatchGetResponse[schemas.publish.PublishOut])
+def batch_get_publishes(
+        data: BatchGetRequest,
+        db: Session = Depends(get_db),
+):
+    """Fetch Publishes by UID in one query, in request order, with missing UIDs reported."""
+    return controller.batch_get_publishes(db, data.uids)
+
+
 @router.get("/publishes", response_model=PaginatedResponse[schemas.publish.PublishOut])
 def get_publishes(
         uid: Optional[str] = None,
@@ -21,10 +32,14 @@ def get_publishes(
         limit: int = Query(100, ge=1, le=500),
         offset: int = Query(0, ge=0),
         include_deleted: bool = Query(False, description="Include soft-deleted records"),
+        uids: Optional[str] = Query(None, description="Comma-separated UIDs to fetch"),
         db: Session = Depends(get_db),
 ):
     """List or search Publishes with optional filters (excludes soft-deleted by default)."""
-    return controller.list_publishes(db, uid, project_uid, version_uid, type, representation, path, limit, offset, include_deleted)
+    return controller.list_publishes(
+        db, uid, project_uid, version_uid, type, representation, path, limit, offset, include_deleted,
+        uids=parse_uids(uids)
+    )
 
 
 @router.post("/publishes", response_model=ApiResponse[schemas.publish.PublishOut], status_code=201)
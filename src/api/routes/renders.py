@@ -1,8 +1,14 @@
-﻿from fastapi import APIRouter, Query, Depends
+﻿from fastapi import APIRouter, Query, Depends, Request
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, List
+from app.config import settings
 from db.db import get_db
+from utils.database import parse_uids
+from enums.enums import RenderJobStatus
+from services.notify_service import get_listener
+from utils.jsonb import parse_contains, parse_path_filters, merge_contains
 from schemas.pagination import PaginatedResponse
+from schemas.batch import BatchGetRequest, BatchGetResponse
 from schemas.response import ApiResponse
 import api.controllers.render_controller as controller
 import schemas.render
@@ -10,6 +16,15 @@ import schemas.render
 router = APIRouter()
 
 
+@router.post("/renders:batchGet", response_model=BatchGetResponse[schemas.render.RenderJobOut])
+def batch_get_renders(
+        data: BatchGetRequest,
+        db: Session = Depends(get_db),
+):
+    """Fetch Render Jobs by UID in one query, in request order, with missing UIDs reported."""
+    return controller.batch_get_render_jobs(db, data.uids)
+
+
 @router.get("/renders", response_model=PaginatedResponse[schemas.render.RenderJobOut])
 def get_render_jobs(
         uid: Optional[str] = None,
@@ -19,10 +34,21 @@ def get_render_jobs(
         limit: int = Query(100, ge=1, le=500),
         offset: int = Query(0, ge=0),
         include_deleted: bool = Query(False, description="Include soft-deleted records"),
+        context_contains: Optional[str] = Query(
+            None, description='JSON object the context must contain, e.g. {"shot": "SH010"}'
+        ),
+        context_path: Optional[List[str]] = Query(None, description="Repeatable key.sub=value context filter"),
+        uids: Optional[str] = Query(None, description="Comma-separated UIDs to fetch"),
         db: Session = Depends(get_db),
 ):
     """List or search Render Jobs with optional filters (excludes soft-deleted by default)."""
-    return controller.list_render_jobs(db, uid, project_uid, adapter, status, limit, offset, include_deleted)
+    contains = merge_contains(
+        parse_contains(context_contains, "context_contains"),
+        parse_path_filters(context_path, "context_path"),
+    )
+    return controller.list_render_jobs(
+        db, uid, project_uid, adapter, status, limit, offset, include_deleted, context_contains=contains, uids=parse_uids(uids)
+    )
 
 
 @router.post("/renders", response_model=ApiResponse[schemas.render.RenderJobOut], status_code=201)
@@ -30,10 +56,41 @@ def post_render_job(
         data: schemas.render.RenderJobCreate,
         db: Session = Depends(get_db)
 ):
-    """Create a new Render Job."""
+    """Create a new Render Job. Jobs with unfinished dependencies start blocked."""
     return controller.create_render_job(db, data)
 
 
+@router.post("/renders/claim", response_model=ApiResponse[Optional[schemas.render.RenderJobOut]])
+def claim_render_job(
+        adapter: Optional[str] = Query(None, description="Only claim jobs for this adapter"),
+        db: Session = Depends(get_db),
+):
+    """Claim the oldest queued Render Job and mark it running. Blocked jobs are skipped."""
+    return controller.claim_render_job(db, adapter)
+
+
+@router.get("/renders/{uid}/watch", response_model=ApiResponse[schemas.render.RenderJobOut])
+async def watch_render_job(
+        uid: str,
+        request: Request,
+        status: Optional[RenderJobStatus] = Query(None, description="Last known status, wait until it changes"),
+        timeout: int = Query(30, ge=1, le=settings.RENDER_WATCH_MAX_TIMEOUT),
+        db: Session = Depends(get_db),
+):
+    """Long-poll a Render Job. Returns as soon as its status differs from `status`, or after `timeout` seconds."""
+    return await controller.watch_render_job(db, get_listener(request.app), uid, status, timeout)
+
+
+@router.get("/projects/{project_uid}/renders/stream")
+async def stream_project_render_jobs(
+        project_uid: str,
+        request: Request,
+        db: Session = Depends(get_db),
+):
+    """Stream Render Job changes for a Project as Server-Sent Events."""
+    return await controller.stream_project_render_jobs(request, db, get_listener(request.app), project_uid)
+
+
 @router.patch("/renders/{uid}", response_model=ApiResponse[schemas.render.RenderJobOut])
 def patch_render_job(
         uid: str,
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Query, Depends
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from db.db import get_db
+from enums.enums import PublishType, Representation, ResolvePolicy
+from schemas.response import ApiResponse
+import api.controllers.resolve_controller as controller
+import schemas.publish
+import schemas.resolve
+
+router = APIRouter()
+
+
+@router.get("/resolve", response_model=ApiResponse[schemas.publish.PublishOut])
+def resolve_publish(
+        entity: str = Query(..., description="Asset or Shot UID"),
+        type: PublishType = Query(...),
+        representation: Optional[Representation] = None,
+        policy: ResolvePolicy = Query(ResolvePolicy.approved, description="latest, review (or better) or approved"),
+        task: Optional[str] = Query(None, description="Restrict to a task name"),
+        db: Session = Depends(get_db),
+):
+    """Resolve the newest Publish of a type/representation for an Asset or Shot under a version-status policy."""
+    return controller.resolve_publish(db, entity, type, representation, policy, task)
+
+
+@router.post("/resolve:batch", response_model=ApiResponse[List[schemas.resolve.ResolveResult]])
+def resolve_publishes_batch(data: schemas.resolve.ResolveBatchRequest, db: Session = Depends(get_db)):
+    """Resolve many Asset/Shot references in one query, returned in input order with per-item misses."""
+    return controller.resolve_publishes_batch(db, data.refs)
+
+
+@router.get("/resolve/cache", response_model=ApiResponse[dict])
+def get_resolve_cache_stats():
+    """Resolver cache size and hit ratio for this worker."""
+    return controller.get_resolve_cache_stats()
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Query, Depends
+from sqlalchemy.orm import Session
+from typing import Optional, List
+from db.db import get_db
+from schemas.response import ApiResponse
+import api.controllers.search_controller as controller
+import schemas.search
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=ApiResponse[List[schemas.search.SearchHit]])
+def search(
+        q: str = Query(..., min_length=1, max_length=200),
+        mode: str = Query("fuzzy", description="fuzzy (substring + similarity) or prefix (fast type-ahead)"),
+        project_uid: Optional[str] = None,
+        entity: Optional[List[str]] = Query(None, description="Restrict to project, asset, shot, task or publish"),
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db),
+):
+    """Search Projects, Assets, Shots, Tasks and Publish paths, ranked by match quality."""
+    return controller.search(db, q, mode, project_uid, entity, limit)
@@ -2,7 +2,9 @@
 from sqlalchemy.orm import Session
 from typing import Optional
 from db.db import get_db
+from utils.database import parse_uids
 from schemas.pagination import PaginatedResponse
+from schemas.batch import BatchGetRequest, BatchGetResponse
 from schemas.response import ApiResponse
 import api.controllers.shot_controller as controller
 import schemas.shot
@@ -38,7 +40,17 @@ def delete_shot(
     return controller.delete_shot(db, shot_uid)
 
 
-@router.get("/shots", response_model=PaginatedResponse[schemas.shot.ShotOut])
+@router.post("/shots:batchGet", response_model=BatchGetResponse[schemas.shot.ShotOut], response_model_exclude_unset=True)
+def batch_get_shots(
+        data: BatchGetRequest,
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed"),
+        db: Session = Depends(get_db),
+):
+    """Fetch Shots by UID in one query, in request order, with missing UIDs reported."""
+    return controller.batch_get_shots(db, data.uids, include)
+
+
+@router.get("/shots", response_model=PaginatedResponse[schemas.shot.ShotOut], response_model_exclude_unset=True)
 def get_shots(
         uid: Optional[str] = None,
         project_uid: Optional[str] = None,
@@ -46,7 +58,11 @@ def get_shots(
         limit: int = Query(100, ge=1, le=500),
         offset: int = Query(0, ge=0),
         include_deleted: bool = Query(False, description="Include soft-deleted records"),
+        include: Optional[str] = Query(
+            None, description="Comma-separated relationships to embed, e.g. tasks,tasks.versions,tasks.versions.publishes"
+        ),
+        uids: Optional[str] = Query(None, description="Comma-separated UIDs to fetch"),
         db: Session = Depends(get_db),
 ):
     """List or search Shots with optional filters (excludes soft-deleted by default)."""
-    return controller.list_shots(db, uid, project_uid, shot, limit, offset, include_deleted)
+    return controller.list_shots(db, uid, project_uid, shot, limit, offset, include_deleted, include, uids=parse_uids(uids))
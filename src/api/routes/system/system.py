@@ -1,10 +1,14 @@
-﻿from fastapi import APIRouter, Request, Depends, HTTPException, Security
+﻿from fastapi import APIRouter, Request, Depends, HTTPException, Query, Security
+from fastapi.responses import PlainTextResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
 from api.controllers.system.system_controller import status_payload, db_conn
-from api.dependencies.auth import require_token
+from api.dependencies.auth import require_token, require_admin
 from services.health_service import get_health_status
+from services.metrics_service import render_metrics
+from services.slow_query_service import slow_query_log
+from app.config import settings
 from db.db import get_db
 
 router = APIRouter()
@@ -23,7 +27,13 @@ def authz(auth=Depends(require_token)):
     return auth
 
 
-@router.get("/healthz", summary="Liveness")
+@router.get("/livez", summary="Liveness")
+def livez():
+    """Process liveness only; never touches the database."""
+    return {"ok": True}
+
+
+@router.get("/healthz", summary="Health")
 def healthz(
         db: Session = Depends(get_db),
         credentials: HTTPAuthorizationCredentials = Security(bearer),
@@ -50,3 +60,24 @@ def healthz(
 def readyz():
     """Check DB readiness (only authenticated users)."""
     return db_conn()
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+def metrics():
+    """Request, DB pool, query, cache and rate-limit metrics in the Prometheus text format."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/slow-queries", summary="Slow queries", dependencies=[Depends(require_admin)])
+def slow_queries(limit: int = Query(50, ge=1, le=500)):
+    """Recent slow statements (newest first) with route, controller and EXPLAIN plan (admin only)."""
+    return {"threshold_ms": settings.SLOW_QUERY_MS, "samples": slow_query_log.list(limit)}
+
+
+@router.delete("/slow-queries", summary="Clear slow queries", dependencies=[Depends(require_admin)])
+def clear_slow_queries():
+    """Empty this worker's slow-query buffer (admin only)."""
+    slow_query_log.clear()
+    return {"ok": True}
@@ -2,7 +2,9 @@
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from db.db import get_db
+from utils.database import parse_uids
 from schemas.pagination import PaginatedResponse
+from schemas.batch import BatchGetRequest, BatchGetResponse
 from schemas.response import ApiResponse
 import api.controllers.task_controller as controller
 import schemas.task
@@ -39,7 +41,17 @@ def delete_task(
     return controller.delete_task(db, uid)
 
 
-@router.get("/tasks", response_model=PaginatedResponse[schemas.task.TaskOut])
+@router.post("/tasks:batchGet", response_model=BatchGetResponse[schemas.task.TaskOut], response_model_exclude_unset=True)
+def batch_get_tasks(
+        data: BatchGetRequest,
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed"),
+        db: Session = Depends(get_db),
+):
+    """Fetch Tasks by UID in one query, in request order, with missing UIDs reported."""
+    return controller.batch_get_tasks(db, data.uids, include)
+
+
+@router.get("/tasks", response_model=PaginatedResponse[schemas.task.TaskOut], response_model_exclude_unset=True)
 def get_tasks(
         uid: Optional[str] = None,
         project_uid: Optional[str] = None,
@@ -51,18 +63,30 @@ def get_tasks(
         limit: int = Query(100, ge=1, le=500),
         offset: int = Query(0, ge=0),
         include_deleted: bool = Query(False, description="Include soft-deleted records"),
+        include: Optional[str] = Query(
+            None, description="Comma-separated relationships to embed, e.g. versions,versions.publishes"
+        ),
+        uids: Optional[str] = Query(None, description="Comma-separated UIDs to fetch"),
         db: Session = Depends(get_db),
 ):
     """List or search Tasks with optional filters (excludes soft-deleted by default)."""
-    return controller.list_tasks(db, uid, project_uid, parent_type, parent_id, name, assignee, status, limit, offset, include_deleted)
+    return controller.list_tasks(
+        db, uid, project_uid, parent_type, parent_id, name, assignee, status, limit, offset, include_deleted, include,
+        uids=parse_uids(uids)
+    )
 
 
-@router.get("/tasks/{task_uid}/versions", response_model=PaginatedResponse[schemas.version.VersionOut])
+@router.get(
+    "/tasks/{task_uid}/versions",
+    response_model=PaginatedResponse[schemas.version.VersionOut],
+    response_model_exclude_unset=True,
+)
 def get_task_versions(
         task_uid: str,
         db: Session = Depends(get_db),
         limit: int = Query(50, ge=1, le=500),
-        offset: int = Query(0, ge=0)
+        offset: int = Query(0, ge=0),
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed, e.g. publishes"),
 ):
     """List all Versions for a Task. Returns paginated results with metadata."""
-    return controller.list_task_versions(db, task_uid, limit, offset)
+    return controller.list_task_versions(db, task_uid, limit, offset, include)
@@ -2,7 +2,9 @@
 from sqlalchemy.orm import Session
 from typing import Optional
 from db.db import get_db
+from utils.database import parse_uids
 from schemas.pagination import PaginatedResponse
+from schemas.batch import BatchGetRequest, BatchGetResponse
 from schemas.response import ApiResponse
 import api.controllers.version_controller as controller
 import schemas.version
@@ -39,7 +41,21 @@ def delete_version(
     return controller.delete_version(db, uid)
 
 
-@router.get("/versions", response_model=PaginatedResponse[schemas.version.VersionOut])
+@router.post(
+    "/versions:batchGet",
+    response_model=BatchGetResponse[schemas.version.VersionOut],
+    response_model_exclude_unset=True,
+)
+def batch_get_versions(
+        data: BatchGetRequest,
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed"),
+        db: Session = Depends(get_db),
+):
+    """Fetch Versions by UID in one query, in request order, with missing UIDs reported."""
+    return controller.batch_get_versions(db, data.uids, include)
+
+
+@router.get("/versions", response_model=PaginatedResponse[schemas.version.VersionOut], response_model_exclude_unset=True)
 def get_versions(
         uid: Optional[str] = None,
         project_uid: Optional[str] = None,
@@ -50,7 +66,12 @@ def get_versions(
         limit: int = Query(100, ge=1, le=500),
         offset: int = Query(0, ge=0),
         include_deleted: bool = Query(False, description="Include soft-deleted records"),
+        include: Optional[str] = Query(None, description="Comma-separated relationships to embed, e.g. publishes"),
+        uids: Optional[str] = Query(None, description="Comma-separated UIDs to fetch"),
         db: Session = Depends(get_db),
 ):
     """List or search Versions with optional filters (excludes soft-deleted by default)."""
-    return controller.list_versions(db, uid, project_uid, task_uid, vnum, status, created_by, limit, offset, include_deleted)
+    return controller.list_versions(
+        db, uid, project_uid, task_uid, vnum, status, created_by, limit, offset, include_deleted, include,
+        uids=parse_uids(uids)
+    )
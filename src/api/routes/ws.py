@@ -0,0 +1,21 @@
+from fastapi import APIRouter, WebSocket, status
+from starlette.concurrency import run_in_threadpool
+from api.dependencies.auth import authenticate_websocket
+from services.notify_service import get_listener
+import api.controllers.change_feed_controller as controller
+
+router = APIRouter()
+
+
+@router.websocket("/ws/projects/{project_uid}")
+async def project_changes(websocket: WebSocket, project_uid: str):
+    """
+    Real-time change feed for a Project's tasks, versions and publishes.
+    Filter with `?tables=tasks,versions&ops=update`, or send `{"tables": [...], "ops": [...]}` at any time.
+    """
+    api_key = await run_in_threadpool(authenticate_websocket, websocket)
+    if not api_key:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid or missing token")
+        return
+
+    await controller.project_change_feed(websocket, get_listener(websocket.app), project_uid, api_key.token)
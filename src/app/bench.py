@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+import time
+from typing import Dict
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.config import settings
+from app.logging_config import get_logger
+from app.middleware import install_middleware
+
+logger = get_logger(__name__)
+
+# Per-request middleware overhead, measured in-process by calling the ASGI app directly
+# (no sockets, no server) so only the middleware stack differs between runs.
+
+
+# The stack create_app installed before the pure ASGI rewrite: app/middleware.py's
+# BaseHTTPMiddleware classes as of commit 1cc67cb, copied unchanged apart from their names.
+
+
+def _get_client_ip(request: Request) -> str:
+    """Extract client IP address from request"""
+    # Check proxy forwarded IP header
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+
+    # Check real IP header
+    real_ip = request.headers.get("X-Real-IP")
+    if real_ip:
+        return real_ip
+
+    # Use direct client IP as fallback
+    return request.client.host if request.client else "unknown"
+
+
+class BaselineRateLimitMiddleware(BaseHTTPMiddleware):
+    """Simple in-memory rate limiting middleware"""
+
+    def __init__(self, app, requests_per_minute: int = None, window_size: int = None):
+        super().__init__(app)
+        self.requests_per_minute = requests_per_minute or settings.RATE_LIMIT_REQUESTS
+        self.window_size = window_size or settings.RATE_LIMIT_WINDOW
+        self.requests: Dict[str, list] = {}
+
+    async def dispatch(self, request: Request, call_next):
+        # Exclude health check endpoints from rate limiting
+        if request.url.path in ["/health", "/health/simple"]:
+            return await call_next(request)
+
+        client_ip = _get_client_ip(request)
+        current_time = time.time()
+
+        # Remove expired request timestamps
+        if client_ip in self.requests:
+            self.requests[client_ip] = [
+                req_time for req_time in self.requests[client_ip]
+                if current_time - req_time < self.window_size
+            ]
+        else:
+            self.requests[client_ip] = []
+
+        # Verify client has not exceeded rate limit
+        if len(self.requests[client_ip]) >= self.requests_per_minute:
+            logger.warning(f"Rate limit exceeded for IP: {client_ip}")
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "message": "Rate limit exceeded",
+                    "details": {
+                        "limit": self.requests_per_minute,
+                        "window_seconds": self.window_size,
+                        "retry_after": self.window_size
+                    }
+                }
+            )
+
+        # Track current request timestamp
+        self.requests[client_ip].append(current_time)
+
+        # Process request and add rate limit headers
+        response = await call_next(request)
+        remaining = max(0, self.requests_per_minute - len(self.requests[client_ip]))
+        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        response.headers["X-RateLimit-Reset"] = str(int(current_time + self.window_size))
+
+        return response
+
+
+class BaselineSecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """Add security headers to responses"""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+
+        # Apply security headers to response
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+
+        # Enable HSTS for production environment
+        if settings.is_production():
+            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+
+        return response
+
+
+class BaselineRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """Log all requests for monitoring and debugging"""
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+
+        # Log incoming request
+        logger.info(
+            f"Request: {request.method} {request.url.path} from {request.client.host if request.client else 'unknown'}")
+
+        # Process request and calculate timing
+        response = await call_next(request)
+
+        # Log response details
+        process_time = time.time() - start_time
+        logger.info(f"Response: {response.status_code} in {process_time:.3f}s")
+
+        # Include processing time in response headers
+        response.headers["X-Process-Time"] = str(process_time)
+
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    api = FastAPI()
+
+    @api.get("/ping")
+    def ping():
+        return PlainTextResponse("pong")
+
+    if stack == "asgi":
+        # The production stack, exactly as create_app builds it (limits raised so nothing is throttled)
+        install_middleware(api, requests_per_minute=10 ** 9, token_requests=10 ** 9)
+    elif stack == "base":
+        # In the order the old create_app added them. The old limiter rescans every timestamp
+        # of the client's window on each request, so its cost grows with -n, as it did in production
+        api.add_middleware(BaselineSecurityHeadersMiddleware)
+        api.add_middleware(BaselineRequestLoggingMiddleware)
+        api.add_middleware(BaselineRateLimitMiddleware, requests_per_minute=10 ** 9)
+        api.add_middleware(
+            CORSMiddleware,
+            allow_origins=settings.CORS_ORIGINS,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    return api
+
+
+async def measure(api: FastAPI, requests: int) -> float:
+    """Average microseconds per GET /ping"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # Warm up route compilation and any lazily built state
+    for _ in range(min(requests, 200)):
+        await api(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await api(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def run(requests: int, rounds: int):
+    """Stacks are measured in interleaved rounds and the fastest round is kept, so a noisy
+    neighbour or a GC pause during one round does not skew the comparison"""
+    stacks = [("no middleware", build_app("none")), ("BaseHTTPMiddleware (before)", build_app("base")),
+              ("pure ASGI (current)", build_app("asgi"))]
+    best = {label: float("inf") for label, _ in stacks}
+    for _ in range(rounds):
+        for label, api in stacks:
+            best[label] = min(best[label], await measure(api, requests))
+
+    baseline = best["no middleware"]
+    print(f"{'stack':<28}{'us/request':>12}{'overhead':>12}")
+    for label, took in best.items():
+        overhead = f"{took - baseline:.1f}" if label != "no middleware" else "-"
+        print(f"{label:<28}{took:>12.1f}{overhead:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-request middleware overhead")
+    parser.add_argument("-n", "--requests", type=int, default=5000)
+    parser.add_argument("-r", "--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.rounds))
@@ -15,6 +15,22 @@ class Settings(BaseSettings):
     API_VERSION: str = "v1"
     LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL", "RESET"] = "INFO"
 
+    # Log output (files are JSON lines; rotated files are gzipped). "external" leaves rotation to
+    # logrotate or similar and reopens moved files; it is forced when WEB_CONCURRENCY > 1, since
+    # workers sharing one file cannot each rotate it.
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_ROTATION: Literal["size", "time", "external"] = "size"
+    LOG_MAX_BYTES: int = 50 * 1024 * 1024
+    LOG_ROTATE_WHEN: str = "midnight"
+    LOG_BACKUP_COUNT: int = 14
+
+    # Access log sampling: default rate plus per-route overrides keyed by route path template.
+    # Responses with status >= 400 are always logged.
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_ROUTE_SAMPLE_RATES: dict[str, float] = {
+        "/api/": 0.0, "/api/livez": 0.0, "/api/healthz": 0.0, "/api/readyz": 0.0, "/api/metrics": 0.0
+    }
+
     # Deployment environment
     ENVIRONMENT: Literal["development", "staging", "production"] = "development"
     DEBUG: bool = False
@@ -29,6 +45,65 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
 
+    # Worker-aware pool sizing: when DB_MAX_CONNECTIONS is set, the Postgres connection budget
+    # (minus DB_RESERVED_CONNECTIONS for admin/migrations) is split across WEB_CONCURRENCY
+    # workers and overrides DB_POOL_SIZE / DB_MAX_OVERFLOW. `slate serve` sets WEB_CONCURRENCY.
+    WEB_CONCURRENCY: int = 1
+    DB_MAX_CONNECTIONS: int | None = None
+    DB_RESERVED_CONNECTIONS: int = 10
+
+    # Postgres LISTEN/NOTIFY (needs a session-mode port; transaction poolers drop LISTEN)
+    NOTIFY_ENABLED: bool = True
+    DB_LISTEN_PORT: int | None = None
+    NOTIFY_KEEPALIVE_SECONDS: int = 15
+    RENDER_WATCH_MAX_TIMEOUT: int = 60
+    WS_SEND_QUEUE_SIZE: int = 256
+
+    # Asynchronous event ingestion (flush every N ms or M events)
+    EVENT_QUEUE_SIZE: int = 10000
+    EVENT_FLUSH_BATCH_SIZE: int = 500
+    EVENT_FLUSH_INTERVAL_MS: int = 250
+
+    # Event partition maintenance and retention
+    EVENT_RETENTION_ENABLED: bool = True
+    EVENT_RETENTION_MONTHS: int = 12
+    EVENT_PARTITIONS_AHEAD: int = 3
+    EVENT_RETENTION_INTERVAL_HOURS: int = 24
+    EVENT_ARCHIVE_DIR: str = "archive/events"
+
+    # Latest-publish resolver cache
+    RESOLVE_CACHE_TTL: int = 30
+    RESOLVE_CACHE_SIZE: int = 4096
+
+    # Per-request SQL instrumentation: warn when one request repeats a statement shape more than
+    # N times; SQL_DEBUG (or X-Debug-SQL: 1 when DEBUG is on) logs every statement per request
+    SQL_REPEAT_WARN_THRESHOLD: int = 10
+    SQL_DEBUG: bool = False
+
+    # Slow-query log: statements slower than SLOW_QUERY_MS (0 disables) are logged and kept in a
+    # ring buffer at /api/slow-queries, with an EXPLAIN (FORMAT JSON) plan captured in the background
+    SLOW_QUERY_MS: int = 500
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_BUFFER_SIZE: int = 200
+
+    # Health checks: run concurrently, each time-boxed, combined result cached per worker
+    HEALTH_CACHE_SECONDS: float = 5.0
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+    HEALTH_POOL_SATURATION_MAX: float = 0.9
+    HEALTH_REPLICA_LAG_MAX_SECONDS: float = 30.0
+
+    # Prometheus metrics at /api/metrics (set METRICS_MULTIPROC_DIR to aggregate across workers)
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_FLUSH_SECONDS: int = 5
+
+    # Idempotency-Key replay for POST requests (stored responses + per-worker hot cache)
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    # An unfinished request may be retried after this long; keep above the slowest POST
+    IDEMPOTENCY_LEASE_SECONDS: int = 120
+    IDEMPOTENCY_HOT_CACHE_SECONDS: int = 60
+    IDEMPOTENCY_HOT_CACHE_SIZE: int = 2048
+
     # Authentication credentials
     API_USERNAME: str = "admin"
     API_TOKEN: Optional[str] = "token"
@@ -38,9 +113,14 @@ class Settings(BaseSettings):
     # Cross-origin resource sharing
     CORS_ORIGINS: list[str] = ["*"]
 
-    # Request rate limiting
+    # Request rate limiting (GCRA, per client IP and per API token)
     RATE_LIMIT_REQUESTS: int = 100
+    RATE_LIMIT_TOKEN_REQUESTS: int = 600
     RATE_LIMIT_WINDOW: int = 60
+    # "postgres" shares limits across workers at the cost of a write transaction per request:
+    # the client's keys are locked with SELECT ... FOR UPDATE and updated before the route runs
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 10000
 
     model_config = SettingsConfigDict(
         env_file=os.path.join(ROOT_DIR, ".env"),
@@ -55,6 +135,24 @@ class Settings(BaseSettings):
             return v.upper()
         return v
 
+    @field_validator("RATE_LIMIT_REQUESTS", "RATE_LIMIT_TOKEN_REQUESTS", "RATE_LIMIT_WINDOW")
+    def require_positive_rate_limit(cls, v):
+        # The limiter spaces requests window / limit seconds apart
+        if v < 1:
+            raise ValueError("must be at least 1")
+        return v
+
+    def db_pool_limits(self) -> tuple[int, int]:
+        """(pool_size, max_overflow) for this worker"""
+        if not self.DB_MAX_CONNECTIONS:
+            return self.DB_POOL_SIZE, self.DB_MAX_OVERFLOW
+
+        # Each worker also holds one LISTEN connection when notifications are on
+        budget = self.DB_MAX_CONNECTIONS - self.DB_RESERVED_CONNECTIONS
+        per_worker = max(budget // max(self.WEB_CONCURRENCY, 1) - int(self.NOTIFY_ENABLED), 1)
+        pool_size = max(per_worker * 2 // 3, 1)
+        return pool_size, max(per_worker - pool_size, 0)
+
     def is_development(self) -> bool:
         return self.ENVIRONMENT == "development"
 
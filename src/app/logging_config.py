@@ -1,10 +1,17 @@
+import atexit
+import gzip
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import shutil
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 from app.config import settings
 
 LOGS_DIR = Path(__file__).parent.parent.parent / "logs"
-LOGS_DIR.mkdir(exist_ok=True)
 
 # Terminal color codes for log output
 COLORS = {
@@ -16,51 +23,150 @@ COLORS = {
     "reset": "\033[0m"
 }
 
+# Attributes every LogRecord has; anything else was passed via `extra=` and goes into JSON output
+RESERVED_ATTRS = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+# Background writer shared by every handler, started in setup_logging()
+_listener: logging.handlers.QueueListener | None = None
+
 
 class ColorFormatter(logging.Formatter):
     """Formatter that lowercases levelname and adds colors."""
 
     def format(self, record):
         level = record.levelname.lower()
-        record.levelname = level
         color = COLORS.get(level, COLORS["reset"])
+        # Copy so the lowercase levelname does not leak into the other handlers
+        record = logging.makeLogRecord({**record.__dict__, "levelname": level})
         message = super().format(record)
         return f"{color}{message}{COLORS['reset']}"
 
 
-def setup_logging():
-    """Configure application logging"""
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, source and any `extra=` fields."""
 
-    # Simple console formatter with color support
-    console_formatter = ColorFormatter('[%(levelname)s]: %(message)s')
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+            "source": f"{record.filename}:{record.lineno}",
+        }
+        for key, value in record.__dict__.items():
+            if key not in RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps `extra=` fields and the level intact for structured output.
+
+    Only the message is rendered in the calling thread (args may not be safe to read later);
+    handler formatting and I/O happen on the listener thread.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str):
+    """Compress the rotated file (runs on the listener thread, never the event loop)"""
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _log_rotation() -> str:
+    """Rotation mode; only a single process may rotate its own files"""
+    if settings.WEB_CONCURRENCY > 1:
+        return "external"
+    return settings.LOG_ROTATION
+
+
+def _file_handler(filename: str, level: int, formatter: logging.Formatter) -> logging.Handler:
+    """Size- or time-rotated file handler that gzips rotated files, or an externally rotated one"""
+    path = LOGS_DIR / filename
+    rotation = _log_rotation()
+    if rotation == "external":
+        # Appends from several workers interleave safely; the file is reopened once moved away
+        handler = logging.handlers.WatchedFileHandler(path, encoding="utf-8", delay=True)
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+        return handler
+
+    if rotation == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=settings.LOG_ROTATE_WHEN, backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8", delay=True
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=settings.LOG_MAX_BYTES, backupCount=settings.LOG_BACKUP_COUNT, encoding="utf-8", delay=True
+        )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    handler.setLevel(level)
+    handler.setFormatter(formatter)
+    return handler
 
-    # Detailed file formatter for debugging
-    file_format = '[%(levelname)s]: %(message)s @ %(asctime)s - %(name)s - %(filename)s:%(lineno)d'
 
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, settings.LOG_LEVEL))
+def setup_logging():
+    """Configure application logging
 
-    # Remove existing handlers
-    root_logger.handlers.clear()
+    Loggers only enqueue records; a QueueListener thread formats them and writes to the
+    console and rotating files, so request handling never blocks on terminal or disk I/O.
+    """
+    global _listener
+    shutdown_logging()
+    LOGS_DIR.mkdir(exist_ok=True)
+
+    # Simple console formatter with color support (or JSON for log collectors)
+    if settings.LOG_FORMAT == "json":
+        console_formatter = JsonFormatter()
+    else:
+        console_formatter = ColorFormatter('[%(levelname)s]: %(message)s')
+
+    # Files are always structured
+    file_formatter = JsonFormatter()
 
     # Configure console output
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(getattr(logging, settings.LOG_LEVEL))
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
 
     # Configure file logging
-    file_formatter = logging.Formatter(file_format)
-    file_handler = logging.FileHandler(LOGS_DIR / "slate_runner.log")
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
+    handlers = [
+        console_handler,
+        _file_handler("slate_runner.log", logging.INFO, file_formatter),
+        _file_handler("errors.log", logging.ERROR, file_formatter),
+    ]
 
-    error_handler = logging.FileHandler(LOGS_DIR / "errors.log")
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(file_formatter)
-    root_logger.addHandler(error_handler)
+    # Configure root logger
+    log_queue = queue.SimpleQueue()
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, settings.LOG_LEVEL))
+
+    # Remove existing handlers
+    root_logger.handlers.clear()
+    root_logger.addHandler(StructuredQueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     # Set log levels for third-party loggers
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -69,7 +175,25 @@ def setup_logging():
 
     # Confirm logging initialization
     logger = logging.getLogger(__name__)
-    logger.info(f"logging configured - Level: {settings.LOG_LEVEL}, Environment: {settings.ENVIRONMENT}")
+    logger.info("logging configured - Level: %s, Environment: %s", settings.LOG_LEVEL, settings.ENVIRONMENT)
+    if settings.LOG_ROTATION != _log_rotation():
+        logger.warning(
+            "LOG_ROTATION=%s ignored with %s workers; log files must be rotated externally (e.g. logrotate)",
+            settings.LOG_ROTATION, settings.WEB_CONCURRENCY,
+        )
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
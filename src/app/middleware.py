@@ -1,120 +1,364 @@
+import hashlib
+import logging
+import math
+import random
 import time
-from typing import Dict
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+import anyio
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy.exc import SQLAlchemyError
 from app.config import settings
 from app.logging_config import get_logger
+from services.rate_limit_service import create_rate_limiter
+from services.idempotency_service import idempotency_store, request_fingerprint, IdempotencyConflict
+from services.metrics_service import http_requests_total, http_request_duration_seconds, rate_limit_rejections_total
+from services.query_stats_service import RequestQueryStats, current_query_stats, log_statement_dump
 
 logger = get_logger(__name__)
+access_logger = get_logger("slate_runner.access")
 
+# Middleware below is plain ASGI: headers are added on `http.response.start` and bodies pass
+# straight through, so there is no per-request task/stream wrapping and streaming responses
+# (SSE, NDJSON) are never buffered.
 
-def _get_client_ip(request: Request) -> str:
-    """Extract client IP address from request"""
-    # Check proxy forwarded IP header
-    forwarded_for = request.headers.get("X-Forwarded-For")
-    if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
 
-    # Check real IP header
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip:
-        return real_ip
+# Probe and scrape endpoints polled by infrastructure are never rate limited
+UNLIMITED_PATHS = {"/api/livez", "/api/healthz", "/api/readyz", "/api/metrics"}
 
-    # Use direct client IP as fallback
-    return request.client.host if request.client else "unknown"
 
+def _bearer_token(headers: Headers) -> str | None:
+    auth_header = headers.get("Authorization", "")
+    return auth_header.split(" ", 1)[1] if auth_header.startswith("Bearer ") else None
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiting middleware"""
 
-    def __init__(self, app, requests_per_minute: int = None, window_size: int = None):
-        super().__init__(app)
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _replaying_receive(body: bytes, receive: Receive) -> Receive:
+    """A receive that delivers an already read body once, then defers to the client's"""
+    replayed = False
+
+    async def replay_body() -> Message:
+        nonlocal replayed
+        if replayed:
+            # The body is spent; what is left to wait for (e.g. http.disconnect) comes from the client
+            return await receive()
+        replayed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay_body
+
+
+class RateLimitMiddleware:
+    """GCRA rate limiting per client IP and per API token (memory or shared Postgres backend)"""
+
+    def __init__(self, app: ASGIApp, requests_per_minute: int = None, window_size: int = None, token_requests: int = None):
+        self.app = app
         self.requests_per_minute = requests_per_minute or settings.RATE_LIMIT_REQUESTS
+        self.token_requests = token_requests or settings.RATE_LIMIT_TOKEN_REQUESTS
         self.window_size = window_size or settings.RATE_LIMIT_WINDOW
-        self.requests: Dict[str, list] = {}
+        self.limiter = create_rate_limiter()
+        self.shared = settings.RATE_LIMIT_BACKEND == "postgres"
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         # Exclude health check endpoints from rate limiting
-        if request.url.path in ["/health", "/health/simple"]:
-            return await call_next(request)
-
-        client_ip = _get_client_ip(request)
-        current_time = time.time()
-
-        # Remove expired request timestamps
-        if client_ip in self.requests:
-            self.requests[client_ip] = [
-                req_time for req_time in self.requests[client_ip]
-                if current_time - req_time < self.window_size
-            ]
+        if scope["type"] != "http" or scope["path"] in UNLIMITED_PATHS:
+            return await self.app(scope, receive, send)
+
+        # The socket peer; behind a proxy, uvicorn --proxy-headers fills it in from trusted proxies only
+        client = scope.get("client")
+        checks = [(f"ip:{client[0] if client else 'unknown'}", self.requests_per_minute)]
+        token = _bearer_token(Headers(scope=scope))
+        if token:
+            checks.append((f"token:{hashlib.sha256(token.encode()).hexdigest()[:16]}", self.token_requests))
+
+        # All keys are checked before any is charged; the shared backend is a DB round trip, keep it off the event loop
+        if self.shared:
+            outcomes = await run_in_threadpool(self.limiter.hit_all, checks, self.window_size)
         else:
-            self.requests[client_ip] = []
+            outcomes = self.limiter.hit_all(checks, self.window_size)
 
-        # Verify client has not exceeded rate limit
-        if len(self.requests[client_ip]) >= self.requests_per_minute:
-            logger.warning(f"Rate limit exceeded for IP: {client_ip}")
-            raise HTTPException(
+        for (key, _), outcome in zip(checks, outcomes):
+            if not outcome.allowed:
+                logger.warning("Rate limit exceeded for %s", key)
+                rate_limit_rejections_total.inc(key.split(":", 1)[0])
+
+        # Tightest result wins: the longest wait when denied, otherwise the fewest requests left
+        denied = [outcome for outcome in outcomes if not outcome.allowed]
+        result = max(denied, key=lambda o: o.retry_after) if denied else min(outcomes, key=lambda o: o.remaining)
+
+        if not result.allowed:
+            retry_after = max(1, math.ceil(result.retry_after))
+            response = JSONResponse(
                 status_code=429,
-                detail={
+                content={
                     "message": "Rate limit exceeded",
                     "details": {
-                        "limit": self.requests_per_minute,
+                        "limit": result.limit,
                         "window_seconds": self.window_size,
-                        "retry_after": self.window_size
+                        "retry_after": retry_after
                     }
-                }
+                },
+                headers={"Retry-After": str(retry_after)},
             )
+            return await response(scope, receive, send)
 
-        # Track current request timestamp
-        self.requests[client_ip].append(current_time)
+        # Add rate limit headers to the response
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                response_headers["X-RateLimit-Limit"] = str(result.limit)
+                response_headers["X-RateLimit-Remaining"] = str(result.remaining)
+                response_headers["X-RateLimit-Reset"] = str(int(time.time() + result.reset_after))
+            await send(message)
 
-        # Process request and add rate limit headers
-        response = await call_next(request)
-        remaining = max(0, self.requests_per_minute - len(self.requests[client_ip]))
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(current_time + self.window_size))
+        await self.app(scope, receive, send_with_headers)
 
-        return response
 
+class MetricsMiddleware:
+    """Per-route request counts and latency histograms"""
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to responses"""
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Label by route template; unmatched paths share one label to bound cardinality
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_requests_total.inc(scope["method"], route, str(status_code))
+            http_request_duration_seconds.observe(time.perf_counter() - start_time, scope["method"], route)
+
+
+class QueryStatsMiddleware:
+    """Track SQL count and DB time per request and report them in a Server-Timing header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        debug = settings.SQL_DEBUG or (settings.DEBUG and Headers(scope=scope).get("X-Debug-SQL") == "1")
+        stats = RequestQueryStats(scope=scope, debug=debug)
+        token = current_query_stats.set(stats)
+        start_time = time.perf_counter()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start_time) * 1000
+                db_ms = stats.db_seconds * 1000
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'db;dur={db_ms:.2f};desc="{stats.count} queries", app;dur={max(total_ms - db_ms, 0.0):.2f}',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            if debug:
+                log_statement_dump(stats)
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
 
-        # Apply security headers to response
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+class SecurityHeadersMiddleware:
+    """Add security headers to responses"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.headers = {
+            "X-Content-Type-Options": "nosniff",
+            "X-Frame-Options": "DENY",
+            "X-XSS-Protection": "1; mode=block",
+            "Referrer-Policy": "strict-origin-when-cross-origin",
+        }
 
         # Enable HSTS for production environment
         if settings.is_production():
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+            self.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in self.headers.items():
+                    response_headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+class RequestLoggingMiddleware:
+    """Structured, sampled access log (one record per request) and X-Process-Time header"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.default_rate = settings.ACCESS_LOG_SAMPLE_RATE
+        self.route_rates = settings.ACCESS_LOG_ROUTE_SAMPLE_RATES
+
+    def _sampled(self, route_path: str, status_code: int) -> bool:
+        # Errors are always logged; everything else by the route's sample rate
+        if status_code >= 400:
+            return True
+        rate = self.route_rates.get(route_path, self.default_rate)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        # Include processing time (until the response starts) in response headers
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Process-Time"] = str(time.perf_counter() - start_time)
+            await send(message)
 
-        return response
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # The router stores the matched route in the scope; sample by its path template
+            route = scope.get("route")
+            route_path = getattr(route, "path", scope["path"])
+            if access_logger.isEnabledFor(logging.INFO) and self._sampled(route_path, status_code):
+                duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+                client = scope.get("client")
+                access_logger.info(
+                    "%s %s %s %.2fms", scope["method"], scope["path"], status_code, duration_ms,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "route": route_path,
+                        "status": status_code,
+                        "duration_ms": duration_ms,
+                        "client": client[0] if client else None,
+                    },
+                )
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Log all requests for monitoring and debugging"""
+class IdempotencyMiddleware:
+    """Replay the stored response for POST requests repeated with the same Idempotency-Key"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        key = headers.get("Idempotency-Key")
+        token = _bearer_token(headers)
+        if not key or not token:
+            return await self.app(scope, receive, send)
+
+        if len(key) > 255:
+            response = JSONResponse(status_code=400, content={"detail": "Idempotency-Key must be at most 255 characters."})
+            return await response(scope, receive, send)
+
+        # Read the whole body up front (to fingerprint it), then replay it to the app
+        body = await _read_body(receive)
+        replay_body = _replaying_receive(body, receive)
+
+        query = scope.get("query_string", b"").decode("latin-1")
+        fingerprint = request_fingerprint(scope["method"], scope["path"], query, body)
+
+        try:
+            stored = await run_in_threadpool(
+                idempotency_store.reserve, token, key, scope["method"], scope["path"], fingerprint
+            )
+        except IdempotencyConflict as e:
+            response = JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+            return await response(scope, receive, send)
+        except SQLAlchemyError as e:
+            # Unknown tokens fail RLS here; let the route's auth answer instead
+            logger.warning("idempotency key not reserved: %s", e.__class__.__name__)
+            return await self.app(scope, replay_body, send)
+
+        if stored is not None:
+            response = Response(
+                content=stored.body,
+                status_code=stored.status_code,
+                media_type=stored.content_type,
+                headers={"Idempotent-Replayed": "true"},
+            )
+            return await response(scope, receive, send)
+
+        await self._run_and_store(scope, replay_body, send, token, key)
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+    async def _run_and_store(self, scope: Scope, receive: Receive, send: Send, token: str, key: str):
+        """Run the app, storing its response under the key, or releasing the key if it fails"""
+        # Pass the response through untouched while keeping a copy to store
+        status_code = 500
+        content_type = None
+        captured = []
 
-        # Log incoming request
-        logger.info(
-            f"Request: {request.method} {request.url.path} from {request.client.host if request.client else 'unknown'}")
+        async def send_and_capture(message: Message):
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message.get("headers", [])).get("content-type")
+            elif message["type"] == "http.response.body":
+                captured.append(message.get("body", b""))
+            await send(message)
 
-        # Process request and calculate timing
-        response = await call_next(request)
+        try:
+            await self.app(scope, receive, send_and_capture)
+        except BaseException:
+            # Includes cancellation (shutdown, worker recycling); shield so the release still runs
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(idempotency_store.release, token, key)
+            raise
 
-        # Log response details
-        process_time = time.time() - start_time
-        logger.info(f"Response: {response.status_code} in {process_time:.3f}s")
+        await run_in_threadpool(idempotency_store.complete, token, key, status_code, content_type, b"".join(captured))
 
-        # Include processing time in response headers
-        response.headers["X-Process-Time"] = str(process_time)
 
-        return response
+def install_middleware(api: FastAPI, requests_per_minute: int = None, token_requests: int = None):
+    """Add the application middleware stack in order (shared by create_app and the benchmark)"""
+    api.add_middleware(IdempotencyMiddleware)
+    api.add_middleware(SecurityHeadersMiddleware)
+    api.add_middleware(RequestLoggingMiddleware)
+    api.add_middleware(QueryStatsMiddleware)
+    api.add_middleware(RateLimitMiddleware, requests_per_minute=requests_per_minute, token_requests=token_requests)
+    if settings.METRICS_ENABLED:
+        api.add_middleware(MetricsMiddleware)
+    api.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
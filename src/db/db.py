@@ -1,26 +1,45 @@
-﻿from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+﻿import threading
+import time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session, sessionmaker
 from typing import Generator
 from utils.database import build_database_url
 from app.config import settings
 from app.logging_config import get_logger
+from services.metrics_service import metrics, db_pool_checkout_seconds, db_pool_connections
+from services.query_stats_service import instrument_engine
 
 logger = get_logger(__name__)
 
 
-# Initialize database engine and session factory
-def setup_database():
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - start)
+
+
+# Build the database engine (called once, on first use)
+def setup_database() -> Engine:
     db_url = build_database_url()
     
     # Mask password in connection log
     safe_url = db_url.split('@')[1] if '@' in db_url else 'unknown'
-    logger.info(f"Connecting to database: {safe_url}")
+    logger.info("Connecting to database: %s", safe_url)
 
     # Configure database engine
+    pool_size, max_overflow = settings.db_pool_limits()
     engine_kwargs = {
+        "poolclass": InstrumentedQueuePool,
         "pool_pre_ping": True,
-        "pool_size": settings.DB_POOL_SIZE,
-        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
         "pool_recycle": 3600,
         "future": True,
     }
@@ -29,20 +48,66 @@ def setup_database():
         engine_kwargs["echo"] = settings.DEBUG
 
     db_engine = create_engine(db_url, **engine_kwargs)
-    session_local = sessionmaker(
-        bind=db_engine,
-        autoflush=False,
-        autocommit=False,
-        future=True
-    )
+    instrument_engine(db_engine)
+
+    # Pool state is read on demand when metrics are collected
+    def collect_pool():
+        pool = db_engine.pool
+        db_pool_connections.set(pool.checkedout(), "checked_out")
+        db_pool_connections.set(pool.checkedin(), "idle")
+        db_pool_connections.set(max(pool.overflow(), 0), "overflow")
+
+    metrics.on_collect(collect_pool)
 
     logger.info(
-        f"Database engine configured with pool_size={settings.DB_POOL_SIZE}, max_overflow={settings.DB_MAX_OVERFLOW}")
-    return session_local, db_engine
+        "Database engine configured with pool_size=%s, max_overflow=%s", pool_size, max_overflow)
+    return db_engine
+
+
+# Engine is created lazily so importing a controller (CLI commands, tooling, tests) costs
+# no driver import, URL validation or pool setup
+_engine: Engine | None = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """Process-wide engine, created on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = setup_database()
+    return _engine
+
+
+def dispose_engine():
+    """Close pooled connections if the engine was ever created"""
+    if _engine is not None:
+        _engine.dispose()
+
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker that binds to get_engine() when a session is made, not when it is defined"""
+
+    def __call__(self, **local_kw) -> Session:
+        local_kw.setdefault("bind", get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = LazySessionmaker(
+    autoflush=False,
+    autocommit=False,
+    future=True
+)
 
 
-# Initialize database session at application startup
-SessionLocal, engine = setup_database()
+# Re-apply the caller's API token for RLS whenever a session starts a new transaction,
+# so sessions that commit (and release their connection) keep their identity.
+@event.listens_for(SessionLocal, "after_begin")
+def apply_rls_token(session, transaction, connection):
+    token = session.info.get("api_token")
+    if token:
+        connection.execute(text("SELECT set_config('app.current_token', :token, true)"), {"token": token})
 
 
 def get_db() -> Generator:
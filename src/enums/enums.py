@@ -32,6 +32,12 @@ class VersionStatus(str, Enum):
     rejected = "rejected"
 
 
+class ResolvePolicy(str, Enum):
+    latest = "latest"
+    review = "review"
+    approved = "approved"
+
+
 class TaskStatus(str, Enum):
     WIP = "WIP"
     READY = "READY"
@@ -40,6 +46,7 @@ class TaskStatus(str, Enum):
 
 
 class RenderJobStatus(str, Enum):
+    blocked = "blocked"
     queued = "queued"
     running = "running"
     succeeded = "succeeded"
@@ -1,19 +1,37 @@
-﻿import os
+﻿import asyncio
+import os
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 from starlette.templating import Jinja2Templates
 from app.config import settings
 from api.routes.system import router as system_router
-from api.routes import router as api_router
-from db.db import engine
-from app.logging_config import setup_logging, get_logger
+from api.routes import router as api_router, ws_router
+from db.db import get_engine, dispose_engine
+from app.logging_config import setup_logging, shutdown_logging, get_logger
 from app.exceptions import handle_slate_runner_exception, SlateRunnerException
-from app.middleware import RateLimitMiddleware, SecurityHeadersMiddleware, RequestLoggingMiddleware
+from app.middleware import install_middleware
+from services.notify_service import PgListener
+from services.event_ingest_service import event_ingest_queue
+from services.event_retention_service import event_retention_loop
+from services.metrics_service import metrics_flush_loop, retire_metrics
+from api.controllers.resolve_controller import invalidate_resolve_cache
+
+
+# Clear the resolver cache whenever any worker changes a task, version or publish
+async def resolve_cache_invalidator(listener: PgListener):
+    subscription = listener.subscribe(
+        "entity_changes", lambda change: change.get("table") in {"tasks", "versions", "publishes"}
+    )
+    try:
+        while True:
+            await subscription.get()
+            invalidate_resolve_cache()
+    finally:
+        listener.unsubscribe(subscription)
 
 
 @asynccontextmanager
@@ -24,20 +42,54 @@ async def lifespan(api: FastAPI):
 
     api.state.started_at = datetime.now(timezone.utc)
     api.state.settings = settings
-    logger.info(f"{settings.SERVICE} booting up...")
+    logger.info("%s booting up...", settings.SERVICE)
 
     # Get DB connection up and ready.
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             logger.info("database ready...")
     except Exception as e:
-        logger.error(f"database connection failed on startup: {e}")
+        logger.error("database connection failed on startup: %s", e)
+
+    # Single LISTEN connection per worker for push notifications
+    api.state.pg_listener = None
+    if settings.NOTIFY_ENABLED:
+        listener = PgListener(["render_jobs", "entity_changes"])
+        try:
+            await listener.start()
+            api.state.pg_listener = listener
+        except Exception as e:
+            logger.error("notification listener failed on startup: %s", e)
+
+    invalidator_task = None
+    if api.state.pg_listener:
+        invalidator_task = asyncio.create_task(resolve_cache_invalidator(api.state.pg_listener))
+
+    # Background writer for fire-and-forget event ingestion
+    event_ingest_queue.start()
+
+    # Monthly events partitions: create ahead, archive expired
+    retention_task = asyncio.create_task(event_retention_loop()) if settings.EVENT_RETENTION_ENABLED else None
+
+    # Publish this worker's metrics for multi-worker scrapes
+    metrics_task = asyncio.create_task(metrics_flush_loop()) if settings.METRICS_MULTIPROC_DIR else None
 
     try:
         yield
     finally:
-        engine.dispose()
-        logger.info(f"{settings.SERVICE} shutting down...")
+        if metrics_task:
+            metrics_task.cancel()
+            retire_metrics()
+        if retention_task:
+            retention_task.cancel()
+        if invalidator_task:
+            invalidator_task.cancel()
+        event_ingest_queue.stop()
+        if api.state.pg_listener:
+            await api.state.pg_listener.stop()
+        dispose_engine()
+        logger.info("%s shutting down...", settings.SERVICE)
+        shutdown_logging()
 
 
 # Init FastAPI
@@ -50,16 +102,7 @@ def create_app() -> FastAPI:
     )
 
     # Add middleware in order
-    api.add_middleware(SecurityHeadersMiddleware)
-    api.add_middleware(RequestLoggingMiddleware)
-    api.add_middleware(RateLimitMiddleware)
-    api.add_middleware(
-        CORSMiddleware,
-        allow_origins=settings.CORS_ORIGINS,
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    install_middleware(api)
 
     templates = Jinja2Templates(directory=os.path.join(os.path.dirname(__file__), "public"))
 
@@ -107,6 +150,7 @@ def create_app() -> FastAPI:
     # Include API routes
     api.include_router(system_router, prefix="/api")
     api.include_router(api_router, prefix="/api/v1")
+    api.include_router(ws_router, prefix="/api/v1", tags=["changes"])
     return api
 
 
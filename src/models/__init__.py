@@ -3,3 +3,8 @@
 
 class Base(DeclarativeBase):
     pass
+
+
+# Register every mapped class, so string relationship targets (e.g. "Version") resolve
+# whichever model module is imported first
+from models import api_keys, asset, event, idempotency_key, project, publish, render, shot, task, version  # noqa: E402,F401
@@ -1,10 +1,13 @@
 ﻿from datetime import datetime
-from typing import Optional
-from sqlalchemy import Integer, String, ForeignKey, TIMESTAMP, func, UniqueConstraint, Enum
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional, TYPE_CHECKING
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, TIMESTAMP, func, UniqueConstraint, Enum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from models import Base
 from enums.enums import AssetType
 
+if TYPE_CHECKING:
+    from models.task import Task
+
 
 class Asset(Base):
     __tablename__ = "assets"
@@ -16,4 +19,13 @@ class Asset(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
     __table_args__ = (UniqueConstraint("project_uid", "name", name="uq_asset_project_name"),)
+
+    # Read-only, live rows only; must be eager loaded (see utils.include)
+    tasks: Mapped[list["Task"]] = relationship(
+        primaryjoin="and_(Asset.uid == foreign(Task.parent_uid), Task.parent_type == 'asset', Task.deleted_at.is_(None))",
+        order_by="Task.name",
+        viewonly=True,
+        lazy="raise",
+    )
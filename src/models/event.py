@@ -1,18 +1,23 @@
 ﻿from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlalchemy import Integer, String, ForeignKey, TIMESTAMP, func
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, TIMESTAMP, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from models import Base
 
 
 class Event(Base):
+    # Range-partitioned by created_at, which is therefore part of the primary key
+    # uid is kept globally unique by the event_uids registry (sql/018_event_uids.sql)
     __tablename__ = "events"
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    uid: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    uid: Mapped[str] = mapped_column(String, index=True, nullable=False)
     project_uid: Mapped[Optional[str]] = mapped_column(ForeignKey("projects.uid", ondelete="CASCADE"), nullable=False)
     kind: Mapped[str] = mapped_column(String, nullable=False)
     payload: Mapped[Dict[str, Any]] = mapped_column(JSONB, default=dict, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
@@ -1,5 +1,5 @@
 ﻿from datetime import datetime
-from sqlalchemy import Integer, String, TIMESTAMP, func
+from sqlalchemy import BigInteger, Integer, String, TIMESTAMP, func
 from sqlalchemy.orm import Mapped, mapped_column
 from models import Base
 
@@ -12,3 +12,4 @@ class Project(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
@@ -1,6 +1,6 @@
 ﻿from datetime import datetime
 from typing import Optional
-from sqlalchemy import Integer, String, ForeignKey, Text, TIMESTAMP, func, Enum
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, Text, TIMESTAMP, func, Enum
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from models import Base
@@ -20,3 +20,4 @@ class Publish(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
@@ -1,6 +1,6 @@
 ﻿from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlalchemy import Integer, String, ForeignKey, Text, TIMESTAMP, func, CheckConstraint, Enum
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, Text, TIMESTAMP, func, CheckConstraint, Enum
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from models import Base
@@ -20,3 +20,14 @@ class RenderJob(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+
+
+class RenderJobDependency(Base):
+    __tablename__ = "render_job_dependencies"
+    job_uid: Mapped[str] = mapped_column(ForeignKey("render_jobs.uid", ondelete="CASCADE"), primary_key=True)
+    depends_on_uid: Mapped[str] = mapped_column(
+        ForeignKey("render_jobs.uid", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    __table_args__ = (CheckConstraint("job_uid <> depends_on_uid", name="ck_render_job_dependency_self"),)
@@ -1,9 +1,12 @@
 ﻿from datetime import datetime
-from typing import Optional
-from sqlalchemy import Integer, String, ForeignKey, TIMESTAMP, func, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional, TYPE_CHECKING
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, TIMESTAMP, func, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from models import Base
 
+if TYPE_CHECKING:
+    from models.task import Task
+
 
 class Shot(Base):
     __tablename__ = "shots"
@@ -19,4 +22,13 @@ class Shot(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
     __table_args__ = (UniqueConstraint("project_uid", "seq", "shot", name="uq_shot_code"),)
+
+    # Read-only, live rows only; must be eager loaded (see utils.include)
+    tasks: Mapped[list["Task"]] = relationship(
+        primaryjoin="and_(Shot.uid == foreign(Task.parent_uid), Task.parent_type == 'shot', Task.deleted_at.is_(None))",
+        order_by="Task.name",
+        viewonly=True,
+        lazy="raise",
+    )
@@ -1,10 +1,13 @@
 ﻿from datetime import datetime
-from typing import Optional
-from sqlalchemy import Integer, String, ForeignKey, TIMESTAMP, func, CheckConstraint, Enum
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional, TYPE_CHECKING
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, TIMESTAMP, func, CheckConstraint, Enum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from models import Base
 from enums.enums import ParentType, TaskStatus
 
+if TYPE_CHECKING:
+    from models.version import Version
+
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -19,3 +22,20 @@ class Task(Base):
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
+
+    # Read-only, live rows only; must be eager loaded (see utils.include)
+    versions: Mapped[list["Version"]] = relationship(
+        primaryjoin="and_(Task.uid == foreign(Version.task_uid), Version.deleted_at.is_(None))",
+        order_by="Version.vnum",
+        viewonly=True,
+        lazy="raise",
+    )
+
+
+class TaskVersionState(Base):
+    __tablename__ = "task_version_state"
+    task_uid: Mapped[str] = mapped_column(ForeignKey("tasks.uid", ondelete="CASCADE"), primary_key=True)
+    last_vnum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latest_version_uid: Mapped[Optional[str]] = mapped_column(ForeignKey("versions.uid", ondelete="SET NULL"), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
@@ -1,10 +1,13 @@
 ﻿from datetime import datetime
-from typing import Optional
-from sqlalchemy import Integer, String, ForeignKey, TIMESTAMP, func, UniqueConstraint, Enum
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional, TYPE_CHECKING
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, TIMESTAMP, func, UniqueConstraint, Enum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from models import Base
 from enums.enums import VersionStatus
 
+if TYPE_CHECKING:
+    from models.publish import Publish
+
 
 class Version(Base):
     __tablename__ = "versions"
@@ -28,5 +31,14 @@ class Version(Base):
         TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
     deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default="0", nullable=False)
 
     __table_args__ = (UniqueConstraint("task_uid", "vnum", name="uq_version_per_task"),)
+
+    # Read-only, live rows only; must be eager loaded (see utils.include)
+    publishes: Mapped[list["Publish"]] = relationship(
+        primaryjoin="and_(Version.uid == foreign(Publish.version_uid), Publish.deleted_at.is_(None))",
+        order_by="Publish.created_at",
+        viewonly=True,
+        lazy="raise",
+    )
@@ -1,11 +1,13 @@
 ﻿from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enums.enums import AssetType
+from schemas.include import IncludeMixin
+from schemas.task import TaskOut
 from utils.validation import normalize_input
 
 
-class AssetOut(BaseModel):
+class AssetOut(IncludeMixin):
     model_config = ConfigDict(from_attributes=True)
     uid: str
     project_uid: Optional[str] = None
@@ -13,6 +15,7 @@ class AssetOut(BaseModel):
     type: Optional[AssetType]
     created_at: datetime
     updated_at: datetime
+    tasks: Optional[List[TaskOut]] = None
 
 
 class AssetCreate(BaseModel):
@@ -0,0 +1,46 @@
+from typing import Generic, TypeVar, Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+T = TypeVar("T")
+
+
+class BatchGetRequest(BaseModel):
+    uids: List[str] = Field(..., min_length=1, max_length=1000, description="UIDs to fetch, in the order wanted back")
+
+
+class BatchGetResponse(BaseModel, Generic[T]):
+    """Records fetched by UID in request order, plus the UIDs that were not found."""
+    status: str = Field(default="success", description="Response status")
+    message: str = Field(..., description="Response message")
+    data: list[T] = Field(..., description="Found records in request order")
+    missing: list[str] = Field(..., description="Requested UIDs with no live record")
+
+
+def create_batch_response(items: list[Any], missing: list[str], message: str = "Retrieved successfully") -> dict:
+    """Helper to create batch get response dict."""
+    return {
+        "status": "success",
+        "message": message,
+        "data": items,
+        "missing": missing
+    }
+
+
+class BatchOperation(BaseModel):
+    op: str = Field(..., description="Controller operation, e.g. create_version, update_task, delete_publish")
+    ref: Optional[str] = Field(None, pattern=r"^[A-Za-z_][A-Za-z0-9_]*$", description="Name for back-references ($ref.field)")
+    uid: Optional[str] = Field(None, description="Target UID or name for update/delete operations")
+    args: Dict[str, Any] = Field(default_factory=dict, description="Operation body; strings like $ref.field are substituted")
+
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=100)
+
+
+class BatchOperationResult(BaseModel):
+    index: int
+    op: str
+    ref: Optional[str] = None
+    message: str
+    data: Optional[Dict[str, Any]] = None
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Optional, Dict, Any, Literal
+from pydantic import BaseModel, Field
+
+
+class ChangeOut(BaseModel):
+    entity: str
+    uid: str
+    op: Literal["upsert", "delete"]
+    changed_at: datetime  # updated_at (transaction start time), not the order of the feed
+    data: Optional[Dict[str, Any]] = None
+
+
+class ChangesResponse(BaseModel):
+    """Delta-sync response with the watermark for the next request."""
+    status: str = Field(default="success", description="Response status")
+    message: str = Field(..., description="Response message")
+    data: list[ChangeOut] = Field(..., description="Changes ordered by writing transaction id, then entity and id")
+    next_token: str = Field(..., description="Pass as `since` on the next request")
+    has_more: bool = Field(..., description="More changes are available immediately")
@@ -1,6 +1,6 @@
 ﻿from datetime import datetime
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, ConfigDict, field_validator
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class EventOut(BaseModel):
@@ -30,3 +30,24 @@ class EventUpdate(BaseModel):
     uid: Optional[str] = None
     kind: Optional[str] = None
     payload: Optional[Dict[str, Any]] = None
+
+
+class EventBatchCreate(BaseModel):
+    events: List[EventCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class EventBatchOut(BaseModel):
+    accepted: int
+    dropped: int = 0
+    skipped: int = 0  # UIDs that already existed
+    uids: List[str] = []
+
+
+class EventQueueStats(BaseModel):
+    running: bool
+    depth: int
+    capacity: int
+    enqueued: int
+    dropped: int
+    flushed: int
+    failed: int
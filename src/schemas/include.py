@@ -0,0 +1,23 @@
+from typing import Any
+from pydantic import BaseModel, model_validator
+from sqlalchemy import inspect
+
+
+class IncludeMixin(BaseModel):
+    """Output schema base that leaves relationships unset unless they were eager loaded,
+    so lazy="raise" relationships are never touched and `exclude_unset` drops them."""
+
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded_relationships(cls, data: Any) -> Any:
+        state = inspect(data, raiseerr=False)
+        if state is None or not hasattr(state, "mapper"):
+            return data
+
+        relationships = state.mapper.relationships.keys()
+        unloaded = state.unloaded
+        return {
+            name: getattr(data, name)
+            for name in cls.model_fields
+            if not (name in relationships and name in unloaded) and hasattr(data, name)
+        }
@@ -27,7 +27,9 @@ class PaginatedResponse(BaseModel, Generic[T]):
         )
 
 
-def create_paginated_response(items: list[Any], count: int, limit: int, offset: int, message: str = "Retrieved successfully") -> dict:
+def create_paginated_response(
+        items: list[Any], count: int, limit: int, offset: int, message: str = "Retrieved successfully"
+) -> dict:
     """Helper to create paginated response dict."""
     return {
         "status": "success",
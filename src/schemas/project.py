@@ -1,6 +1,7 @@
 ﻿from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, Field, field_validator
+from enums.enums import TaskStatus, VersionStatus
 
 
 class ProjectOut(BaseModel):
@@ -38,3 +39,29 @@ class ProjectOverviewOut(BaseModel):
     name: str
     counts: ProjectCounts
     created_at: datetime
+
+
+class DashboardVersion(BaseModel):
+    uid: str
+    vnum: int
+    status: VersionStatus
+    created_by: Optional[str] = None
+    created_at: datetime
+
+
+class DashboardTask(BaseModel):
+    uid: str
+    name: str
+    assignee: Optional[str] = None
+    status: TaskStatus
+    latest_version: Optional[DashboardVersion] = None
+
+
+class DashboardShot(BaseModel):
+    """One shot per NDJSON line of the project dashboard stream."""
+    uid: str
+    seq: str
+    shot: str
+    frame_in: int
+    frame_out: int
+    tasks: List[DashboardTask] = []
@@ -1,5 +1,5 @@
 ﻿from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, ConfigDict
 from enums.enums import RenderJobStatus
 
@@ -23,6 +23,7 @@ class RenderJobCreate(BaseModel):
     context: Dict[str, Any]
     adapter: str
     status: RenderJobStatus = RenderJobStatus.queued
+    depends_on: Optional[List[str]] = None
 
 
 class RenderJobUpdate(BaseModel):
@@ -0,0 +1,21 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from enums.enums import PublishType, Representation, ResolvePolicy
+from schemas.publish import PublishOut
+
+
+class ResolveRef(BaseModel):
+    entity: str
+    type: PublishType
+    representation: Optional[Representation] = None
+    policy: ResolvePolicy = ResolvePolicy.approved
+    task: Optional[str] = None
+
+
+class ResolveBatchRequest(BaseModel):
+    refs: List[ResolveRef] = Field(..., min_length=1, max_length=1000)
+
+
+class ResolveResult(ResolveRef):
+    found: bool
+    publish: Optional[PublishOut] = None
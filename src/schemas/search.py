@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    entity: str
+    uid: str
+    label: str
+    project_uid: Optional[str] = None
+    score: float
@@ -1,10 +1,12 @@
 ﻿import re
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator, ConfigDict
+from schemas.include import IncludeMixin
+from schemas.task import TaskOut
 
 
-class ShotOut(BaseModel):
+class ShotOut(IncludeMixin):
     model_config = ConfigDict(from_attributes=True)
     uid: str
     project_uid: Optional[str] = None
@@ -16,6 +18,7 @@ class ShotOut(BaseModel):
     colorspace: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    tasks: Optional[List[TaskOut]] = None
 
 
 class ShotCreate(BaseModel):
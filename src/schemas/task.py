@@ -1,10 +1,12 @@
 ﻿from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enums.enums import ParentType, TaskStatus
+from schemas.include import IncludeMixin
+from schemas.version import VersionOut
 
 
-class TaskOut(BaseModel):
+class TaskOut(IncludeMixin):
     model_config = ConfigDict(from_attributes=True)
     uid: str
     project_uid: Optional[str] = None
@@ -15,6 +17,7 @@ class TaskOut(BaseModel):
     status: TaskStatus
     created_at: datetime
     updated_at: datetime
+    versions: Optional[List[VersionOut]] = None
 
 
 class TaskCreate(BaseModel):
@@ -1,10 +1,12 @@
 ﻿from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, ConfigDict
 from enums.enums import VersionStatus
+from schemas.include import IncludeMixin
+from schemas.publish import PublishOut
 
 
-class VersionOut(BaseModel):
+class VersionOut(IncludeMixin):
     model_config = ConfigDict(from_attributes=True)
     uid: str
     project_uid: Optional[str] = None
@@ -14,6 +16,7 @@ class VersionOut(BaseModel):
     created_by: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    publishes: Optional[List[PublishOut]] = None
 
 
 class VersionCreate(BaseModel):
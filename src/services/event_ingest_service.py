@@ -0,0 +1,160 @@
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.logging_config import get_logger
+from db.db import SessionLocal
+from models.event import Event
+from models.project import Project
+
+logger = get_logger(__name__)
+
+# Roles allowed to write events by events_write_policy
+EVENT_WRITER_ROLES = ("admin", "td", "system")
+
+
+class EventIngestQueue:
+    """Bounded in-process queue of events flushed by a background writer with multi-row inserts"""
+
+    def __init__(self, maxsize: int, batch_size: int, flush_interval_ms: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background writer thread"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="event-ingest", daemon=True)
+        self._thread.start()
+        logger.info("event ingest writer started...")
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the writer after flushing whatever is still queued"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def enqueue(self, rows: List[Dict[str, Any]], token: Optional[str]) -> tuple[int, int]:
+        """Queue event rows without blocking, returns (accepted, dropped)"""
+        accepted = 0
+        for row in rows:
+            try:
+                self._queue.put_nowait((token, row))
+                accepted += 1
+            except queue.Full:
+                break
+
+        dropped = len(rows) - accepted
+        with self._lock:
+            self.enqueued += accepted
+            self.dropped += dropped
+        if dropped:
+            logger.warning("event ingest queue full, dropped %s events", dropped)
+        return accepted, dropped
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and counters"""
+        with self._lock:
+            return {
+                "running": self.running,
+                "depth": self._queue.qsize(),
+                "capacity": self._queue.maxsize,
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "flushed": self.flushed,
+                "failed": self.failed,
+            }
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+
+    def _collect(self) -> list:
+        """Gather up to batch_size events, waiting at most flush_interval for the batch to fill"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: list):
+        # Group by caller token so RLS is evaluated as the original caller
+        by_token: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+        for token, row in batch:
+            by_token[token].append(row)
+
+        for token, rows in by_token.items():
+            try:
+                written = write_events(rows, token)
+                with self._lock:
+                    self.flushed += written
+                    self.failed += len(rows) - written
+            except Exception as e:
+                logger.error("event ingest flush of %s events failed: %s", len(rows), e)
+                with self._lock:
+                    self.failed += len(rows)
+
+
+def insert_events(db: Session, rows: List[Dict[str, Any]]) -> List[str]:
+    """Insert event rows in one statement and return the UIDs written
+
+    Rows whose UID is already taken are skipped by the event_uids registry (sql/018), so a
+    client retrying a batch with its own UIDs never duplicates events or fails the rest of
+    the batch, even when the retries run concurrently.
+    """
+    return list(db.scalars(insert(Event).returning(Event.uid), rows))
+
+
+def can_write_events(db: Session) -> bool:
+    """Whether the session's API token passes events_write_policy (sql/007)"""
+    return bool(db.scalar(select(
+        and_(func.is_valid_api_token(), or_(*(func.has_role(role) for role in EVENT_WRITER_ROLES)))
+    )))
+
+
+def write_events(rows: List[Dict[str, Any]], token: Optional[str]) -> int:
+    """Insert event rows in one statement, skipping rows whose project no longer exists"""
+    with SessionLocal() as db:
+        db.info["api_token"] = token
+        project_uids = {row["project_uid"] for row in rows}
+        existing = set(db.scalars(select(Project.uid).where(Project.uid.in_(project_uids))))
+        valid = [row for row in rows if row["project_uid"] in existing]
+        if not valid:
+            return 0
+        written = insert_events(db, valid)
+        db.commit()
+        return len(written)
+
+
+# Create global event ingest queue instance
+event_ingest_queue = EventIngestQueue(
+    maxsize=settings.EVENT_QUEUE_SIZE,
+    batch_size=settings.EVENT_FLUSH_BATCH_SIZE,
+    flush_interval_ms=settings.EVENT_FLUSH_INTERVAL_MS,
+)
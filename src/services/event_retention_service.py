@@ -0,0 +1,144 @@
+import asyncio
+import gzip
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List
+from sqlalchemy import text
+from app.config import settings
+from app.logging_config import get_logger
+from db.db import get_engine
+
+logger = get_logger(__name__)
+
+# Arbitrary constant so only one worker runs maintenance at a time
+RETENTION_LOCK_ID = 7_031_001
+PARTITION_NAME = re.compile(r"^events_y(\d{4})m(\d{2})$")
+
+
+def _months_before(today: date, months: int) -> date:
+    """First day of the month `months` before today's month"""
+    index = today.year * 12 + (today.month - 1) - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def ensure_future_partitions(months_ahead: int = None) -> int:
+    """Create monthly events partitions up to N months ahead"""
+    with get_engine().begin() as conn:
+        created = conn.execute(
+            text("SELECT ensure_event_partitions(:months)"),
+            {"months": months_ahead or settings.EVENT_PARTITIONS_AHEAD}
+        ).scalar()
+    if created:
+        logger.info("created %s events partitions", created)
+    return created or 0
+
+
+def list_expired_partitions(retain_months: int = None) -> List[str]:
+    """Monthly partitions that end before the retention cutoff, oldest first
+
+    Also returns monthly tables that are no longer attached to events (left behind by an
+    interrupted archive run) so they are archived on the next run.
+    """
+    cutoff = _months_before(date.today(), retain_months or settings.EVENT_RETENTION_MONTHS)
+    with get_engine().connect() as conn:
+        names = conn.execute(text("""
+            SELECT c.relname FROM pg_class c
+            WHERE c.relkind = 'r'
+              AND c.relnamespace = 'public'::regnamespace
+              AND c.relname LIKE 'events\\_y%'
+              AND NOT EXISTS (
+                SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid AND i.inhparent <> 'events'::regclass
+              )
+        """)).scalars().all()
+
+    expired = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match and date(int(match[1]), int(match[2]), 1) < cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def archive_partition(name: str, archive_dir: Path) -> Dict[str, Any]:
+    """Detach a partition, dump it to a gzip'd CSV file, then drop it
+
+    The detach is committed on its own first: it locks events before the partition, so
+    holding any lock on the partition while it waits for events could deadlock with
+    writers. A partition detached by an interrupted run is picked up again as an orphan.
+    The file is written under a temporary name and only renamed once the drop has
+    committed; any failure before that rolls back and leaves the table for the next run.
+    """
+    if not PARTITION_NAME.match(name):
+        raise ValueError(f"Not an events partition: {name}")
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    target = archive_dir / f"{name}.csv.gz"
+    partial = archive_dir / f"{name}.csv.gz.partial"
+
+    raw = get_engine().raw_connection()
+    try:
+        with raw.cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_inherits WHERE inhrelid = %s::regclass", (f'"{name}"',))
+            if cur.fetchone():
+                cur.execute(f'ALTER TABLE events DETACH PARTITION "{name}"')
+        raw.commit()
+
+        with raw.cursor() as cur:
+            # Detached, so nothing else touches it; take the lock DROP needs up front
+            cur.execute(f'LOCK TABLE "{name}" IN ACCESS EXCLUSIVE MODE')
+            with gzip.open(partial, "wt", encoding="utf-8") as fh:
+                cur.copy_expert(f'COPY "{name}" TO STDOUT WITH (FORMAT csv, HEADER true)', fh)
+            with open(partial, "rb") as fh:
+                os.fsync(fh.fileno())
+
+            cur.execute(f'SELECT count(*) FROM "{name}"')
+            rows = cur.fetchone()[0]
+            # Archived events no longer hold their UIDs (sql/018_event_uids.sql)
+            cur.execute(f'DELETE FROM event_uids WHERE uid IN (SELECT uid FROM "{name}")')
+            cur.execute(f'DROP TABLE "{name}"')
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        raw.close()
+
+    os.replace(partial, target)
+    logger.info("archived events partition %s (%s rows) to %s", name, rows, target)
+    return {"partition": name, "rows": rows, "file": str(target)}
+
+
+def run_event_retention() -> Dict[str, Any]:
+    """Create future partitions and archive expired ones (single runner via advisory lock)"""
+    with get_engine().connect() as lock_conn:
+        if not lock_conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": RETENTION_LOCK_ID}).scalar():
+            return {"skipped": True}
+        try:
+            created = ensure_future_partitions()
+            archived = [
+                archive_partition(name, Path(settings.EVENT_ARCHIVE_DIR))
+                for name in list_expired_partitions()
+            ]
+            return {"skipped": False, "created": created, "archived": archived}
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": RETENTION_LOCK_ID})
+
+
+async def event_retention_loop():
+    """Run partition maintenance on startup and then every EVENT_RETENTION_INTERVAL_HOURS"""
+    while True:
+        try:
+            await asyncio.to_thread(run_event_retention)
+        except Exception as e:
+            logger.error("event retention failed: %s", e)
+        await asyncio.sleep(settings.EVENT_RETENTION_INTERVAL_HOURS * 3600)
+
+
+if __name__ == "__main__":
+    from app.logging_config import setup_logging
+
+    setup_logging()
+    logger.info("event retention result: %s", run_event_retention())
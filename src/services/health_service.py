@@ -1,29 +1,54 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from sqlalchemy import text
-from db.db import engine
+from db.db import get_engine
 from app.config import settings
-from app.logging_config import get_logger
+from app.logging_config import get_logger, LOGS_DIR
 
 logger = get_logger(__name__)
 
 
 class HealthChecker:
-    """Comprehensive health check system"""
+    """Comprehensive health check system
 
-    def __init__(self):
-        self.checks: List[Dict[str, Any]] = []
+    Checks run concurrently, each bounded by its own timeout, and the combined result is
+    cached for HEALTH_CACHE_SECONDS so frequent monitor/load balancer polling does not
+    turn into a stream of DB round trips. Only one run happens at a time per worker.
+    """
 
-    def add_check(self, name: str, check_func, critical: bool = True):
+    def __init__(self, cache_seconds: float = 5.0, default_timeout: float = 2.0):
+        self.checks: List[Dict[str, Any]] = []
+        self.cache_seconds = cache_seconds
+        self.default_timeout = default_timeout
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def add_check(self, name: str, check_func, critical: bool = True, timeout: float = None):
         """Add a health check function"""
         self.checks.append({
             "name": name,
             "function": check_func,
-            "critical": critical
+            "critical": critical,
+            "timeout": timeout or self.default_timeout,
         })
 
+    def get_status(self) -> Dict[str, Any]:
+        """Cached result of run_checks(); concurrent callers share a single run"""
+        if self._cached is not None and time.monotonic() - self._cached_at < self.cache_seconds:
+            return self._cached
+        with self._lock:
+            if self._cached is None or time.monotonic() - self._cached_at >= self.cache_seconds:
+                self._cached = self.run_checks()
+                self._cached_at = time.monotonic()
+            return self._cached
+
     def run_checks(self) -> Dict[str, Any]:
-        """Run all health checks and return status"""
+        """Run all health checks concurrently and return status"""
         results = {
             "status": "healthy",
             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -32,20 +57,28 @@ class HealthChecker:
             "checks": {}
         }
 
+        # Threads outlive a timed-out check, so size the pool for one hung run plus a fresh one
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2 * len(self.checks), thread_name_prefix="health-check")
+
+        started = time.monotonic()
+        futures = [(check, self._executor.submit(check["function"])) for check in self.checks]
         all_healthy = True
 
-        for check in self.checks:
+        for check, future in futures:
+            remaining = max(check["timeout"] - (time.monotonic() - started), 0)
             try:
-                check_result = check["function"]()
+                check_result = future.result(timeout=remaining)
                 results["checks"][check["name"]] = {
                     "status": "healthy",
                     "details": check_result
                 }
             except Exception as e:
-                logger.error(f"Health check '{check['name']}' failed: {e}")
+                error = str(e) if future.done() else f"timed out after {check['timeout']}s"
+                logger.error("Health check '%s' failed: %s", check['name'], error)
                 results["checks"][check["name"]] = {
                     "status": "unhealthy",
-                    "error": str(e)
+                    "error": error
                 }
 
                 if check["critical"]:
@@ -56,20 +89,18 @@ class HealthChecker:
 
 
 def check_database() -> Dict[str, Any]:
-    """Check database connectivity and basic operations"""
+    """Check database connectivity and basic operations (one round trip)"""
     try:
-        with engine.connect() as conn:
-            # Test basic connectivity
-            result = conn.execute(text("SELECT 1")).scalar()
-
-            # Test database version
-            version_result = conn.execute(text("SELECT version()")).scalar()
-
-            # Test table existence
-            tables_result = conn.execute(text("""
-                SELECT COUNT(*) FROM information_schema.tables 
-                WHERE table_schema = 'public'
-            """)).scalar()
+        with get_engine().connect() as conn:
+            # Keep a slow server from holding the check (and a pool connection) past its timeout
+            conn.execute(
+                text("SELECT set_config('statement_timeout', :ms, true)"),
+                {"ms": str(int(settings.HEALTH_CHECK_TIMEOUT * 1000))}
+            )
+            version_result, tables_result = conn.execute(text("""
+                SELECT version(),
+                       (SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = 'public')
+            """)).one()
 
             return {
                 "connected": True,
@@ -80,15 +111,53 @@ def check_database() -> Dict[str, Any]:
         raise Exception(f"Database check failed: {e}")
 
 
+def check_db_pool() -> Dict[str, Any]:
+    """Check connection pool saturation (no DB access)"""
+    pool = get_engine().pool
+    capacity = sum(settings.db_pool_limits())
+    checked_out = pool.checkedout()
+    saturation = round(checked_out / capacity, 3) if capacity else 0.0
+    details = {"checked_out": checked_out, "capacity": capacity, "saturation": saturation}
+    if saturation >= settings.HEALTH_POOL_SATURATION_MAX:
+        raise Exception(f"DB pool saturated: {details}")
+    return details
+
+
+def check_replica_lag() -> Dict[str, Any]:
+    """Check replication lag (replay delay on a standby, or the slowest standby seen from the primary)"""
+    try:
+        with get_engine().connect() as conn:
+            in_recovery = conn.execute(text("SELECT pg_is_in_recovery()")).scalar()
+            if in_recovery:
+                lag = conn.execute(text(
+                    "SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+                )).scalar()
+                replicas = None
+            else:
+                replicas, lag = conn.execute(text(
+                    "SELECT count(*), max(EXTRACT(EPOCH FROM replay_lag)) FROM pg_stat_replication"
+                )).one()
+    except Exception as e:
+        raise Exception(f"Replica lag check failed: {e}")
+
+    details = {
+        "role": "standby" if in_recovery else "primary",
+        "replicas": replicas,
+        "lag_seconds": round(float(lag), 3) if lag is not None else None,
+    }
+    if lag is not None and lag > settings.HEALTH_REPLICA_LAG_MAX_SECONDS:
+        raise Exception(f"Replication lag {details['lag_seconds']}s exceeds {settings.HEALTH_REPLICA_LAG_MAX_SECONDS}s")
+    return details
+
+
 def check_disk_space() -> Dict[str, Any]:
     """Check available disk space"""
     import shutil
 
     try:
         # Check space in logs directory
-        logs_path = settings.ROOT_DIR / "logs" if hasattr(settings, 'ROOT_DIR') else None
-        if logs_path and logs_path.exists():
-            total, used, free = shutil.disk_usage(logs_path)
+        if LOGS_DIR.exists():
+            total, used, free = shutil.disk_usage(LOGS_DIR)
             free_gb = free / (1024 ** 3)
 
             return {
@@ -147,15 +216,20 @@ def check_configuration() -> Dict[str, Any]:
 
 
 # Create global health checker instance
-health_checker = HealthChecker()
+health_checker = HealthChecker(
+    cache_seconds=settings.HEALTH_CACHE_SECONDS,
+    default_timeout=settings.HEALTH_CHECK_TIMEOUT,
+)
 
 # Add default checks
 health_checker.add_check("database", check_database, critical=True)
 health_checker.add_check("configuration", check_configuration, critical=True)
+health_checker.add_check("db_pool", check_db_pool, critical=False)
+health_checker.add_check("replica_lag", check_replica_lag, critical=False)
 health_checker.add_check("disk_space", check_disk_space, critical=False)
 health_checker.add_check("memory", check_memory, critical=False)
 
 
 def get_health_status() -> Dict[str, Any]:
-    """Get comprehensive health status"""
-    return health_checker.run_checks()
+    """Get comprehensive health status (cached for HEALTH_CACHE_SECONDS)"""
+    return health_checker.get_status()
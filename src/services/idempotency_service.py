@@ -0,0 +1,176 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy import select, delete, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+from app.config import settings
+from app.logging_config import get_logger
+from db.db import SessionLocal
+from models.idempotency_key import IdempotencyKey
+from services.metrics_service import track_cache
+from utils.cache import TTLCache
+
+logger = get_logger(__name__)
+
+# Expired keys are purged by whichever request notices first, at most this often per worker
+PURGE_INTERVAL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    content_type: Optional[str]
+    body: bytes
+
+
+class IdempotencyConflict(Exception):
+    """Key reused for a different request, or the first request is still running"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def token_scope(token: str) -> str:
+    """Keys are scoped per API token, stored as a hash rather than the token itself"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def request_fingerprint(method: str, path: str, query: str, body: bytes) -> str:
+    """Hash of everything that makes two requests the same request"""
+    digest = hashlib.sha256(f"{method} {path}?{query}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """Postgres-backed record of POST outcomes, fronted by a short per-worker hot cache"""
+
+    def __init__(self, ttl_hours: int, lease_seconds: int, hot_ttl: int, hot_size: int):
+        self.ttl = timedelta(hours=ttl_hours)
+        self.lease = timedelta(seconds=lease_seconds)
+        self.hot = TTLCache(maxsize=hot_size, ttl=hot_ttl)
+        self._last_purge = 0.0
+
+    def reserve(self, token: str, key: str, method: str, path: str, request_hash: str) -> Optional[StoredResponse]:
+        """Claim a key for a new request (returns None) or return the stored response for a repeat"""
+        scope = token_scope(token)
+        stored = self.hot.get((scope, key))
+        if stored is not None:
+            return self._check(stored, request_hash)
+
+        with SessionLocal() as db:
+            db.info["api_token"] = token
+            self._maybe_purge(db)
+
+            # Insert, or take over a key that expired but has not been purged yet, or whose
+            # first request died without finishing (lease ran out) and is now being retried
+            stmt = insert(IdempotencyKey).values(
+                scope=scope,
+                key=key,
+                method=method,
+                path=path,
+                request_hash=request_hash,
+                expires_at=func.now() + self.ttl,
+                locked_until=func.now() + self.lease,
+            )
+            claimed = db.scalar(
+                stmt.on_conflict_do_update(
+                    index_elements=[IdempotencyKey.scope, IdempotencyKey.key],
+                    set_={
+                        "method": stmt.excluded.method,
+                        "path": stmt.excluded.path,
+                        "request_hash": stmt.excluded.request_hash,
+                        "status_code": None,
+                        "content_type": None,
+                        "response_body": None,
+                        "created_at": func.now(),
+                        "expires_at": stmt.excluded.expires_at,
+                        "locked_until": stmt.excluded.locked_until,
+                    },
+                    where=or_(
+                        IdempotencyKey.expires_at < func.now(),
+                        and_(
+                            IdempotencyKey.status_code.is_(None),
+                            IdempotencyKey.locked_until < func.now(),
+                            IdempotencyKey.request_hash == stmt.excluded.request_hash,
+                        ),
+                    ),
+                ).returning(IdempotencyKey.key)
+            )
+            if claimed:
+                db.commit()
+                return None
+
+            row = db.scalar(
+                select(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            )
+
+        if row is None or row.status_code is None:
+            if row is not None and row.request_hash != request_hash:
+                raise IdempotencyConflict(422, "Idempotency-Key was already used for a different request.")
+            raise IdempotencyConflict(409, "A request with this Idempotency-Key is still being processed.")
+
+        stored = StoredResponse(row.request_hash, row.status_code, row.content_type, row.response_body or b"")
+        self.hot.set((scope, key), stored)
+        return self._check(stored, request_hash)
+
+    def complete(self, token: str, key: str, status_code: int, content_type: Optional[str], body: bytes):
+        """Record the outcome; server errors release the key so a retry runs again"""
+        if status_code >= 500:
+            self.release(token, key)
+            return
+
+        scope = token_scope(token)
+        with SessionLocal() as db:
+            db.info["api_token"] = token
+            row = db.get(IdempotencyKey, (scope, key))
+            if row is None:
+                return
+            row.status_code = status_code
+            row.content_type = content_type
+            row.response_body = body
+            row.locked_until = None
+            db.commit()
+            self.hot.set((scope, key), StoredResponse(row.request_hash, status_code, content_type, body))
+
+    def release(self, token: str, key: str):
+        """Forget an unfinished key"""
+        with SessionLocal() as db:
+            db.info["api_token"] = token
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.scope == token_scope(token),
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+            ))
+            db.commit()
+
+    @staticmethod
+    def _check(stored: StoredResponse, request_hash: str) -> StoredResponse:
+        if stored.request_hash != request_hash:
+            raise IdempotencyConflict(422, "Idempotency-Key was already used for a different request.")
+        return stored
+
+    def _maybe_purge(self, db):
+        now = time.monotonic()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        purged = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < func.now())).rowcount
+        db.commit()
+        if purged:
+            logger.info("purged %s expired idempotency keys", purged)
+
+
+# Create global idempotency store instance
+idempotency_store = IdempotencyStore(
+    ttl_hours=settings.IDEMPOTENCY_TTL_HOURS,
+    lease_seconds=settings.IDEMPOTENCY_LEASE_SECONDS,
+    hot_ttl=settings.IDEMPOTENCY_HOT_CACHE_SECONDS,
+    hot_size=settings.IDEMPOTENCY_HOT_CACHE_SIZE,
+)
+track_cache("idempotency", idempotency_store.hot)
@@ -0,0 +1,373 @@
+import asyncio
+import bisect
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from app.config import settings
+from app.logging_config import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: folding exited workers is not serialised
+    fcntl = None
+
+logger = get_logger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Accumulated counters and histograms of exited workers in METRICS_MULTIPROC_DIR
+DEAD_FILE = "dead.json"
+
+
+class Metric:
+    """Base for labelled metrics; values are keyed by the tuple of label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [[list(labels), self._copy(value)] for labels, value in self._values.items()]
+        return {"kind": self.kind, "help": self.documentation, "labels": list(self.labelnames), "values": values}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+
+class Counter(Metric):
+    """Monotonically increasing total"""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set_total(self, value: float, *labels: str):
+        """Mirror a total kept elsewhere (e.g. cache hit counters) at collection time"""
+        with self._lock:
+            self._values[labels] = float(value)
+
+
+class Gauge(Metric):
+    """Point-in-time value"""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = float(value)
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram; each label set stores [bucket counts..., sum, count]"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+    @staticmethod
+    def _copy(value):
+        return list(value)
+
+
+class MetricsRegistry:
+    """Per-worker metrics, rendered in the Prometheus text format.
+
+    With METRICS_MULTIPROC_DIR set, every worker writes its snapshot to `<dir>/<pid>.json`
+    and a scrape on any worker merges all files: counters and histograms are summed while
+    gauges are reported per live worker with a `pid` label. Files of exited workers (and
+    one left under a pid the OS has since reused) are folded into `dead.json` and removed,
+    so totals never go backwards and a scrape reads one file per live worker. Clear the
+    directory when the server starts.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+        self._pid = None
+        self._retired = False
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, collector: Callable[[], None]):
+        """Run `collector` before every snapshot (for values read on demand, e.g. pool state)"""
+        self.collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Any]:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning("metrics collector %s failed: %s", getattr(collector, "__name__", collector), e)
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    # Multi-worker aggregation
+
+    def flush(self):
+        """Write this worker's snapshot to the shared directory (atomic rename)"""
+        directory = settings.METRICS_MULTIPROC_DIR
+        if not directory or self._retired:
+            return
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        if self._pid != pid:
+            # A file under our pid was left by an exited worker whose pid has been reused
+            with _locked(path):
+                _fold(path, [path / f"{pid}.json"])
+            self._pid = pid
+        _write_json(path / f"{pid}.json", self.snapshot())
+
+    def retire(self):
+        """Fold this worker's final totals into dead.json (call on worker shutdown)"""
+        if not settings.METRICS_MULTIPROC_DIR:
+            return
+        self.flush()
+        path = Path(settings.METRICS_MULTIPROC_DIR)
+        with _locked(path):
+            _fold(path, [path / f"{os.getpid()}.json"])
+        # Anything flushed from here on would be counted a second time
+        self._retired = True
+
+    def _merged(self) -> Dict[str, Any]:
+        if not settings.METRICS_MULTIPROC_DIR:
+            return self.snapshot()
+
+        self.flush()
+        path = Path(settings.METRICS_MULTIPROC_DIR)
+        # Under the lock, so no file is read both before and after being folded into dead.json
+        with _locked(path):
+            workers = [file for file in path.glob("*.json") if file.stem.isdigit()]
+            exited = [file for file in workers if not _pid_alive(int(file.stem))]
+            if exited:
+                _fold(path, exited)
+            files = sorted(set(workers) - set(exited)) + [path / DEAD_FILE]
+            snapshots = [(file.stem, _read_json(file)) for file in files]
+
+        merged: Dict[str, Any] = {}
+        for pid, snapshot in snapshots:
+            if snapshot is None:
+                continue
+            for name, data in snapshot.items():
+                target = merged.setdefault(name, {**data, "values": {}})
+                if data["kind"] == "gauge":
+                    # Only live workers publish gauges; dead.json never holds any
+                    target["labels"] = list(data["labels"]) + ["pid"]
+                    for labels, value in data["values"]:
+                        target["values"][tuple(labels) + (pid,)] = value
+                    continue
+                _add_values(target["values"], data)
+        for data in merged.values():
+            data["values"] = [[list(labels), value] for labels, value in data["values"].items()]
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, data in self._merged().items():
+            lines.append(f"# HELP {name} {data['help']}")
+            lines.append(f"# TYPE {name} {data['kind']}")
+            for labels, value in data["values"]:
+                pairs = list(zip(data["labels"], labels))
+                if data["kind"] != "histogram":
+                    lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(data["buckets"]) + [math.inf], value[:-2]):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(pairs + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(pairs)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _add_values(values: Dict[Tuple[str, ...], Any], data: Dict[str, Any]):
+    """Sum a counter or histogram snapshot into `values`, keyed by label tuple"""
+    for labels, value in data["values"]:
+        key = tuple(labels)
+        current = values.get(key)
+        if current is None:
+            values[key] = value
+        elif data["kind"] == "histogram":
+            values[key] = [a + b for a, b in zip(current, value)]
+        else:
+            values[key] = current + value
+
+
+def _read_json(path: Path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked(directory: Path):
+    """Serialise dead.json updates across workers"""
+    with open(directory / ".lock", "a") as fh:
+        if fcntl:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        yield
+
+
+def _fold(directory: Path, files: List[Path]):
+    """Add the counters and histograms in `files` to dead.json, then delete the files
+
+    Callers hold _locked(directory).
+    """
+    # Another worker may have folded a file already
+    folded = [(file, snapshot) for file in files if (snapshot := _read_json(file)) is not None]
+    if not folded:
+        return
+    dead = {
+        name: {**data, "values": dict((tuple(labels), value) for labels, value in data["values"])}
+        for name, data in (_read_json(directory / DEAD_FILE) or {}).items()
+    }
+    for _, snapshot in folded:
+        for name, data in snapshot.items():
+            if data["kind"] != "gauge":
+                _add_values(dead.setdefault(name, {**data, "values": {}})["values"], data)
+    for data in dead.values():
+        data["values"] = [[list(labels), value] for labels, value in data["values"].items()]
+    # Written before the unlink: a crash in between double counts rather than losing totals
+    _write_json(directory / DEAD_FILE, dead)
+    for file, _ in folded:
+        file.unlink(missing_ok=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    escaped = (f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+metrics = MetricsRegistry()
+
+# HTTP
+http_requests_total = metrics.counter(
+    "slate_http_requests_total", "HTTP requests by method, route template and status", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics.histogram(
+    "slate_http_request_duration_seconds", "HTTP request latency by method and route template", ("method", "route")
+)
+rate_limit_rejections_total = metrics.counter(
+    "slate_rate_limit_rejections_total", "Requests rejected by the rate limiter", ("scope",)
+)
+
+# Database
+db_pool_checkout_seconds = metrics.histogram(
+    "slate_db_pool_checkout_seconds", "Time spent waiting for a pooled DB connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+db_pool_connections = metrics.gauge(
+    "slate_db_pool_connections", "DB pool connections by state", ("state",)
+)
+db_queries_total = metrics.counter("slate_db_queries_total", "SQL statements executed")
+
+# Caches
+cache_requests_total = metrics.counter("slate_cache_requests_total", "Cache lookups by result", ("cache", "result"))
+cache_hit_ratio = metrics.gauge("slate_cache_hit_ratio", "Cache hit ratio since worker start", ("cache",))
+
+
+def track_cache(name: str, cache) -> None:
+    """Export a utils.cache.TTLCache's hit/miss counters under `name`"""
+    def collect():
+        stats = cache.stats()
+        cache_requests_total.set_total(stats["hits"], name, "hit")
+        cache_requests_total.set_total(stats["misses"], name, "miss")
+        cache_hit_ratio.set(stats["hit_ratio"], name)
+
+    collect.__name__ = f"cache:{name}"
+    metrics.on_collect(collect)
+
+
+def render_metrics() -> str:
+    return metrics.render()
+
+
+def retire_metrics():
+    """Hand this worker's totals over to dead.json before it exits"""
+    try:
+        metrics.retire()
+    except Exception as e:
+        logger.warning("metrics retire failed: %s", e)
+
+
+async def metrics_flush_loop():
+    """Periodically publish this worker's snapshot for multi-worker scrapes"""
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+        try:
+            await asyncio.to_thread(metrics.flush)
+        except Exception as e:
+            logger.warning("metrics flush failed: %s", e)
@@ -0,0 +1,153 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Set
+from app.config import settings
+from app.logging_config import get_logger
+from utils.database import build_database_url
+
+logger = get_logger(__name__)
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+class Subscription:
+    """Bounded per-subscriber queue of notification payloads"""
+
+    def __init__(self, channel: str, predicate: Optional[Predicate] = None, maxsize: int = 100):
+        self.channel = channel
+        self.predicate = predicate
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, payload: Dict[str, Any]):
+        """Queue a payload without blocking, dropping the oldest one when full"""
+        if self.predicate and not self.predicate(payload):
+            return
+
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(payload)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait for the next payload, or return None on timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PgListener:
+    """One LISTEN connection per worker process that fans NOTIFY payloads out to subscribers"""
+
+    def __init__(self, channels: list[str]):
+        self.channels = channels
+        self.subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._conn = None
+        # fd registered with the loop; kept because a closed connection no longer reports it
+        self._fd: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.closed
+
+    async def start(self):
+        """Open the listener connection and register it with the event loop"""
+        self._loop = asyncio.get_running_loop()
+        self._closed = False
+        await self._loop.run_in_executor(None, self._connect)
+        self._fd = self._conn.fileno()
+        self._loop.add_reader(self._fd, self._on_readable)
+        logger.info("listening for notifications on: %s", ", ".join(self.channels))
+
+    async def stop(self):
+        """Unregister and close the listener connection"""
+        self._closed = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        self._disconnect()
+
+    def subscribe(self, channel: str, predicate: Optional[Predicate] = None, maxsize: int = 100) -> Subscription:
+        """Register a subscriber for a channel, optionally filtered by predicate"""
+        subscription = Subscription(channel, predicate, maxsize)
+        self.subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber"""
+        self.subscribers[subscription.channel].discard(subscription)
+
+    def _connect(self):
+        # Driver imported on first connect so importing routes does not load it
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        dsn = build_database_url(port=settings.DB_LISTEN_PORT).replace("+psycopg2", "")
+        conn = psycopg2.connect(dsn)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            for channel in self.channels:
+                cur.execute(f'LISTEN "{channel}"')
+        self._conn = conn
+
+    def _disconnect(self):
+        import psycopg2
+
+        if self._conn is None:
+            return
+
+        if self._loop and self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+        try:
+            self._conn.close()
+        except psycopg2.Error:
+            pass
+        self._conn = None
+
+    def _on_readable(self):
+        import psycopg2
+
+        try:
+            self._conn.poll()
+        except psycopg2.Error as e:
+            logger.error("notification listener connection lost: %s", e)
+            self._disconnect()
+            if not self._closed:
+                self._reconnect_task = self._loop.create_task(self._reconnect())
+            return
+
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            self._dispatch(notify.channel, notify.payload)
+
+    def _dispatch(self, channel: str, raw: str):
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            logger.warning("discarding malformed notification on '%s'", channel)
+            return
+
+        for subscription in list(self.subscribers.get(channel, ())):
+            subscription.offer(payload)
+
+    async def _reconnect(self):
+        delay = 1
+        while not self._closed:
+            await asyncio.sleep(delay)
+            try:
+                await self.start()
+                return
+            except Exception as e:
+                logger.error("notification listener reconnect failed: %s", e)
+                delay = min(delay * 2, 30)
+
+
+def get_listener(app) -> Optional[PgListener]:
+    """Return the app's listener when it is connected"""
+    listener = getattr(app.state, "pg_listener", None)
+    return listener if listener and listener.connected else None
@@ -0,0 +1,101 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.logging_config import get_logger
+from services.metrics_service import db_queries_total
+from services.slow_query_service import slow_query_log
+
+logger = get_logger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PARAM = re.compile(r"%\([^)]+\)s")
+
+
+def normalize_statement(statement: str) -> str:
+    """Statement shape: literals and bound parameters replaced by `?`, whitespace collapsed"""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class RequestQueryStats:
+    """SQL issued while handling one request"""
+    scope: Dict[str, Any]
+    debug: bool = False
+    count: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    warned: set = field(default_factory=set)
+    statements: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def route(self) -> str:
+        # The router stores the matched route in the (shared) scope once routing has happened
+        return getattr(self.scope.get("route"), "path", self.scope["path"])
+
+    def record(self, statement: str, shape: str, elapsed: float):
+        self.count += 1
+        self.db_seconds += elapsed
+        self.shapes[shape] += 1
+
+        # Same statement shape over and over in one request is almost always an N+1 loop
+        repeats = self.shapes[shape]
+        if repeats > settings.SQL_REPEAT_WARN_THRESHOLD and shape not in self.warned:
+            self.warned.add(shape)
+            logger.warning(
+                "possible N+1 on %s: statement repeated more than %s times: %s",
+                self.route, settings.SQL_REPEAT_WARN_THRESHOLD, shape[:300],
+                extra={"route": self.route, "statement": shape},
+            )
+
+        if self.debug:
+            self.statements.append({"sql": shape, "ms": round(elapsed * 1000, 3)})
+
+
+# Set by QueryStatsMiddleware; copied into threadpool workers so sync routes record too
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+# The start time lives on the execution context, so a failed statement leaves nothing behind
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start
+    db_queries_total.inc()
+    stats = current_query_stats.get()
+    slow = settings.SLOW_QUERY_MS and elapsed * 1000 >= settings.SLOW_QUERY_MS and not statement.startswith("EXPLAIN")
+    if stats is None and not slow:
+        return
+
+    shape = normalize_statement(statement)
+    if stats is not None:
+        stats.record(statement, shape, elapsed)
+    if slow:
+        slow_query_log.record(conn.engine, statement, shape, parameters, elapsed, stats.route if stats else None)
+
+
+def instrument_engine(engine: Engine):
+    """Time every statement and attribute it to the current request, if any"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def log_statement_dump(stats: RequestQueryStats):
+    """Debug mode: log every statement a request issued, in order"""
+    logger.info(
+        "%s %s issued %s statements in %.2fms",
+        stats.scope["method"], stats.scope["path"], stats.count, stats.db_seconds * 1000,
+        extra={"route": stats.route, "statements": stats.statements},
+    )
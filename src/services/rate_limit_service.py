@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Protocol
+from sqlalchemy import text
+from app.config import settings
+from app.logging_config import get_logger
+from db.db import get_engine
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+# (key, emission interval, window) for one limit
+Check = tuple[str, float, float]
+
+
+def _gcra(tat: Optional[float], now: float, interval: float, window: float) -> tuple[bool, float]:
+    """One GCRA step: (allowed, new theoretical arrival time)"""
+    new_tat = max(tat if tat is not None else now, now) + interval
+    return new_tat - now <= window, new_tat
+
+
+class RateLimitBackend(Protocol):
+    def update(self, checks: list[Check], now: float) -> list[tuple[bool, float]]:
+        """Apply one GCRA step for every key, all or nothing: state changes only if every key allows it.
+        Returns (allowed, theoretical arrival time) per check"""
+        ...
+
+
+class MemoryBackend:
+    """Per-process GCRA state: one float per key, least recently seen keys evicted first"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._tat: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, checks: list[Check], now: float) -> list[tuple[bool, float]]:
+        with self._lock:
+            steps = [_gcra(self._tat.get(key), now, interval, window) for key, interval, window in checks]
+            if not all(allowed for allowed, _ in steps):
+                # Nothing is charged; denied keys report where they currently stand
+                return [(allowed, tat if allowed else self._tat[key]) for (key, _, _), (allowed, tat) in zip(checks, steps)]
+
+            for (key, _, _), (_, tat) in zip(checks, steps):
+                self._tat[key] = tat
+                self._tat.move_to_end(key)
+            while len(self._tat) > self.max_keys:
+                self._tat.popitem(last=False)
+            return steps
+
+
+class PostgresBackend:
+    """GCRA state in the rate_limits table so every worker enforces the same limit"""
+
+    PURGE_INTERVAL_SECONDS = 60
+
+    def __init__(self):
+        self._last_purge = 0.0
+
+    def update(self, checks: list[Check], now: float) -> list[tuple[bool, float]]:
+        keys = sorted({key for key, _, _ in checks})
+        with get_engine().begin() as conn:
+            # Lock every key's row (in key order, so concurrent requests cannot deadlock) before deciding
+            conn.execute(text("""
+                INSERT INTO rate_limits (key, tat) SELECT unnest(CAST(:keys AS TEXT[])), :now
+                ON CONFLICT (key) DO NOTHING
+            """), {"keys": keys, "now": now})
+            current = dict(conn.execute(text("""
+                SELECT key, tat FROM rate_limits WHERE key = ANY(CAST(:keys AS TEXT[])) ORDER BY key FOR UPDATE
+            """), {"keys": keys}).all())
+
+            steps = [_gcra(current.get(key), now, interval, window) for key, interval, window in checks]
+            if all(allowed for allowed, _ in steps):
+                conn.execute(
+                    text("UPDATE rate_limits SET tat = :tat WHERE key = :key"),
+                    [{"key": key, "tat": tat} for (key, _, _), (_, tat) in zip(checks, steps)],
+                )
+                results = steps
+            else:
+                results = [(allowed, tat if allowed else current[key]) for (key, _, _), (allowed, tat) in zip(checks, steps)]
+
+            # Idle keys are just rows whose TAT has passed
+            if now - self._last_purge > self.PURGE_INTERVAL_SECONDS:
+                self._last_purge = now
+                conn.execute(text("DELETE FROM rate_limits WHERE tat < :now"), {"now": now})
+        return results
+
+
+class RateLimiter:
+    """Generic cell rate algorithm: O(1) per request, `limit` requests per `window` seconds with bursts up to `limit`"""
+
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+
+    def hit(self, key: str, limit: int, window: float, now: Optional[float] = None) -> RateLimitResult:
+        return self.hit_all([(key, limit)], window, now)[0]
+
+    def hit_all(self, limits: list[tuple[str, int]], window: float, now: Optional[float] = None) -> list[RateLimitResult]:
+        """Check several keys for one request; none of them is charged unless all allow it"""
+        now = time.time() if now is None else now
+        checks = [(key, window / limit, window) for key, limit in limits]
+        outcomes = self.backend.update(checks, now)
+
+        results = []
+        for (_, limit), (_, interval, _), (allowed, tat) in zip(limits, checks, outcomes):
+            used = tat - now
+            results.append(RateLimitResult(
+                allowed=allowed,
+                limit=limit,
+                remaining=max(0, int((window - used) // interval)),
+                retry_after=0.0 if allowed else max(0.0, used + interval - window),
+                reset_after=max(0.0, used),
+            ))
+        return results
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the limiter for RATE_LIMIT_BACKEND"""
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        logger.info("rate limiting shared through postgres")
+        return RateLimiter(PostgresBackend())
+    return RateLimiter(MemoryBackend(settings.RATE_LIMIT_MAX_KEYS))
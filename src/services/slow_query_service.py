@@ -0,0 +1,99 @@
+import itertools
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+EXPLAINABLE = ("select", "with", "insert", "update", "delete")
+
+
+def parameter_shape(parameters) -> Any:
+    """Types of the bound parameters (never their values)"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: shape of the first row plus the row count
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def calling_controller() -> Optional[str]:
+    """Nearest api.controllers function on the current stack"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("api.controllers."):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """Bounded ring buffer of slow statements, with EXPLAIN plans captured in the background"""
+
+    def __init__(self, size: int = 200):
+        self.samples: deque = deque(maxlen=size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # One background thread; plans are best-effort and dropped when it falls behind
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._pending = threading.BoundedSemaphore(16)
+
+    def record(self, engine: Engine, statement: str, shape: str, parameters, elapsed: float, route: Optional[str]):
+        sample = {
+            "id": next(self._ids),
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(elapsed * 1000, 2),
+            "sql": shape,
+            "params": parameter_shape(parameters),
+            "route": route,
+            "controller": calling_controller(),
+            "plan": None,
+        }
+        with self._lock:
+            self.samples.append(sample)
+
+        logger.warning(
+            "slow query (%.0fms) on %s from %s: %s",
+            sample["duration_ms"], route, sample["controller"], shape[:300],
+            extra={key: value for key, value in sample.items() if key not in ("id", "at", "plan")},
+        )
+
+        # executemany batches (a list of parameter rows) cannot be explained as one statement
+        explainable = statement.lstrip()[:10].lower().startswith(EXPLAINABLE) and not isinstance(parameters, list)
+        if settings.SLOW_QUERY_EXPLAIN and explainable and self._pending.acquire(blocking=False):
+            self._explainer.submit(self._explain, engine, sample, statement, parameters)
+
+    def _explain(self, engine: Engine, sample: Dict[str, Any], statement: str, parameters):
+        """EXPLAIN (not ANALYZE, so nothing is executed) on a separate pooled connection"""
+        try:
+            with engine.connect() as conn:
+                plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+                conn.rollback()
+            sample["plan"] = plan
+        except Exception as e:
+            sample["plan"] = {"error": e.__class__.__name__}
+        finally:
+            self._pending.release()
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent samples first"""
+        with self._lock:
+            return list(reversed(self.samples))[:limit]
+
+    def clear(self):
+        with self._lock:
+            self.samples.clear()
+
+
+# Create global slow query log instance
+slow_query_log = SlowQueryLog(size=settings.SLOW_QUERY_BUFFER_SIZE)
@@ -1,4 +1,6 @@
-﻿import shutil
+﻿import importlib.util
+import shutil
+import tempfile
 from pathlib import Path
 import typer
 import subprocess
@@ -42,6 +44,132 @@ def run():
     )
 
 
+@app.command()
+def serve(
+        host: str = typer.Option("0.0.0.0", help="Bind address"),
+        port: int = typer.Option(8000, help="Bind port"),
+        workers: int = typer.Option(os.cpu_count() or 1, help="Worker processes (default: CPU count)"),
+        loop: str = typer.Option("auto", help="Event loop: auto, uvloop or asyncio"),
+        http: str = typer.Option("auto", help="HTTP parser: auto, httptools or h11"),
+        keep_alive: int = typer.Option(5, help="Seconds to hold idle keep-alive connections"),
+        backlog: int = typer.Option(2048, help="Listen socket backlog"),
+        max_requests: int = typer.Option(10000, help="Recycle a worker after this many requests (0 = never)"),
+        max_requests_jitter: int = typer.Option(
+            None, help="Random extra requests per worker so recycles are staggered (default: 10% of max requests)"
+        ),
+        forwarded_allow_ips: str = typer.Option(
+            None, help="Comma-separated proxy IPs/networks trusted for X-Forwarded-* (default: uvicorn's, 127.0.0.1)"
+        ),
+        graceful_timeout: int = typer.Option(30, help="Seconds to finish in-flight requests on shutdown"),
+):
+    """Run the API in production mode: multiple workers, no reload."""
+    service_name = os.getenv("SERVICE_NAME", "slate_runner_api")
+    log_level = os.getenv("LOG_LEVEL", "INFO").lower()
+
+    # Prefer the C implementations when installed (uvicorn[standard] ships both)
+    if loop == "auto":
+        loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    if http == "auto":
+        http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+    # Workers size their DB pools from this (see Settings.db_pool_limits)
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers)}
+    if not env.get("DB_MAX_CONNECTIONS"):
+        typer.secho("[warn] DB_MAX_CONNECTIONS not set, every worker uses DB_POOL_SIZE + DB_MAX_OVERFLOW",
+                    fg=typer.colors.YELLOW)
+
+    # Workers publish metrics to a shared directory; start each server with a clean one
+    if workers > 1:
+        metrics_dir = env.setdefault("METRICS_MULTIPROC_DIR", str(Path(tempfile.gettempdir()) / f"slate_metrics_{port}"))
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    typer.secho(f"[info] {service_name} serving on {host}:{port} ({workers} workers, {loop}/{http})...",
+                fg=typer.colors.BLUE)
+
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", host,
+        "--port", str(port),
+        "--workers", str(workers),
+        "--loop", loop,
+        "--http", http,
+        "--timeout-keep-alive", str(keep_alive),
+        "--backlog", str(backlog),
+        "--timeout-graceful-shutdown", str(graceful_timeout),
+        "--proxy-headers",
+        "--no-access-log",  # RequestLoggingMiddleware writes the (sampled) access log
+        "--log-level", log_level,
+    ]
+    if max_requests:
+        # Without jitter, workers started together all recycle at the same moment
+        jitter = max_requests // 10 if max_requests_jitter is None else max_requests_jitter
+        command += ["--limit-max-requests", str(max_requests), "--limit-max-requests-jitter", str(jitter)]
+    if forwarded_allow_ips:
+        command += ["--forwarded-allow-ips", forwarded_allow_ips]
+
+    subprocess.run(command, check=True, cwd="src", env=env)
+
+
+@app.command("events-retention")
+def events_retention():
+    """Create upcoming events partitions and archive expired months."""
+    typer.secho("[info] running events partition maintenance...", fg=typer.colors.BLUE)
+    subprocess.run([sys.executable, "-m", "services.event_retention_service"], check=True, cwd="src")
+
+
+@app.command()
+def bench(
+        requests: int = typer.Option(5000, "--requests", "-n", help="Requests per stack and round"),
+        rounds: int = typer.Option(5, "--rounds", "-r", help="Rounds per stack (fastest is reported)"),
+):
+    """Measure per-request middleware overhead (no middleware vs BaseHTTPMiddleware vs pure ASGI)."""
+    typer.secho("[info] benchmarking middleware stack...", fg=typer.colors.BLUE)
+    subprocess.run(
+        [sys.executable, "-m", "app.bench", "--requests", str(requests), "--rounds", str(rounds)],
+        check=True, cwd="src"
+    )
+
+
+@app.command("startup-profile")
+def startup_profile(
+        module: str = typer.Option("main", "--module", "-m", help="Module to import, relative to src/"),
+        top: int = typer.Option(25, "--top", help="Number of slowest imports to list"),
+):
+    """Report import-time cost (python -X importtime) of the app or any module."""
+    typer.secho(f"[info] profiling import of '{module}'...", fg=typer.colors.BLUE)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd="src"
+    )
+    if result.returncode != 0:
+        typer.secho(f"[error] import failed:\n{result.stderr.strip().splitlines()[-1]}", fg=typer.colors.RED)
+        raise typer.Exit(result.returncode)
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us), int(self_us), name))
+
+    by_package = {}
+    for _, self_us, name in rows:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+
+    total_us = sum(self_us for _, self_us, _ in rows)
+    typer.echo(f"\ntotal: {total_us / 1000:.1f} ms across {len(rows)} modules\n")
+
+    typer.echo(f"{'self ms':>10}  top-level package")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        typer.echo(f"{self_us / 1000:>10.1f}  {package}")
+
+    typer.echo(f"\n{'cumulative ms':>14}{'self ms':>10}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        typer.echo(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+
+
 @app.command()
 def install():
     """Install project dependencies from requirements.txt."""
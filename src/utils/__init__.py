@@ -1,4 +1,4 @@
-from .database import build_database_url, db_lookup
+from .database import build_database_url, db_lookup, db_lookup_many, escape_like, parse_uids, uid_in
 from .uid import generate_uid
 from .validation import normalize_input
 from .datetime_helpers import now_utc
@@ -6,8 +6,12 @@ from .datetime_helpers import now_utc
 __all__ = [
     "build_database_url",
     "db_lookup",
+    "db_lookup_many",
+    "escape_like",
     "generate_uid",
     "normalize_input",
     "now_utc",
+    "parse_uids",
+    "uid_in",
 ]
 
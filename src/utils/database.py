@@ -1,11 +1,12 @@
 from urllib.parse import quote_plus
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, literal, any_, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.config import settings
 
 
-def build_database_url() -> str:
+def build_database_url(port: int | None = None) -> str:
     """Build PostgreSQL connection URL from environment variables."""
     required_fields = {
         "DB_HOST": settings.DB_HOST,
@@ -25,13 +26,18 @@ def build_database_url() -> str:
     
     return (
         f"postgresql+psycopg2://{settings.DB_USER}:{pw}"
-        f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+        f"@{settings.DB_HOST}:{port or settings.DB_PORT}/{settings.DB_NAME}"
         f"?sslmode={settings.DB_SSLMODE}"
     )
 
 
 def db_lookup(db: Session, model, identifier: str) -> object:
-    """Lookup a database record by UID or name."""
+    """Lookup a database record by UID or name.
+    Sessions with a `lookup_cache` dict in `db.info` (e.g. POST /batch) reuse earlier hits."""
+    cache = db.info.get("lookup_cache")
+    if cache is not None and (model, identifier) in cache:
+        return cache[(model, identifier)]
+
     item = db.scalar(select(model).where(model.uid == identifier))
     if not item and hasattr(model, 'name'):
         item = db.scalar(select(model).where(model.name == identifier))
@@ -41,5 +47,40 @@ def db_lookup(db: Session, model, identifier: str) -> object:
             status_code=404,
             detail=f"{model.__name__} with UID or name '{identifier}' not found."
         )
+
+    if cache is not None:
+        cache[(model, identifier)] = item
     return item
 
+
+def uid_in(model, uids: list[str]):
+    """`uid = ANY(:uids)` predicate, bound as a single array parameter."""
+    return model.uid == any_(literal(list(uids), ARRAY(String)))
+
+
+def db_lookup_many(db: Session, model, uids: list[str], options: tuple = ()) -> tuple[list, list[str]]:
+    """Fetch live records by UID in one query. Returns them in request order
+    (duplicates collapsed) together with the UIDs that were not found."""
+    wanted = list(dict.fromkeys(uids))
+    rows = db.scalars(
+        select(model).where(uid_in(model, wanted), model.deleted_at.is_(None)).options(*options)
+    ).all()
+
+    by_uid = {row.uid: row for row in rows}
+    return [by_uid[uid] for uid in wanted if uid in by_uid], [uid for uid in wanted if uid not in by_uid]
+
+
+def parse_uids(raw: str | None, limit: int = 1000) -> list[str] | None:
+    """Split a comma-separated `uids=` query parameter."""
+    if not raw:
+        return None
+
+    uids = [uid.strip() for uid in raw.split(",") if uid.strip()]
+    if len(uids) > limit:
+        raise HTTPException(status_code=400, detail=f"At most {limit} UIDs can be requested at once.")
+    return uids
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE/ILIKE wildcards so user input is matched literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
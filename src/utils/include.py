@@ -0,0 +1,25 @@
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+
+
+def include_options(model, include: Optional[str]) -> list:
+    """Turn `include=tasks,tasks.versions` into selectinload chains for a root model.
+    Every path level is loaded for the whole page in one extra `IN (...)` query."""
+    if not include:
+        return []
+
+    options = []
+    for path in sorted({p.strip() for p in include.split(",") if p.strip()}):
+        current, loader = model, None
+        for name in path.split("."):
+            relationship = inspect(current).relationships.get(name)
+            if relationship is None:
+                raise HTTPException(status_code=400, detail=f"Cannot include '{path}' on {model.__tablename__}.")
+
+            attr = getattr(current, name)
+            loader = selectinload(attr) if loader is None else loader.selectinload(attr)
+            current = relationship.mapper.class_
+        options.append(loader)
+    return options
@@ -0,0 +1,62 @@
+import json
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+
+
+def parse_contains(raw: Optional[str], param: str) -> Optional[Dict[str, Any]]:
+    """Parse a JSON object query parameter used as a JSONB containment (@>) filter."""
+    if not raw:
+        return None
+
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"'{param}' must be a JSON object.")
+
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=400, detail=f"'{param}' must be a JSON object.")
+    return value
+
+
+def parse_path_filters(filters: Optional[List[str]], param: str) -> Optional[Dict[str, Any]]:
+    """Turn `key.sub=value` filters into one nested containment document.
+    Values are read as JSON when possible (`frame=1001`, `final=true`), otherwise as strings."""
+    if not filters:
+        return None
+
+    doc: Dict[str, Any] = {}
+    for item in filters:
+        path, sep, raw = item.partition("=")
+        keys = path.split(".")
+        if not sep or not all(keys):
+            raise HTTPException(status_code=400, detail=f"'{param}' filters must look like key.sub=value.")
+
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+
+        node = doc
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+            if not isinstance(node, dict):
+                raise HTTPException(status_code=400, detail=f"'{param}' filters conflict on '{key}'.")
+        node[keys[-1]] = value
+    return doc
+
+
+def merge_contains(*docs: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Deep-merge containment documents so they compile to a single @> clause."""
+    merged: Dict[str, Any] = {}
+    for doc in docs:
+        if doc:
+            _deep_merge(merged, doc)
+    return merged or None
+
+
+def _deep_merge(target: Dict[str, Any], source: Dict[str, Any]):
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = value
@@ -0,0 +1,131 @@
+"""WebSocket change feed handshake against a real database
+
+Runs against the database configured through DB_* (as in CI) and is skipped when none is
+reachable. API_TOKEN must be an api_keys token allowed to create projects.
+"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import WebSocketDisconnect
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from api.controllers.project_controller import create_project
+from api.routes.ws import project_changes
+from app.config import settings
+from db.db import SessionLocal
+from models.project import Project
+from schemas.project import ProjectCreate
+
+
+def _session():
+    db = SessionLocal()
+    db.info["api_token"] = settings.API_TOKEN
+    return db
+
+
+@pytest.fixture(scope="module")
+def project_uid():
+    """A fresh project, removed again afterwards"""
+    try:
+        with _session() as db:
+            if not db.scalar(select(func.is_valid_api_token())):
+                pytest.skip("API_TOKEN is not a valid api_keys token")
+            # Fails when migrations the models map (e.g. sql/015 change_xid) are not applied
+            db.execute(select(Project).limit(1))
+    except (RuntimeError, SQLAlchemyError) as e:
+        pytest.skip(f"database not available: {e.__class__.__name__}")
+
+    with _session() as db:
+        uid = create_project(db, ProjectCreate(name=f"feed-{uuid.uuid4().hex[:8]}"))["data"].uid
+
+    yield uid
+
+    with _session() as db:
+        db.execute(delete(Project).where(Project.uid == uid))
+        db.commit()
+
+
+class FakeSubscription:
+    dropped = 0
+
+    def __init__(self, payload):
+        self.payloads = [payload]
+
+    async def get(self):
+        if self.payloads:
+            return self.payloads.pop()
+        await asyncio.Event().wait()
+
+
+class FakeListener:
+    connected = True
+
+    def __init__(self, payload):
+        self.subscription = FakeSubscription(payload)
+        self.unsubscribed = False
+
+    def subscribe(self, channel, matches, maxsize):
+        return self.subscription
+
+    def unsubscribe(self, subscription):
+        self.unsubscribed = True
+
+
+class FakeWebSocket:
+    """Just enough of starlette's WebSocket for the feed: one filter update, then disconnect"""
+
+    def __init__(self, token, listener):
+        self.query_params = {"token": token}
+        self.headers = {}
+        self.app = SimpleNamespace(state=SimpleNamespace(pg_listener=listener))
+        self.accepted = False
+        self.closed = None
+        self.sent = []
+        self.change_sent = asyncio.Event()
+        self.messages = [{"tables": "versions"}]
+
+    async def accept(self):
+        self.accepted = True
+
+    async def close(self, code, reason=None):
+        self.closed = (code, reason)
+
+    async def send_json(self, data):
+        self.sent.append(data)
+        if data["type"] == "change":
+            self.change_sent.set()
+
+    async def receive_json(self):
+        if self.messages:
+            return self.messages.pop()
+        await self.change_sent.wait()
+        raise WebSocketDisconnect()
+
+
+def _connect(token, project):
+    async def run():
+        listener = FakeListener({"project_uid": project, "table": "versions", "op": "insert"})
+        websocket = FakeWebSocket(token, listener)
+        await asyncio.wait_for(project_changes(websocket, project), timeout=10)
+        return websocket, listener
+    return asyncio.run(run())
+
+
+def test_valid_token_streams_project_changes(project_uid):
+    websocket, listener = _connect(settings.API_TOKEN, project_uid)
+
+    assert websocket.closed is None
+    assert websocket.accepted
+    assert {"type": "change", "project_uid": project_uid, "table": "versions", "op": "insert"} in websocket.sent
+    assert {"type": "filters", "tables": ["versions"], "ops": ["delete", "insert", "update"]} in websocket.sent
+    assert listener.unsubscribed
+
+
+def test_invalid_token_is_rejected(project_uid):
+    websocket, _ = _connect(f"invalid-{uuid.uuid4().hex}", project_uid)
+
+    assert not websocket.accepted
+    assert websocket.closed[1] == "Invalid or missing token"
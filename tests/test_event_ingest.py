@@ -0,0 +1,81 @@
+"""Event batch ingest against a real database
+
+Runs against the database configured through DB_* (as in CI) and is skipped when none is
+reachable. API_TOKEN must be an api_keys token allowed to create projects and events.
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from api.controllers.event_controller import create_events_batch
+from api.controllers.project_controller import create_project
+from app.config import settings
+from db.db import SessionLocal
+from models.event import Event
+from models.project import Project
+from schemas.event import EventBatchCreate, EventCreate
+from schemas.project import ProjectCreate
+
+RETRIES = 6
+
+
+def _session(token=None):
+    db = SessionLocal()
+    db.info["api_token"] = token or settings.API_TOKEN
+    return db
+
+
+@pytest.fixture(scope="module")
+def project_uid():
+    """A fresh project, removed again afterwards"""
+    try:
+        with _session() as db:
+            if not db.scalar(select(func.is_valid_api_token())):
+                pytest.skip("API_TOKEN is not a valid api_keys token")
+            if db.scalar(select(func.to_regclass("event_uids"))) is None:
+                pytest.skip("sql/018_event_uids.sql is not applied")
+    except (RuntimeError, SQLAlchemyError) as e:
+        pytest.skip(f"database not available: {e.__class__.__name__}")
+
+    with _session() as db:
+        uid = create_project(db, ProjectCreate(name=f"ingest-{uuid.uuid4().hex[:8]}"))["data"].uid
+
+    yield uid
+
+    with _session() as db:
+        db.execute(delete(Project).where(Project.uid == uid))
+        db.commit()
+
+
+def _batch(project_uid, uids):
+    return EventBatchCreate(events=[
+        EventCreate(uid=uid, project_uid=project_uid, kind="ingest.test", payload={"n": n})
+        for n, uid in enumerate(uids)
+    ])
+
+
+def test_concurrent_retries_write_each_event_once(project_uid):
+    uids = [f"EVENT_{uuid.uuid4().hex[:12].upper()}" for _ in range(20)]
+
+    def post(_):
+        with _session() as db:
+            return create_events_batch(db, _batch(project_uid, uids))["data"].accepted
+
+    with ThreadPoolExecutor(max_workers=RETRIES) as pool:
+        accepted = list(pool.map(post, range(RETRIES)))
+
+    assert sum(accepted) == len(uids)
+    with _session() as db:
+        stored = db.scalars(select(Event.uid).where(Event.project_uid == project_uid, Event.uid.in_(uids))).all()
+    assert sorted(stored) == sorted(uids)
+
+
+def test_async_batch_rejects_token_that_cannot_write(project_uid):
+    with _session(f"invalid-{uuid.uuid4().hex}") as db:
+        with pytest.raises(HTTPException) as exc:
+            create_events_batch(db, _batch(project_uid, ["EVENT_NOPE"]), asynchronous=True)
+    assert exc.value.status_code == 403
@@ -0,0 +1,107 @@
+"""Concurrency stress test for per-task version number allocation
+
+Runs against the database configured through DB_* (as in CI) and is skipped when none is
+reachable. API_TOKEN must be an api_keys token allowed to create projects, assets and tasks.
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from api.controllers.asset_controller import create_asset
+from api.controllers.project_controller import create_project
+from api.controllers.task_controller import allocate_vnum, create_task
+from api.controllers.version_controller import create_version
+from app.config import settings
+from db.db import SessionLocal
+from enums.enums import AssetType
+from models.project import Project
+from models.version import Version
+from schemas.asset import AssetCreate
+from schemas.project import ProjectCreate
+from schemas.task import TaskCreate
+from schemas.version import VersionCreate
+
+THREADS = 12
+CREATES_PER_THREAD = 5
+
+
+def _session():
+    db = SessionLocal()
+    db.info["api_token"] = settings.API_TOKEN
+    return db
+
+
+@pytest.fixture(scope="module")
+def task():
+    """A fresh project/asset/task (with its initial v1), removed again afterwards"""
+    try:
+        with _session() as db:
+            if not db.scalar(select(func.is_valid_api_token())):
+                pytest.skip("API_TOKEN is not a valid api_keys token")
+            if db.scalar(select(func.to_regclass("task_version_state"))) is None:
+                pytest.skip("sql/011_task_version_state.sql is not applied")
+            # Fails when other migrations the models map (e.g. sql/015 change_xid) are not applied
+            db.execute(select(Project, Version).join(Version, Version.project_uid == Project.uid).limit(1))
+    except (RuntimeError, SQLAlchemyError) as e:
+        pytest.skip(f"database not available: {e.__class__.__name__}")
+
+    with _session() as db:
+        project = create_project(db, ProjectCreate(name=f"vnum-stress-{uuid.uuid4().hex[:8]}"))["data"]
+        asset = create_asset(db, AssetCreate(project_uid=project.uid, name="crate", type=AssetType.Character))["data"]
+        created = create_task(
+            db, TaskCreate(project_uid=project.uid, parent_type="asset", parent_uid=asset.uid, name="model")
+        )["data"]
+        project_uid, task_uid = project.uid, created.uid
+
+    yield project_uid, task_uid
+
+    with _session() as db:
+        db.execute(delete(Project).where(Project.uid == project_uid))
+        db.commit()
+
+
+def _task_vnums(task_uid: str) -> list[int]:
+    with _session() as db:
+        return list(db.scalars(select(Version.vnum).where(Version.task_uid == task_uid).order_by(Version.vnum)))
+
+
+def test_concurrent_create_version_allocates_unique_contiguous_vnums(task):
+    project_uid, task_uid = task
+    start = max(_task_vnums(task_uid))
+
+    def create(_):
+        with _session() as db:
+            try:
+                return create_version(db, VersionCreate(project_uid=project_uid, task_uid=task_uid))["data"].vnum
+            except HTTPException as e:
+                return f"HTTP {e.status_code}: {e.detail}"
+
+    total = THREADS * CREATES_PER_THREAD
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(create, range(total)))
+
+    errors = [result for result in results if isinstance(result, str)]
+    assert errors == []
+    assert sorted(results) == list(range(start + 1, start + total + 1))
+    assert _task_vnums(task_uid) == list(range(1, start + total + 1))
+
+
+def test_concurrent_allocate_vnum_never_repeats(task):
+    _, task_uid = task
+
+    def allocate(_):
+        with _session() as db:
+            vnum = allocate_vnum(db, task_uid)
+            db.commit()
+            return vnum
+
+    total = THREADS * CREATES_PER_THREAD
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(allocate, range(total)))
+
+    assert len(set(results)) == total
+    assert sorted(results) == list(range(min(results), min(results) + total))